@@ -3,6 +3,8 @@ from functools import lru_cache
 from pydantic_settings import BaseSettings
 from neo4j import AsyncDriver
 from app.services import neo4j_service
+from app.services.graph_snapshot import DEFAULT_SNAPSHOT_DIR
+from app.services.sqlite_store import DEFAULT_GRAPH_DB
 
 # Resolve .env from repo root regardless of where uvicorn is launched from.
 # dependencies.py lives at  backend/app/api/dependencies.py
@@ -18,6 +20,12 @@ class Settings(BaseSettings):
     neo4j_password: str = "dail_password"
     gemini_api_key: str = ""
     courtlistener_base_url: str = "https://www.courtlistener.com"
+    # "replica": serve analytic reads from the in-process graph replica;
+    # "sqlite": serve case / defendant reads from the SQLite read store
+    graph_read_backend: str = "neo4j"
+    graph_replica_refresh_seconds: float = 30.0
+    graph_snapshot_dir: str = DEFAULT_SNAPSHOT_DIR  # empty: no snapshot
+    graph_sqlite_path: str = DEFAULT_GRAPH_DB  # empty: no SQLite read store (nor fallback)
 
     class Config:
         env_file = _ENV_FILE
@@ -1,7 +1,12 @@
-from fastapi import APIRouter, Depends, Query
+import json
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from neo4j import AsyncDriver
 from app.api.dependencies import get_neo4j
-from app.services import neo4j_service
+from app.models.graph_models import NeighborhoodRequest
+from app.services import neo4j_service, path_finder
 
 router = APIRouter(prefix="/graph", tags=["graph"])
 
@@ -12,13 +17,20 @@ async def graph_overview(driver: AsyncDriver = Depends(get_neo4j)):
     return await neo4j_service.get_node_counts(driver)
 
 
+RANK_BY_PATTERN = "^(caseCount|pagerank|betweenness|degree)$"
+
+
 @router.get("/defendants")
 async def top_defendants(
     limit: int = Query(20, ge=1, le=500),
+    rank_by: str = Query("caseCount", alias="rankBy", pattern=RANK_BY_PATTERN),
     driver: AsyncDriver = Depends(get_neo4j),
 ):
-    """Return organizations ranked by number of cases in which they are named defendants."""
-    return await neo4j_service.get_top_defendants(driver, limit=limit)
+    """
+    Return organizations ranked by number of cases in which they are named
+    defendants, or by a stored centrality score (rankBy=pagerank|betweenness|degree).
+    """
+    return await neo4j_service.get_top_defendants(driver, limit=limit, rank_by=rank_by)
 
 
 @router.get("/cases-by-year")
@@ -43,13 +55,124 @@ async def defendant_cases(org_name: str, driver: AsyncDriver = Depends(get_neo4j
     return await neo4j_service.get_defendant_cases(driver, org_name)
 
 
+@router.post("/neighborhoods")
+async def neighborhoods(body: NeighborhoodRequest, driver: AsyncDriver = Depends(get_neo4j)):
+    """
+    Return the neighborhoods of many cases and/or defendant organizations
+    (their most recent cases) as one deduplicated node/edge payload.
+    """
+    return await neo4j_service.get_neighborhoods(
+        driver, body.caseIds, body.organizations, per_org=body.limitPerOrganization
+    )
+
+
+@router.get("/ego/{label}/{key}")
+async def ego_network(
+    label: str,
+    key: str,
+    hops: int = Query(2, ge=1, le=4),
+    fanout: int = Query(50, ge=1, le=500, description="Max neighbors expanded per node (hubs are sampled)"),
+    max_nodes: int = Query(500, ge=1, le=5000, alias="maxNodes"),
+    rel_types: Optional[List[str]] = Query(None, alias="relType", description="Repeatable; default all"),
+    driver: AsyncDriver = Depends(get_neo4j),
+):
+    """
+    Stream the k-hop neighborhood of one node as NDJSON: node and edge lines
+    in breadth-first order as they are discovered, then a final "done" line.
+    """
+    if label not in neo4j_service.NODE_KEYS:
+        raise HTTPException(status_code=400, detail=f"Unknown label '{label}'")
+    unknown = set(rel_types or []) - set(neo4j_service.EGO_REL_TYPES)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown relationship type(s): {sorted(unknown)}")
+    seed = await neo4j_service.get_ego_seed(driver, label, key)
+    if not seed:
+        raise HTTPException(status_code=404, detail=f"{label} '{key}' not found")
+    items = neo4j_service.stream_ego_network(driver, seed, hops, fanout, max_nodes, rel_types)
+    return StreamingResponse(
+        (json.dumps(item, default=str) + "\n" async for item in items),
+        media_type="application/x-ndjson",
+        headers={"X-Accel-Buffering": "no"},  # let nginx pass lines through unbuffered
+    )
+
+
+@router.get("/path")
+async def connection_paths(
+    source: str = Query(..., alias="from", description="Organization / AI system / theory name or case id"),
+    target: str = Query(..., alias="to"),
+    source_label: Optional[str] = Query(None, alias="fromLabel"),
+    target_label: Optional[str] = Query(None, alias="toLabel"),
+    max_hops: int = Query(6, ge=1, le=10, alias="maxHops"),
+    k: int = Query(3, ge=1, le=20),
+    hub_weight: float = Query(1.0, ge=0, alias="hubWeight", description="0 ignores node degree"),
+    budget_ms: int = Query(500, ge=10, le=5000, alias="budgetMs"),
+    driver: AsyncDriver = Depends(get_neo4j),
+):
+    """
+    Return up to k shortest paths connecting two nodes, preferring paths
+    through low-degree nodes over hubs.
+    """
+    for label in (source_label, target_label):
+        if label and label not in path_finder.RESOLVE_ORDER:
+            raise HTTPException(status_code=400, detail=f"Unknown label '{label}'")
+    graph = await path_finder.path_graph.get(driver)
+    ends = []
+    for key, label in ((source, source_label), (target, target_label)):
+        index = path_finder.path_graph.resolve(key, label)
+        if index is None:
+            raise HTTPException(status_code=404, detail=f"'{key}' not found in the case graph")
+        ends.append(index)
+    found = path_finder.find_paths(graph, *ends, max_hops=max_hops, k=k, hub_weight=hub_weight, budget_ms=budget_ms)
+    return path_finder.describe(graph, found)
+
+
+@router.get("/defendants/{org_name}/co-defendants")
+async def co_defendants(
+    org_name: str,
+    limit: int = Query(20, ge=1, le=200),
+    driver: AsyncDriver = Depends(get_neo4j),
+):
+    """Return organizations most often sued alongside a defendant, with first/last co-filing dates."""
+    return await neo4j_service.get_co_defendants(driver, org_name, limit=limit)
+
+
+@router.get("/co-defendants")
+async def top_co_defendant_pairs(
+    min_shared: int = Query(2, ge=1, alias="minShared"),
+    limit: int = Query(50, ge=1, le=500),
+    driver: AsyncDriver = Depends(get_neo4j),
+):
+    """Return the defendant pairs that share the most cases."""
+    return await neo4j_service.get_top_co_defendant_pairs(driver, min_shared=min_shared, limit=limit)
+
+
+@router.get("/communities")
+async def communities(
+    limit: int = Query(50, ge=1, le=500),
+    min_size: int = Query(2, ge=1, alias="minSize"),
+    driver: AsyncDriver = Depends(get_neo4j),
+):
+    """Return detected defendant/theory communities, largest first."""
+    return await neo4j_service.get_communities(driver, limit=limit, min_size=min_size)
+
+
+@router.get("/communities/{community_id}")
+async def community(community_id: int, driver: AsyncDriver = Depends(get_neo4j)):
+    """Return one community's organizations (by case count) and legal theories."""
+    found = await neo4j_service.get_community(driver, community_id)
+    if not found:
+        raise HTTPException(status_code=404, detail=f"Community {community_id} not found")
+    return found
+
+
 @router.get("/ai-systems")
 async def top_ai_systems(
     limit: int = Query(15, ge=1, le=50),
+    rank_by: str = Query("caseCount", alias="rankBy", pattern=RANK_BY_PATTERN),
     driver: AsyncDriver = Depends(get_neo4j),
 ):
-    """Return AI systems ranked by number of cases they appear in."""
-    return await neo4j_service.get_top_ai_systems(driver, limit=limit)
+    """Return AI systems ranked by number of cases they appear in, or by a stored centrality score."""
+    return await neo4j_service.get_top_ai_systems(driver, limit=limit, rank_by=rank_by)
 
 
 @router.get("/theories/{theory_name}/cases")
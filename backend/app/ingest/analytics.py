@@ -0,0 +1,86 @@
+"""
+Batch centrality job: score organizations and AI systems and store the
+scores as node properties.
+    python -m app.ingest.analytics                 (from backend/ directory)
+    python -m app.ingest.analytics --samples 0     (exact betweenness)
+
+Sets pagerank, degree and betweenness on every Organization and AISystem
+in the case graph (see app.services.graph_analytics), stamped with
+analyticsRunAt; nodes no longer connected lose their scores. The API
+ranks by these through indexes (/graph/defendants?rankBy=pagerank).
+"""
+import argparse
+import asyncio
+import os
+import time
+from datetime import datetime, UTC
+
+from dotenv import load_dotenv
+
+from app.ingest.batch_writer import write_batches
+from app.services.graph_analytics import centrality, load_graph
+from app.services.neo4j_service import bump_graph_version, get_driver, init_schema
+
+load_dotenv()
+
+DEFAULT_SAMPLES = int(os.getenv("ANALYTICS_BETWEENNESS_SAMPLES", "256"))
+
+SCORED_LABELS = {"Organization": "canonicalName", "AISystem": "name"}
+
+
+def score_rows(graph, scores: dict) -> dict:
+    """{label: [{key, pagerank, degree, betweenness}]} for the scored labels."""
+    rows = {label: [] for label in SCORED_LABELS}
+    for i, (label, key) in enumerate(graph.nodes):
+        if label in rows:
+            rows[label].append({
+                "key": key,
+                "pagerank": float(scores["pagerank"][i]),
+                "degree": int(scores["degree"][i]),
+                "betweenness": float(scores["betweenness"][i]),
+            })
+    return rows
+
+
+async def write_scores(driver, rows: dict, run_at: str):
+    for label, key_prop in SCORED_LABELS.items():
+        await write_batches(driver, f"{label} scores", f"""
+            UNWIND $rows AS row
+            MATCH (n:{label} {{{key_prop}: row.key}})
+            SET n.pagerank = row.pagerank, n.degree = row.degree,
+                n.betweenness = row.betweenness, n.analyticsRunAt = $runAt
+        """, rows[label], params={"runAt": run_at})
+        async with driver.session() as session:
+            await session.run(f"""
+                MATCH (n:{label}) WHERE n.analyticsRunAt IS NOT NULL AND n.analyticsRunAt <> $runAt
+                REMOVE n.pagerank, n.degree, n.betweenness, n.analyticsRunAt
+            """, runAt=run_at)
+
+
+async def main(samples: int = DEFAULT_SAMPLES):
+    uri = os.getenv("NEO4J_URI", "bolt://localhost:7687")
+    user = os.getenv("NEO4J_USER", "neo4j")
+    password = os.getenv("NEO4J_PASSWORD", "dail_password")
+    driver = await get_driver(uri, user, password)
+    await init_schema(driver)
+    try:
+        start = time.perf_counter()
+        graph = await load_graph(driver)
+        print(f"Loaded {len(graph)} nodes, {len(graph.src) // 2} edges in {time.perf_counter() - start:.1f}s")
+        start = time.perf_counter()
+        scores = centrality(graph, samples or None)
+        print(f"Scored in {time.perf_counter() - start:.1f}s")
+        await write_scores(driver, score_rows(graph, scores), datetime.now(UTC).isoformat())
+        await bump_graph_version(driver, case_ids=[])  # node properties only; no case rows or links changed
+    finally:
+        await driver.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compute and store organization / AI system centrality.")
+    parser.add_argument(
+        "--samples", type=int, default=DEFAULT_SAMPLES,
+        help="betweenness source samples (0 = exact; default ANALYTICS_BETWEENNESS_SAMPLES or 256)",
+    )
+    args = parser.parse_args()
+    asyncio.run(main(args.samples))
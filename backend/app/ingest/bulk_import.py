@@ -0,0 +1,233 @@
+"""
+Offline bulk-import files for `neo4j-admin database import full`.
+
+Builds the same graph seed_from_excel writes over Bolt, but as header +
+data CSV pairs, one per node label and relationship type, so an empty
+database can be built at import-tool speed. Node ids are the natural keys
+the Bolt seeder MERGEs on (case slug, docket/document id, source link,
+theory/court/organization name), each in its own id space, and duplicates
+are dropped here the way repeated MERGEs would collapse them.
+
+Organization nodes come from the entity-extraction CSV (caseId,
+canonicalName, name, roles, confidence) that app.ingest.entity_extractor
+writes after each run. Without one they are derived from the cases'
+Organizations_involved text (derive_organizations): split into names,
+corporate suffixes folded into the canonical name, links marked
+extractedBy 'dail' so a later extraction run replaces them.
+"""
+import csv
+import os
+import re
+from typing import Optional
+
+import pandas as pd
+
+from app.ingest.dail_tables import DATA_DIR, DailTables, list_col, str_col
+
+DEFAULT_IMPORT_DIR = os.path.join(DATA_DIR, "import")
+DEFAULT_ORGANIZATIONS_CSV = os.path.join(DATA_DIR, "dail_organizations.csv")
+
+# Unit separator: cannot appear in DAIL text, so list items never need escaping
+ARRAY_DELIMITER = "\x1f"
+ARRAY_DELIMITER_ARG = "U+001F"
+
+CASE_HEADER = [
+    "id:ID(Case)", "recordNumber", "caption", "briefDescription",
+    "areaOfApplication:string[]", "causeOfAction:string[]", "issues:string[]",
+    "algorithmNames:string[]", "organizations", "jurisdictionFiled", "dateFiled",
+    "currentJurisdiction", "jurisdictionType", "status", "summarySignificance",
+    "summaryFacts", "mostRecentActivity", "isClassAction", "dateAdded", "source",
+    "contentHash",
+]
+LIST_COLUMNS = ["areaOfApplication", "causeOfAction", "issues", "algorithmNames"]
+
+
+def _array(s: pd.Series) -> pd.Series:
+    return s.map(lambda items: ARRAY_DELIMITER.join(items))
+
+
+def _write(out_dir: str, name: str, frame: pd.DataFrame, header: list) -> tuple:
+    """Write <name>_header.csv and <name>.csv; returns (header_path, data_path)."""
+    header_path = os.path.join(out_dir, f"{name}_header.csv")
+    data_path = os.path.join(out_dir, f"{name}.csv")
+    with open(header_path, "w", encoding="utf-8", newline="") as f:
+        csv.writer(f, lineterminator="\n").writerow(header)
+    frame.to_csv(data_path, header=False, index=False, encoding="utf-8")
+    print(f"  {name}: {len(frame)} rows")
+    return header_path, data_path
+
+
+def _dedupe(frame: pd.DataFrame, key) -> pd.DataFrame:
+    return frame.drop_duplicates(subset=key, keep="last").sort_values(key, kind="stable")
+
+
+def _keyed(frame: pd.DataFrame, key: str = "id") -> pd.DataFrame:
+    """One row per non-empty key; a blank id cannot be a node in an id space."""
+    return _dedupe(frame[frame[key].ne("")], key)
+
+
+# A comma-separated item that is only a corporate suffix belongs to the name before it
+CORPORATE_SUFFIX = r"(?:inc|llc|l\.l\.c|ltd|limited|corp|corporation|co|company|plc|lp|llp|n\.a|s\.a|gmbh|ag)\.?"
+_SUFFIX_ITEM = re.compile(rf"^{CORPORATE_SUFFIX}$", re.IGNORECASE)
+_SUFFIX_TAIL = re.compile(rf"(?:,?\s+{CORPORATE_SUFFIX})+$", re.IGNORECASE)
+_NOT_A_NAME = re.compile(r"^(?:et al\.?|and|n/?a|none|unknown)$", re.IGNORECASE)
+_TRAILING_OTHERS = re.compile(r"\s+(?:and others|et al\.?)$", re.IGNORECASE)
+
+
+def split_organizations(text: str) -> list:
+    """Organization names in one Organizations_involved value, in order."""
+    names: list = []
+    for item in re.split(r"[;\n,]", text or ""):
+        item = _TRAILING_OTHERS.sub("", item.strip().strip("'\""))
+        if not item or _NOT_A_NAME.match(item):
+            continue
+        if names and _SUFFIX_ITEM.match(item):
+            names[-1] = f"{names[-1]}, {item}"
+        else:
+            names.append(item)
+    return names
+
+
+def derive_organizations(cases: pd.DataFrame) -> pd.DataFrame:
+    """Organization rows from the cases' own organizations text, for imports without extraction results."""
+    names = cases.set_index("id")["organizations"].map(split_organizations).explode().dropna()
+    frame = pd.DataFrame({"caseId": names.index, "name": names.to_numpy()})
+    frame["canonicalName"] = frame["name"].str.replace(_SUFFIX_TAIL, "", regex=True).str.strip(" ,")
+    frame = frame[frame["canonicalName"].ne("")]
+    return frame.assign(roles=[[] for _ in range(len(frame))], confidence=None, extractedBy="dail")
+
+
+def load_organizations(path: str, case_ids: set) -> Optional[pd.DataFrame]:
+    """Extraction results for known cases, or None when no file is present."""
+    if not path or not os.path.exists(path):
+        return None
+    df = pd.read_csv(path)
+    frame = pd.DataFrame({
+        "caseId": str_col(df["caseId"]),
+        "canonicalName": str_col(df["canonicalName"]),
+        "name": str_col(df["name"]) if "name" in df else str_col(df["canonicalName"]),
+        "roles": list_col(df["roles"]) if "roles" in df else [[] for _ in range(len(df))],
+        "confidence": pd.to_numeric(df["confidence"], errors="coerce") if "confidence" in df else None,
+        "extractedBy": "claude",
+    })
+    return frame[frame["canonicalName"].ne("") & frame["caseId"].isin(case_ids)]
+
+
+def write_import_files(
+    tables: DailTables,
+    out_dir: str = DEFAULT_IMPORT_DIR,
+    organizations: Optional[pd.DataFrame] = None,
+) -> dict:
+    """
+    Write every node and relationship file. Returns {"nodes": {label: [files]},
+    "relationships": {type: [files]}} in the shape neo4j-admin's
+    --nodes/--relationships flags take.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    nodes, rels = {}, {}
+
+    cases = _keyed(tables.cases).copy()
+    for col in LIST_COLUMNS:
+        cases[col] = _array(cases[col])
+    nodes["Case"] = _write(out_dir, "cases", cases[[h.split(":")[0] for h in CASE_HEADER]], CASE_HEADER)
+    case_ids = set(cases["id"])
+
+    if tables.dockets is not None:
+        dockets = _keyed(tables.dockets)
+        nodes["Docket"] = _write(
+            out_dir, "dockets", dockets[["id", "court", "number", "link", "contentHash"]],
+            ["id:ID(Docket)", "court", "number", "link", "contentHash"],
+        )
+        rels["HAS_DOCKET"] = _write(
+            out_dir, "has_docket", dockets[["caseId", "id"]], [":START_ID(Case)", ":END_ID(Docket)"],
+        )
+
+    if tables.documents is not None:
+        documents = _keyed(tables.documents)
+        nodes["Document"] = _write(
+            out_dir, "documents",
+            documents[["id", "court", "date", "link", "docType", "cite", "contentHash"]],
+            ["id:ID(Document)", "court", "date", "link", "type", "citeOrReference", "contentHash"],
+        )
+        rels["HAS_DOCUMENT"] = _write(
+            out_dir, "has_document", documents[["caseId", "id"]],
+            [":START_ID(Case)", ":END_ID(Document)"],
+        )
+
+    if tables.secondary_sources is not None:
+        sources = tables.secondary_sources
+        nodes["SecondarySource"] = _write(
+            out_dir, "secondary_sources", _dedupe(sources, "link")[["link", "title", "id"]],
+            ["link:ID(SecondarySource)", "title", "sourceId:long"],
+        )
+        rels["HAS_SECONDARY_SOURCE"] = _write(
+            out_dir, "has_secondary_source",
+            _dedupe(sources, ["caseId", "link"])[["caseId", "link", "id", "contentHash"]],
+            [":START_ID(Case)", ":END_ID(SecondarySource)", "sourceId:long", "contentHash"],
+        )
+
+    # LegalTheory / Court are derived from case properties, as in seed_theories_and_courts
+    claims = tables.cases[["id", "causeOfAction"]].explode("causeOfAction").dropna()
+    claims = claims.assign(theory=claims["causeOfAction"].str.strip())
+    claims = _dedupe(claims[claims["theory"].ne("") & claims["id"].isin(case_ids)], ["id", "theory"])
+    nodes["LegalTheory"] = _write(
+        out_dir, "legal_theories", _dedupe(claims[["theory"]], "theory"), ["name:ID(LegalTheory)"],
+    )
+    rels["ASSERTS_CLAIM"] = _write(
+        out_dir, "asserts_claim", claims[["id", "theory"]], [":START_ID(Case)", ":END_ID(LegalTheory)"],
+    )
+
+    filed = cases[cases["jurisdictionFiled"].ne("")]
+    nodes["Court"] = _write(
+        out_dir, "courts", _dedupe(filed, "jurisdictionFiled")[["jurisdictionFiled", "jurisdictionType"]],
+        ["name:ID(Court)", "jurisdictionType"],
+    )
+    rels["FILED_IN"] = _write(
+        out_dir, "filed_in", filed[["id", "jurisdictionFiled"]], [":START_ID(Case)", ":END_ID(Court)"],
+    )
+
+    if organizations is None:
+        organizations = derive_organizations(tables.cases[tables.cases["id"].isin(case_ids)])
+    if len(organizations):
+        orgs = _dedupe(organizations, ["caseId", "canonicalName"]).assign(
+            roles=lambda f: _array(f["roles"]), reviewedByHuman="false",
+        )
+        nodes["Organization"] = _write(
+            out_dir, "organizations", _dedupe(orgs, "canonicalName")[["canonicalName", "name"]],
+            ["canonicalName:ID(Organization)", "name"],
+        )
+        rels["NAMED_DEFENDANT"] = _write(
+            out_dir, "named_defendant",
+            orgs[["caseId", "canonicalName", "roles", "confidence", "extractedBy", "reviewedByHuman"]],
+            [":START_ID(Case)", ":END_ID(Organization)", "roles:string[]", "confidence:double",
+             "extractedBy", "reviewedByHuman:boolean"],
+        )
+
+    return {"nodes": nodes, "relationships": rels}
+
+
+def import_command(files: dict, database: str = "neo4j") -> str:
+    """The neo4j-admin invocation that loads `files` into an empty database."""
+    parts = [
+        "neo4j-admin database import full", database,
+        "--overwrite-destination", f"--array-delimiter={ARRAY_DELIMITER_ARG}",
+        "--multiline-fields=true",
+    ]
+    for flag, groups in (("--nodes", files["nodes"]), ("--relationships", files["relationships"])):
+        for label, paths in groups.items():
+            parts.append(f"{flag}={label}={','.join(paths)}")
+    return " \\\n    ".join(parts)
+
+
+def run(out_dir: str = DEFAULT_IMPORT_DIR, organizations_csv: str = DEFAULT_ORGANIZATIONS_CSV):
+    tables = DailTables()
+    print(f"Writing neo4j-admin import files to {out_dir} ...")
+    organizations = load_organizations(organizations_csv, set(tables.cases["id"]))
+    if organizations is None:
+        print("  No entity extraction CSV found; organizations derived from Organizations_involved.")
+    files = write_import_files(tables, out_dir, organizations)
+    print("\nStop Neo4j, then load the files into an empty database with:\n")
+    print(import_command(files))
+    print("\nConstraints and indexes are created by init_schema on the next API start.")
+    if "NAMED_DEFENDANT" in files["relationships"]:
+        print("Then build the co-defendant projection: python -m app.ingest.co_defendants")
@@ -0,0 +1,37 @@
+"""
+Rebuild the CO_DEFENDANT projection from scratch:
+    python -m app.ingest.co_defendants   (from backend/ directory)
+
+Extraction, demo seeding and the differential DAIL reseed keep it current
+incrementally; run this after a bulk import or any manual edit of
+NAMED_DEFENDANT edges.
+"""
+import asyncio
+import os
+import time
+
+from dotenv import load_dotenv
+
+from app.services.neo4j_service import bump_graph_version, get_driver, init_schema, refresh_co_defendants
+
+load_dotenv()
+
+
+async def main():
+    uri = os.getenv("NEO4J_URI", "bolt://localhost:7687")
+    user = os.getenv("NEO4J_USER", "neo4j")
+    password = os.getenv("NEO4J_PASSWORD", "dail_password")
+    driver = await get_driver(uri, user, password)
+    await init_schema(driver)
+    start = time.perf_counter()
+    counts = await refresh_co_defendants(driver)
+    await bump_graph_version(driver, case_ids=[])  # CO_DEFENDANT only; no case rows or links changed
+    await driver.close()
+    print(
+        f"CO_DEFENDANT rebuilt in {time.perf_counter() - start:.1f}s: "
+        f"{counts['created']} new pairs, {counts['deleted']} removed"
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
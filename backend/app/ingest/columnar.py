@@ -0,0 +1,127 @@
+"""
+Typed columnar intermediate for the convert -> seed -> export pipeline.
+
+convert_xlsx writes every table twice: the CSV it always wrote, and a
+Parquet file with real types (int64 ids, list<string> for the
+comma-separated DAIL columns, date32 for dates). Downstream readers prefer
+the Parquet file, memory-mapped, and fall back to the CSV when pyarrow is
+not installed or the CSV is newer (e.g. edited by hand).
+"""
+import os
+from typing import Optional
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # optional: CSV-only pipeline
+    pa = None
+    pq = None
+
+# Column types per table; anything not listed is stored as string
+TABLE_TYPES = {
+    "dail_cases": {
+        "int": ["id", "Published_Opinions_binary"],
+        "list": ["Area_of_Application_Text", "Cause_of_Action_Text", "Issue_Text", "Name_of_Algorithm_Text"],
+        "date": ["Date_Action_Filed", "Date_Added"],
+    },
+    "dail_dockets": {"int": ["id", "Case_Number"]},
+    "dail_documents": {"int": ["id", "Case_Number"], "date": ["date"]},
+    "dail_secondary_sources": {"int": ["id", "Case_Number"]},
+}
+
+
+def parquet_available() -> bool:
+    return pq is not None
+
+
+def _arrow_type(table: str, column: str):
+    types = TABLE_TYPES.get(table, {})
+    if column in types.get("int", []):
+        return pa.int64()
+    if column in types.get("list", []):
+        return pa.list_(pa.string())
+    if column in types.get("date", []):
+        return pa.date32()
+    return pa.string()
+
+
+def _typed(df: pd.DataFrame, schema) -> pd.DataFrame:
+    """Coerce a converted chunk to the Parquet schema's column types."""
+    # Imported here: dail_tables reads through this module
+    from app.ingest.dail_tables import list_col
+
+    out = {}
+    for field in schema:
+        s = df[field.name] if field.name in df else pd.Series(None, index=df.index, dtype=object)
+        if pa.types.is_integer(field.type):
+            out[field.name] = pd.to_numeric(s, errors="coerce").astype("Int64")
+        elif pa.types.is_list(field.type):
+            out[field.name] = list_col(s)
+        elif pa.types.is_date(field.type):
+            parsed = pd.to_datetime(s, errors="coerce", format="mixed")
+            out[field.name] = parsed.dt.date.astype(object).where(parsed.notna(), None)
+        else:
+            out[field.name] = s.astype(object).where(s.notna(), None).map(
+                lambda v: v if v is None or isinstance(v, str) else str(v)
+            )
+    return pd.DataFrame(out, index=df.index)
+
+
+class TableWriter:
+    """
+    Append converted chunks to <data_dir>/<table>.csv and, when pyarrow is
+    available, <data_dir>/<table>.parquet. The schema is fixed by the first
+    chunk's columns so later chunks cannot drift.
+    """
+
+    def __init__(self, data_dir: str, table: str):
+        self.table = table
+        self.csv_path = os.path.join(data_dir, f"{table}.csv")
+        self.parquet_path = os.path.join(data_dir, f"{table}.parquet")
+        self.rows = 0
+        self._columns: Optional[list] = None
+        self._schema = None
+        self._parquet = None
+
+    def write(self, df: pd.DataFrame):
+        if self._columns is None:
+            self._columns = list(df.columns)
+            if parquet_available():
+                self._schema = pa.schema([(c, _arrow_type(self.table, c)) for c in self._columns])
+                self._parquet = pq.ParquetWriter(self.parquet_path, self._schema)
+        df = df.reindex(columns=self._columns)
+        df.to_csv(self.csv_path, mode="w" if self.rows == 0 else "a", header=self.rows == 0, index=False)
+        if self._parquet is not None:
+            batch = pa.Table.from_pandas(_typed(df, self._schema), schema=self._schema, preserve_index=False)
+            self._parquet.write_table(batch)
+        self.rows += len(df)
+
+    def close(self):
+        if self._parquet is not None:
+            self._parquet.close()
+            self._parquet = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def read_table(data_dir: str, table: str) -> Optional[pd.DataFrame]:
+    """
+    Load a converted table, preferring its memory-mapped Parquet file.
+    Returns None when neither file exists.
+    """
+    csv_path = os.path.join(data_dir, f"{table}.csv")
+    parquet_path = os.path.join(data_dir, f"{table}.parquet")
+    has_csv = os.path.exists(csv_path)
+    if parquet_available() and os.path.exists(parquet_path) and (
+        not has_csv or os.path.getmtime(parquet_path) >= os.path.getmtime(csv_path)
+    ):
+        return pd.read_parquet(parquet_path, memory_map=True)
+    if has_csv:
+        return pd.read_csv(csv_path)
+    return None
@@ -0,0 +1,112 @@
+"""
+Batch community detection over the defendant/theory projection.
+    python -m app.ingest.communities                         (from backend/ directory)
+    python -m app.ingest.communities --method label-propagation
+
+Organizations are linked by shared cases (their CO_DEFENDANT edges, so run
+this after app.ingest.co_defendants following a bulk import) and to the
+legal theories asserted against them (see
+app.services.graph_analytics.load_projection). Every
+clustered Organization and LegalTheory gets a `communityId`, and each
+community gets a summary node:
+
+    (:Community {id, size, organizationCount, theoryCount,
+                 topOrganizations, topTheories, method, runAt})
+
+Community 0 is the largest. Ids are reassigned on every run.
+"""
+import argparse
+import asyncio
+import os
+import time
+from datetime import datetime, UTC
+
+import numpy as np
+from dotenv import load_dotenv
+
+from app.ingest.batch_writer import write_batches
+from app.services.graph_analytics import label_propagation, load_projection, louvain, weighted_csr
+from app.services.neo4j_service import bump_graph_version, get_driver, init_schema
+
+load_dotenv()
+
+MEMBER_LABELS = {"Organization": "canonicalName", "LegalTheory": "name"}
+TOP_MEMBERS = 5
+
+
+def summarize(nodes: list, labels: np.ndarray, strength: np.ndarray) -> list:
+    """One summary row per community; members listed strongest (weighted degree) first."""
+    summaries = []
+    for community in range(int(labels.max()) + 1 if len(labels) else 0):
+        members = np.flatnonzero(labels == community)
+        members = members[np.argsort(-strength[members], kind="stable")]
+        orgs = [nodes[i][1] for i in members if nodes[i][0] == "Organization"]
+        theories = [nodes[i][1] for i in members if nodes[i][0] == "LegalTheory"]
+        summaries.append({
+            "id": community,
+            "size": len(members),
+            "organizationCount": len(orgs),
+            "theoryCount": len(theories),
+            "topOrganizations": orgs[:TOP_MEMBERS],
+            "topTheories": theories[:TOP_MEMBERS],
+        })
+    return summaries
+
+
+async def write_communities(driver, nodes: list, labels: np.ndarray, summaries: list, method: str, run_at: str):
+    for label, key_prop in MEMBER_LABELS.items():
+        rows = [
+            {"key": key, "community": int(labels[i])}
+            for i, (node_label, key) in enumerate(nodes) if node_label == label
+        ]
+        await write_batches(driver, f"{label} communities", f"""
+            UNWIND $rows AS row
+            MATCH (n:{label} {{{key_prop}: row.key}})
+            SET n.communityId = row.community, n.communityRunAt = $runAt
+        """, rows, params={"runAt": run_at})
+        async with driver.session() as session:
+            await session.run(f"""
+                MATCH (n:{label}) WHERE n.communityRunAt IS NOT NULL AND n.communityRunAt <> $runAt
+                REMOVE n.communityId, n.communityRunAt
+            """, runAt=run_at)
+    await write_batches(driver, "Community nodes", """
+        UNWIND $rows AS row
+        MERGE (m:Community {id: row.id})
+        SET m += row, m.method = $method, m.runAt = $runAt
+    """, summaries, params={"method": method, "runAt": run_at})
+    async with driver.session() as session:
+        await session.run("MATCH (m:Community) WHERE m.runAt <> $runAt DETACH DELETE m", runAt=run_at)
+
+
+async def main(method: str = "louvain", resolution: float = 1.0):
+    uri = os.getenv("NEO4J_URI", "bolt://localhost:7687")
+    user = os.getenv("NEO4J_USER", "neo4j")
+    password = os.getenv("NEO4J_PASSWORD", "dail_password")
+    driver = await get_driver(uri, user, password)
+    await init_schema(driver)
+    try:
+        start = time.perf_counter()
+        nodes, src, dst, weight = await load_projection(driver)
+        n = len(nodes)
+        if method == "louvain":
+            labels = louvain(n, src, dst, weight, resolution=resolution)
+        else:
+            labels = label_propagation(n, src, dst, weight)
+        indptr, _, weights = weighted_csr(n, src, dst, weight)
+        strength = np.bincount(np.repeat(np.arange(n), np.diff(indptr)), weights=weights, minlength=n)
+        summaries = summarize(nodes, labels, strength)
+        print(f"{method}: {n} nodes -> {len(summaries)} communities in {time.perf_counter() - start:.1f}s")
+        for s in summaries[:10]:
+            print(f"  #{s['id']:<4} {s['size']:>5} members  {', '.join(s['topOrganizations'][:3])}")
+        await write_communities(driver, nodes, labels, summaries, method, datetime.now(UTC).isoformat())
+        await bump_graph_version(driver, case_ids=[])  # node properties only; no case rows or links changed
+    finally:
+        await driver.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Detect litigation communities among defendants and theories.")
+    parser.add_argument("--method", choices=["louvain", "label-propagation"], default="louvain")
+    parser.add_argument("--resolution", type=float, default=1.0, help="Louvain resolution (>1: smaller communities)")
+    args = parser.parse_args()
+    asyncio.run(main(args.method, args.resolution))
@@ -1,16 +1,33 @@
 """
 Step 1: Convert DAIL Excel files to clean CSVs with data quality fixes applied.
 Run once before seeding: python -m app.ingest.convert_xlsx (from backend/ directory)
+
+Sheets are streamed through openpyxl's read-only mode in fixed-size chunks,
+so memory stays flat as the source tables grow. Each table is written as a
+CSV and, when pyarrow is installed, as a typed Parquet file that the
+downstream stages read in preference to the CSV.
 """
-import pandas as pd
-import re
 import os
+import re
+
+import numpy as np
+import pandas as pd
+from openpyxl import load_workbook
+
+from app.ingest.columnar import TableWriter, parquet_available
 
 # Resolve data/ relative to project root: backend/app/ingest/ -> up 3 -> dail-knowledge-graph/data/
 DATA_DIR = os.path.normpath(
     os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "data")
 )
 
+CHUNK_ROWS = int(os.getenv("CONVERT_CHUNK_ROWS", "5000"))
+
+CASES_XLSX = "Case_Table_2026-Feb-21_1952.xlsx"
+DOCKETS_XLSX = "Docket_Table_2026-Feb-21_2003.xlsx"
+DOCUMENTS_XLSX = "Document_Table_2026-Feb-21_2002.xlsx"
+SECONDARY_SOURCES_XLSX = "Secondary_Source_Coverage_Table_2026-Feb-21_2058.xlsx"
+
 
 def make_slug(caption, numeric_id):
     """Generate a URL-safe slug from case caption, using numeric id as suffix."""
@@ -23,16 +40,50 @@ def make_slug(caption, numeric_id):
     return s or f"case-{int(numeric_id)}"
 
 
-def convert_cases():
-    print("Converting Case table...")
-    df = pd.read_excel(f"{DATA_DIR}/Case_Table_2026-Feb-21_1952.xlsx")
-
+def iter_sheet_chunks(path: str, chunk_rows: int = CHUNK_ROWS):
+    """Yield the first sheet as DataFrames of up to chunk_rows rows, header row as columns."""
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = wb.worksheets[0].iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        columns = [str(h) if h is not None else f"Unnamed: {i}" for i, h in enumerate(header)]
+        batch = []
+        for row in rows:
+            if all(v is None for v in row):
+                continue
+            batch.append(row)
+            if len(batch) >= chunk_rows:
+                yield _frame(batch, columns)
+                batch = []
+        if batch:
+            yield _frame(batch, columns)
+    finally:
+        wb.close()
+
+
+def _frame(rows: list, columns: list) -> pd.DataFrame:
+    # Empty cells as NaN and datetime cells as datetime64, as pd.read_excel would give
+    df = pd.DataFrame(rows, columns=columns)
+    return df.astype(object).where(df.notna(), np.nan).infer_objects()
+
+
+def _convert(source: str, table: str, fix, data_dir: str, chunk_rows: int) -> int:
+    """Stream one workbook through `fix` into <table>.csv / <table>.parquet; returns rows written."""
+    with TableWriter(data_dir, table) as writer:
+        for chunk in iter_sheet_chunks(os.path.join(data_dir, source), chunk_rows):
+            writer.write(fix(chunk))
+    return writer.rows
+
+
+def fix_cases(df: pd.DataFrame) -> pd.DataFrame:
     # Fix 1: Fill missing Case_snug with generated slug
     missing_slug = df["Case_snug"].isnull()
     df.loc[missing_slug, "Case_snug"] = df[missing_slug].apply(
         lambda r: make_slug(r["Caption"], r["id"]), axis=1
     )
-    print(f"  Generated slugs for {missing_slug.sum()} cases missing Case_snug")
+    df.attrs["generated_slugs"] = int(missing_slug.sum())
 
     # Fix 2: Normalize Status_Disposition (e.g. lowercase 'active' -> 'Active')
     df["Status_Disposition"] = df["Status_Disposition"].astype(str).str.strip().str.title()
@@ -47,25 +98,17 @@ def convert_cases():
     for col in ["Caption", "Brief_Description", "Jurisdiction_Filed", "Current_Jurisdiction"]:
         if col in df.columns:
             df[col] = df[col].fillna("").astype(str).str.strip()
-
-    df.to_csv(f"{DATA_DIR}/dail_cases.csv", index=False)
-    print(f"  Wrote {len(df)} rows to dail_cases.csv")
     return df
 
 
-def convert_dockets():
-    print("Converting Docket table...")
-    df = pd.read_excel(f"{DATA_DIR}/Docket_Table_2026-Feb-21_2003.xlsx")
+def fix_dockets(df: pd.DataFrame) -> pd.DataFrame:
     df["Case_Number"] = df["Case_Number"].fillna(0).astype(int)
     df["id"] = df["id"].fillna(0).astype(int)
     df["link"] = df["link"].fillna("").astype(str).str.strip()
-    df.to_csv(f"{DATA_DIR}/dail_dockets.csv", index=False)
-    print(f"  Wrote {len(df)} rows to dail_dockets.csv")
+    return df
 
 
-def convert_documents():
-    print("Converting Document table...")
-    df = pd.read_excel(f"{DATA_DIR}/Document_Table_2026-Feb-21_2002.xlsx")
+def fix_documents(df: pd.DataFrame) -> pd.DataFrame:
     df["Case_Number"] = df["Case_Number"].fillna(0).astype(int)
     df["id"] = df["id"].fillna(0).astype(int)
     df["link"] = df["link"].fillna("").astype(str).str.strip()
@@ -76,15 +119,10 @@ def convert_documents():
     )
     df["cite_or_reference"] = df["cite_or_reference"].fillna("").astype(str).str.strip()
     df["document"] = df["document"].fillna("").astype(str).str.strip()
-    df.to_csv(f"{DATA_DIR}/dail_documents.csv", index=False)
-    print(f"  Wrote {len(df)} rows to dail_documents.csv")
+    return df
 
 
-def convert_secondary_sources():
-    print("Converting Secondary Source table...")
-    df = pd.read_excel(
-        f"{DATA_DIR}/Secondary_Source_Coverage_Table_2026-Feb-21_2058.xlsx"
-    )
+def fix_secondary_sources(df: pd.DataFrame) -> pd.DataFrame:
     df["Case_Number"] = df["Case_Number"].fillna(0).astype(int)
     df["id"] = df["id"].fillna(0).astype(int)
     df["Secondary_Source_Link"] = (
@@ -93,21 +131,54 @@ def convert_secondary_sources():
     df["Secondary_Source_Title"] = (
         df["Secondary_Source_Title"].fillna("").astype(str).str.strip()
     )
-    df.to_csv(f"{DATA_DIR}/dail_secondary_sources.csv", index=False)
-    print(f"  Wrote {len(df)} rows to dail_secondary_sources.csv")
+    return df
+
+
+def convert_cases(data_dir: str = DATA_DIR, chunk_rows: int = CHUNK_ROWS) -> int:
+    print("Converting Case table...")
+    generated = 0
+
+    def fix(df):
+        nonlocal generated
+        df = fix_cases(df)
+        generated += df.attrs["generated_slugs"]
+        return df
+
+    rows = _convert(CASES_XLSX, "dail_cases", fix, data_dir, chunk_rows)
+    print(f"  Generated slugs for {generated} cases missing Case_snug")
+    print(f"  Wrote {rows} rows to dail_cases.csv")
+    return rows
+
+
+def convert_dockets(data_dir: str = DATA_DIR, chunk_rows: int = CHUNK_ROWS) -> int:
+    print("Converting Docket table...")
+    rows = _convert(DOCKETS_XLSX, "dail_dockets", fix_dockets, data_dir, chunk_rows)
+    print(f"  Wrote {rows} rows to dail_dockets.csv")
+    return rows
+
+
+def convert_documents(data_dir: str = DATA_DIR, chunk_rows: int = CHUNK_ROWS) -> int:
+    print("Converting Document table...")
+    rows = _convert(DOCUMENTS_XLSX, "dail_documents", fix_documents, data_dir, chunk_rows)
+    print(f"  Wrote {rows} rows to dail_documents.csv")
+    return rows
+
+
+def convert_secondary_sources(data_dir: str = DATA_DIR, chunk_rows: int = CHUNK_ROWS) -> int:
+    print("Converting Secondary Source table...")
+    rows = _convert(
+        SECONDARY_SOURCES_XLSX, "dail_secondary_sources", fix_secondary_sources, data_dir, chunk_rows
+    )
+    print(f"  Wrote {rows} rows to dail_secondary_sources.csv")
+    return rows
 
 
-if __name__ == "__main__":
-    os.makedirs(DATA_DIR, exist_ok=True)
+def main(data_dir: str = DATA_DIR):
+    os.makedirs(data_dir, exist_ok=True)
 
     # Verify Excel files exist before starting
-    expected = [
-        "Case_Table_2026-Feb-21_1952.xlsx",
-        "Docket_Table_2026-Feb-21_2003.xlsx",
-        "Document_Table_2026-Feb-21_2002.xlsx",
-        "Secondary_Source_Coverage_Table_2026-Feb-21_2058.xlsx",
-    ]
-    missing = [f for f in expected if not os.path.exists(f"{DATA_DIR}/{f}")]
+    expected = [CASES_XLSX, DOCKETS_XLSX, DOCUMENTS_XLSX, SECONDARY_SOURCES_XLSX]
+    missing = [f for f in expected if not os.path.exists(f"{data_dir}/{f}")]
     if missing:
         print("ERROR: Missing Excel files in data/:")
         for f in missing:
@@ -115,14 +186,22 @@ if __name__ == "__main__":
         print("\nPlace all four Excel files in the data/ directory and re-run.")
         raise SystemExit(1)
 
-    cases_df = convert_cases()
-    convert_dockets()
-    convert_documents()
-    convert_secondary_sources()
+    convert_cases(data_dir)
+    convert_dockets(data_dir)
+    convert_documents(data_dir)
+    convert_secondary_sources(data_dir)
 
     print("\nAll CSVs written. Data quality fixes applied:")
     print("  OK: Generated slugs for missing Case_snug values")
     print("  OK: Normalized Status_Disposition capitalization")
     print("  OK: Cleaned whitespace across text fields")
     print("  OK: Standardized date formats to YYYY-MM-DD")
+    if parquet_available():
+        print("  OK: Typed Parquet copies written alongside (read in preference to the CSVs)")
+    else:
+        print("  NOTE: pyarrow not installed; downstream stages will read the CSVs")
     print("\nRun next: python -m app.ingest.seed_from_excel")
+
+
+if __name__ == "__main__":
+    main()
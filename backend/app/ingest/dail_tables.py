@@ -0,0 +1,243 @@
+"""
+Columnar loader for the clean DAIL tables produced by convert_xlsx.py.
+
+Each table is read once (its typed Parquet file when available, else the
+CSV) and cleaned column-at-a-time; child tables are resolved to their
+parent Case slug through a lookup built once from the cases table. Both the Neo4j seeder (seed_from_excel.py) and the SQLite
+exporter (export_sql.py) consume the resulting frames, so the two outputs
+always agree on what a cleaned row looks like.
+"""
+import hashlib
+import json
+import os
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from app.ingest.columnar import read_table
+
+# Resolve data/ relative to project root: backend/app/ingest/ -> up 3 -> dail-knowledge-graph/data/
+DATA_DIR = os.path.normpath(
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "data")
+)
+
+CASES_TABLE = "dail_cases"
+DOCKETS_TABLE = "dail_dockets"
+DOCUMENTS_TABLE = "dail_documents"
+SECONDARY_SOURCES_TABLE = "dail_secondary_sources"
+
+
+# ── Cell rules (reference semantics for the column forms below) ───────────
+
+def clean_val(val) -> str:
+    try:
+        if pd.isna(val):
+            return ""
+    except Exception:
+        pass
+    return str(val).strip()
+
+
+def clean_list(val) -> list:
+    """Parse comma-separated values into a clean Python list."""
+    try:
+        if pd.isna(val):
+            return []
+    except Exception:
+        pass
+    s = str(val).strip()
+    if s.startswith("'") or s.startswith('"'):
+        parts = [p.strip().strip("'\"") for p in s.split(",")]
+    else:
+        parts = [p.strip() for p in s.split(",")]
+    return [p for p in parts if p and p.lower() not in ("nan", "none", "")]
+
+
+def clean_date(val) -> str | None:
+    try:
+        if pd.isna(val):
+            return None
+    except Exception:
+        pass
+    try:
+        return pd.to_datetime(val).strftime("%Y-%m-%d")
+    except Exception:
+        return None
+
+
+# ── Vectorized column cleaning (same rules as the per-cell helpers above) ──
+
+def str_col(s: pd.Series) -> pd.Series:
+    """Column form of clean_val: NaN -> "", everything else stripped text."""
+    return s.where(s.notna(), "").astype(str).str.strip()
+
+
+def list_col(s: pd.Series) -> pd.Series:
+    """
+    Column form of clean_list: comma-separated text -> list of cleaned items.
+    Values that are already lists (Parquet list columns) were cleaned at convert time.
+    """
+    if len(s) and s.map(lambda v: isinstance(v, (list, np.ndarray))).all():
+        return s.map(list)
+    text = str_col(s).reset_index(drop=True)
+    quoted = text.str.startswith(("'", '"'))
+    parts = text.str.split(",").explode().str.strip()
+    parts = parts.where(~quoted.loc[parts.index].to_numpy(), parts.str.strip("'\""))
+    keep = parts.ne("") & ~parts.str.lower().isin(["nan", "none"])
+    grouped = parts[keep].groupby(level=0).agg(list)
+    lists = [v if isinstance(v, list) else [] for v in grouped.reindex(text.index)]
+    return pd.Series(lists, index=s.index, dtype=object)
+
+
+def date_col(s: pd.Series) -> pd.Series:
+    """Column form of clean_date: parse mixed formats once per column; unparseable -> None."""
+    parsed = pd.to_datetime(s, errors="coerce", format="mixed")
+    out = parsed.dt.strftime("%Y-%m-%d").astype(object)
+    return out.where(parsed.notna(), None)
+
+
+def pipe_col(s: pd.Series) -> pd.Series:
+    """Join a list column into the pipe-separated text used by the SQL export."""
+    return s.str.join("|")
+
+
+def content_hash(frame: pd.DataFrame) -> pd.Series:
+    """Stable digest of each cleaned row, so a reseed can tell which rows changed."""
+    digests = [
+        hashlib.sha1(json.dumps(row, default=str, ensure_ascii=False).encode("utf-8")).hexdigest()
+        for row in frame.itertuples(index=False, name=None)
+    ]
+    return pd.Series(digests, index=frame.index, dtype=object)
+
+
+def slug_col(df: pd.DataFrame, id_to_slug: dict, col: str = "Case_Number") -> tuple:
+    """
+    Map a child table's numeric case reference to the parent Case slug.
+    Returns (slugs, parseable): unparseable references are dropped silently,
+    parseable ones without a matching case count as orphans.
+    """
+    nums = pd.to_numeric(_col(df, col), errors="coerce")
+    slugs = nums.map(pd.Series(id_to_slug, dtype=object))
+    return slugs, nums.notna()
+
+
+def _col(df: pd.DataFrame, col: str) -> pd.Series:
+    return df[col] if col in df else pd.Series(float("nan"), index=df.index)
+
+
+# ── Table frames ───────────────────────────────────────────────────────────
+
+def case_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Cleaned cases keyed by slug, with graph property names as columns."""
+    return pd.DataFrame({
+        "id": str_col(_col(df, "Case_snug")),
+        "recordNumber": str_col(_col(df, "Record_Number")),
+        "caption": str_col(_col(df, "Caption")),
+        "briefDescription": str_col(_col(df, "Brief_Description")),
+        "areaOfApplication": list_col(_col(df, "Area_of_Application_Text")),
+        "causeOfAction": list_col(_col(df, "Cause_of_Action_Text")),
+        "issues": list_col(_col(df, "Issue_Text")),
+        "algorithmNames": list_col(_col(df, "Name_of_Algorithm_Text")),
+        "organizations": str_col(_col(df, "Organizations_involved")),
+        "jurisdictionFiled": str_col(_col(df, "Jurisdiction_Filed")),
+        "dateFiled": date_col(_col(df, "Date_Action_Filed")),
+        "currentJurisdiction": str_col(_col(df, "Current_Jurisdiction")),
+        "jurisdictionType": str_col(_col(df, "Jurisdiction_Type_Text")),
+        "status": str_col(_col(df, "Status_Disposition")),
+        "summarySignificance": str_col(_col(df, "Summary_of_Significance")),
+        "summaryFacts": str_col(_col(df, "Summary_Facts_Activity_to_Date")),
+        "mostRecentActivity": str_col(_col(df, "Most_Recent_Activity")),
+        "isClassAction": str_col(_col(df, "Class_Action")),
+        "dateAdded": date_col(_col(df, "Date_Added")),
+        "source": "dail",
+    })
+
+
+def docket_frame(df: pd.DataFrame, id_to_slug: dict) -> tuple:
+    """Dockets linked to a known case, and the count of orphaned rows."""
+    slugs, parseable = slug_col(df, id_to_slug)
+    linked = slugs.notna()
+    frame = pd.DataFrame({
+        "id": str_col(_col(df, "id")),
+        "caseId": slugs,
+        "court": str_col(_col(df, "court")),
+        "number": str_col(_col(df, "number")),
+        "link": str_col(_col(df, "link")),
+    })[linked]
+    return frame, int((parseable & ~linked).sum())
+
+
+def document_frame(df: pd.DataFrame, id_to_slug: dict) -> tuple:
+    """Documents linked to a known case, and the count of orphaned rows."""
+    slugs, parseable = slug_col(df, id_to_slug)
+    linked = slugs.notna()
+    frame = pd.DataFrame({
+        "id": str_col(_col(df, "id")),
+        "caseId": slugs,
+        "court": str_col(_col(df, "court")),
+        "date": str_col(_col(df, "date")),
+        "link": str_col(_col(df, "link")),
+        "docType": str_col(_col(df, "document")),
+        "cite": str_col(_col(df, "cite_or_reference")),
+    })[linked]
+    return frame, int((parseable & ~linked).sum())
+
+
+def secondary_source_frame(df: pd.DataFrame, id_to_slug: dict) -> tuple:
+    """Secondary sources with a link and a known case, and the count of orphaned rows."""
+    slugs, parseable = slug_col(df, id_to_slug)
+    links = str_col(_col(df, "Secondary_Source_Link"))
+    has_link = links.ne("") & links.ne("nan")
+    frame = pd.DataFrame({
+        "id": pd.to_numeric(_col(df, "id"), errors="coerce").fillna(0).astype(int),
+        "caseId": slugs,
+        "title": str_col(_col(df, "Secondary_Source_Title")),
+        "link": links,
+    })[slugs.notna() & has_link]
+    return frame, int((parseable & slugs.isna()).sum())
+
+
+class DailTables:
+    """
+    The four DAIL tables, read and cleaned once.
+
+    A child table whose file is missing is None; `orphaned` counts child rows
+    whose case reference parses but matches no case. Every frame carries a
+    contentHash column computed over its cleaned values.
+    """
+
+    def __init__(self, data_dir: Optional[str] = None):
+        self.data_dir = data_dir or DATA_DIR
+        raw_cases = read_table(self.data_dir, CASES_TABLE)
+        if raw_cases is None:
+            raise FileNotFoundError(os.path.join(self.data_dir, f"{CASES_TABLE}.csv"))
+        self.cases = _with_hash(case_frame(raw_cases))
+        self.id_to_slug = dict(zip(raw_cases["id"].astype(int), raw_cases["Case_snug"]))
+        self.orphaned = {}
+        self.dockets = self._child(DOCKETS_TABLE, "dockets", docket_frame)
+        self.documents = self._child(DOCUMENTS_TABLE, "documents", document_frame)
+        self.secondary_sources = self._child(
+            SECONDARY_SOURCES_TABLE, "secondary_sources", secondary_source_frame
+        )
+
+    def _child(self, table: str, name: str, build) -> Optional[pd.DataFrame]:
+        raw = read_table(self.data_dir, table)
+        if raw is None:
+            return None
+        frame, self.orphaned[name] = build(raw, self.id_to_slug)
+        return _with_hash(frame)
+
+
+def _with_hash(frame: pd.DataFrame) -> pd.DataFrame:
+    return frame.assign(contentHash=content_hash(frame))
+
+
+def records(frame: pd.DataFrame) -> list:
+    """Row dicts for UNWIND $rows batches."""
+    return frame.to_dict("records")
+
+
+def rows(frame: pd.DataFrame) -> list:
+    """Positional tuples for sqlite executemany, in the frame's column order."""
+    return list(frame.itertuples(index=False, name=None))
@@ -5,7 +5,7 @@ Run with: python -m app.ingest.demo_seed (from backend/ directory)
 import asyncio
 import os
 from dotenv import load_dotenv
-from app.services.neo4j_service import get_driver, init_schema
+from app.services.neo4j_service import bump_graph_version, get_driver, init_schema, refresh_co_defendants
 
 load_dotenv()
 
@@ -281,6 +281,8 @@ async def main():
     driver = await get_driver(uri, user, password)
     await init_schema(driver)
     await seed_demo(driver)
+    await refresh_co_defendants(driver)
+    await bump_graph_version(driver)
     await driver.close()
 
 
@@ -0,0 +1,105 @@
+"""
+Opinion-text enrichment for CourtListener ingest candidates.
+
+Fetches cluster/opinion text for each candidate docket with bounded
+concurrency and yields candidates as soon as their text is ready, so
+classification of early arrivals overlaps with the remaining fetches.
+Only the most keyword-dense windows of each opinion are kept.
+"""
+import asyncio
+import logging
+import re
+from typing import AsyncIterator, Iterable
+from app.models.graph_models import StagingCase
+from app.services.courtlistener import CourtListenerClient, AI_LITIGATION_KEYWORDS
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONCURRENCY = 4
+DEFAULT_MAX_CHARS = 4000
+WINDOW_RADIUS = 300
+WINDOW_SEPARATOR = " … "
+
+
+def keyword_window(
+    text: str,
+    keywords: Iterable[str] = AI_LITIGATION_KEYWORDS,
+    max_chars: int = DEFAULT_MAX_CHARS,
+    radius: int = WINDOW_RADIUS,
+) -> str:
+    """
+    Keep the most relevant max_chars of text: windows of +/- radius chars
+    around keyword hits, merged where they overlap, densest windows first,
+    joined by WINDOW_SEPARATOR (counted against max_chars). Falls back to the
+    head of the text when no keyword occurs.
+    """
+    if len(text) <= max_chars:
+        return text
+    pattern = re.compile("|".join(re.escape(k) for k in keywords), re.IGNORECASE)
+    windows: list = []  # [start, end, hits]
+    for m in pattern.finditer(text):
+        start, end = max(0, m.start() - radius), min(len(text), m.end() + radius)
+        if windows and start <= windows[-1][1]:
+            windows[-1][1] = max(windows[-1][1], end)
+            windows[-1][2] += 1
+        else:
+            windows.append([start, end, 1])
+    if not windows:
+        return text[:max_chars]
+
+    parts = []
+    budget = max_chars
+    for start, end, _ in sorted(windows, key=lambda w: (-w[2], w[0])):
+        room = budget - (len(WINDOW_SEPARATOR) if parts else 0)
+        if room <= 0:
+            break
+        chunk = text[start:end].strip()[:room]
+        if chunk:
+            parts.append(chunk)
+            budget = room - len(chunk)
+    return WINDOW_SEPARATOR.join(parts)
+
+
+async def _fetch_text(
+    cl: CourtListenerClient,
+    staging: StagingCase,
+    semaphore: asyncio.Semaphore,
+    max_chars: int,
+) -> StagingCase:
+    async with semaphore:
+        try:
+            for cluster_id in staging.clusterIds:
+                text = await cl.get_opinion_text(int(cluster_id))
+                if text:
+                    staging.opinionText = keyword_window(text, max_chars=max_chars)
+                    break
+        except Exception as e:
+            logger.warning(f"Opinion enrichment failed for docket {staging.clSourceId}: {e!r}")
+    return staging
+
+
+async def enrich_candidates(
+    cl: CourtListenerClient,
+    candidates: list,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    max_chars: int = DEFAULT_MAX_CHARS,
+) -> AsyncIterator[StagingCase]:
+    """
+    Yield each candidate with opinionText filled in (when the docket has an
+    opinion), in completion order. Candidates without clusters pass straight
+    through without a request.
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    pending = [
+        asyncio.ensure_future(_fetch_text(cl, staging, semaphore, max_chars))
+        for staging in candidates if staging.clusterIds
+    ]
+    try:
+        for staging in candidates:
+            if not staging.clusterIds:
+                yield staging
+        for fut in asyncio.as_completed(pending):
+            yield await fut
+    finally:
+        for fut in pending:
+            fut.cancel()
@@ -1,10 +1,12 @@
 import asyncio
+import csv
 import json
 import os
 import uuid
 from datetime import datetime, UTC
 from dotenv import load_dotenv
-from app.services.neo4j_service import get_driver
+from app.ingest.bulk_import import DEFAULT_ORGANIZATIONS_CSV
+from app.services.neo4j_service import bump_graph_version, get_driver, refresh_co_defendants
 from app.services.claude_service import extract_entities
 
 load_dotenv()
@@ -13,12 +15,15 @@ CONFIDENCE_AUTO = 0.85
 CONFIDENCE_MIN = 0.70
 
 
-async def process_all_cases(driver, api_key: str):
+async def process_all_cases(driver, api_key: str) -> list:
+    """Extract and link entities for up to 500 unlinked cases; returns the ids processed."""
     async with driver.session() as session:
         result = await session.run("""
             MATCH (c:Case)
             WHERE c.organizations IS NOT NULL AND c.organizations <> ''
-              AND NOT EXISTS { (c)-[:NAMED_DEFENDANT]->() }
+              AND NOT EXISTS {
+                  (c)-[r:NAMED_DEFENDANT]->() WHERE coalesce(r.extractedBy, '') <> 'dail'
+              }
             RETURN c.id AS id, c.caption AS caption,
                    c.organizations AS orgsText,
                    c.algorithmNames AS algoNames
@@ -29,6 +34,8 @@ async def process_all_cases(driver, api_key: str):
     print(f"Processing {len(cases)} cases for entity extraction...")
     approved = 0
     queued = 0
+    linked_cases = []
+    replaced_derived = False
 
     for i, case in enumerate(cases):
         algo_text = ", ".join(case.get("algoNames") or [])
@@ -41,6 +48,12 @@ async def process_all_cases(driver, api_key: str):
         )
 
         async with driver.session() as session:
+            # Links a bulk import derived from the raw text give way to extracted ones
+            result = await session.run(
+                "MATCH (:Case {id: $caseId})-[r:NAMED_DEFENDANT {extractedBy: 'dail'}]->() DELETE r",
+                caseId=case["id"],
+            )
+            replaced_derived = replaced_derived or (await result.consume()).counters.relationships_deleted > 0
             # Process organizations
             for org in extracted.get("organizations", []):
                 if org.get("confidence", 0) < CONFIDENCE_MIN:
@@ -66,6 +79,8 @@ async def process_all_cases(driver, api_key: str):
                         conf=org["confidence"],
                     )
                     approved += 1
+                    if not linked_cases or linked_cases[-1] != case["id"]:
+                        linked_cases.append(case["id"])
                 else:
                     item_id = str(uuid.uuid4())
                     await session.run(
@@ -133,6 +148,32 @@ async def process_all_cases(driver, api_key: str):
     print(
         f"\nEntity extraction complete: {approved} auto-approved, {queued} queued for review"
     )
+    if linked_cases or replaced_derived:
+        # Dropped derived links leave their organizations' pairs stale: rebuild them all
+        co = await refresh_co_defendants(driver, case_ids=None if replaced_derived else linked_cases)
+        print(f"CO_DEFENDANT projection updated for {len(linked_cases)} cases: "
+              f"{co['created']} new pairs, {co['deleted']} removed")
+    return [case["id"] for case in cases]
+
+
+async def export_organizations(driver, path: str = DEFAULT_ORGANIZATIONS_CSV) -> int:
+    """Write every extracted NAMED_DEFENDANT link as the CSV bulk_import reads; returns rows written."""
+    async with driver.session() as session:
+        result = await session.run("""
+            MATCH (c:Case)-[r:NAMED_DEFENDANT]->(o:Organization)
+            WHERE coalesce(r.extractedBy, '') <> 'dail'
+            RETURN c.id AS caseId, o.canonicalName AS canonicalName, o.name AS name,
+                   r.roles AS roles, r.confidence AS confidence
+            ORDER BY caseId, canonicalName
+        """)
+        rows = [dict(r) async for r in result]
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, ["caseId", "canonicalName", "name", "roles", "confidence"])
+        writer.writeheader()
+        for row in rows:
+            writer.writerow({**row, "roles": ", ".join(row["roles"] or [])})
+    return len(rows)
 
 
 async def main():
@@ -143,7 +184,10 @@ async def main():
     if not api_key:
         raise ValueError("GEMINI_API_KEY not set in .env")
     driver = await get_driver(uri, user, password)
-    await process_all_cases(driver, api_key)
+    processed = await process_all_cases(driver, api_key)
+    await bump_graph_version(driver, case_ids=processed)
+    written = await export_organizations(driver)
+    print(f"{written} organization links written to {DEFAULT_ORGANIZATIONS_CSV} (for seed_from_excel --bulk)")
     await driver.close()
 
 
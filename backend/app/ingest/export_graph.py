@@ -0,0 +1,287 @@
+"""
+Export the full Neo4j graph — every node label and relationship type the app
+writes, with their properties — into normalized SQLite tables for offline
+analytics:
+
+    python -m app.ingest.export_graph          (from backend/ directory)
+    python -m app.ingest.export_graph --full   (rewrite every row)
+
+Output: data/dail_graph.db (or GRAPH_SQLITE_PATH). One table per node
+label, keyed by the label's natural key, and one per relationship type,
+keyed by (start, end) and indexed on the end key for reverse lookups. Each
+row also keeps every property as JSON in `properties`.
+
+Exports are incremental. Nothing is read when the graph version
+(GraphMeta, bumped by every writer) matches the last export. Otherwise
+nodes and relationships are streamed in batches and only rows whose
+content hash changed are written; rows gone from the graph are deleted.
+
+The same file is the API's SQLite read store (app.services.sqlite_store);
+the pipeline and the CourtListener ingest job re-run this after they write.
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from datetime import datetime, UTC
+from typing import Optional
+
+from dotenv import load_dotenv
+
+from app.services.neo4j_service import get_driver, get_graph_version
+from app.services.sqlite_store import DEFAULT_GRAPH_DB
+
+load_dotenv()
+
+EXPORT_BATCH = 1000
+
+# label: (table, key property, key column, [(column, property, sql type)])
+NODE_TABLES = {
+    "Case": ("cases", "id", "id", [
+        ("caption", "caption", "TEXT"),
+        ("status", "status", "TEXT"),
+        ("date_filed", "dateFiled", "TEXT"),
+        ("jurisdiction_filed", "jurisdictionFiled", "TEXT"),
+        ("jurisdiction_type", "jurisdictionType", "TEXT"),
+        ("source", "source", "TEXT"),
+    ]),
+    "Docket": ("dockets", "id", "id", [
+        ("court", "court", "TEXT"), ("number", "number", "TEXT"), ("link", "link", "TEXT"),
+    ]),
+    "Document": ("documents", "id", "id", [
+        ("court", "court", "TEXT"), ("date", "date", "TEXT"),
+        ("document_type", "type", "TEXT"), ("link", "link", "TEXT"),
+    ]),
+    "SecondarySource": ("secondary_sources", "link", "link", [("title", "title", "TEXT")]),
+    "Organization": ("organizations", "canonicalName", "canonical_name", [
+        ("name", "name", "TEXT"),
+        ("pagerank", "pagerank", "REAL"),
+        ("betweenness", "betweenness", "REAL"),
+        ("degree", "degree", "INTEGER"),
+    ]),
+    "AISystem": ("ai_systems", "name", "name", [("category", "category", "TEXT")]),
+    "LegalTheory": ("legal_theories", "name", "name", []),
+    "Court": ("courts", "name", "name", [("jurisdiction_type", "jurisdictionType", "TEXT")]),
+}
+
+# type: (table, start label, start column, end label, end column, [(column, property, sql type)])
+REL_TABLES = {
+    "NAMED_DEFENDANT": ("named_defendant", "Case", "case_id", "Organization", "organization", [
+        ("roles", "roles", "TEXT"),
+        ("confidence", "confidence", "REAL"),
+        ("extracted_by", "extractedBy", "TEXT"),
+        ("reviewed_by_human", "reviewedByHuman", "INTEGER"),
+    ]),
+    "INVOLVES_SYSTEM": ("involves_system", "Case", "case_id", "AISystem", "ai_system", [
+        ("confidence", "confidence", "REAL"),
+        ("reviewed_by_human", "reviewedByHuman", "INTEGER"),
+    ]),
+    "ASSERTS_CLAIM": ("asserts_claim", "Case", "case_id", "LegalTheory", "legal_theory", []),
+    "FILED_IN": ("filed_in", "Case", "case_id", "Court", "court", []),
+    "HAS_DOCKET": ("has_docket", "Case", "case_id", "Docket", "docket_id", []),
+    "HAS_DOCUMENT": ("has_document", "Case", "case_id", "Document", "document_id", []),
+    "HAS_SECONDARY_SOURCE": ("has_secondary_source", "Case", "case_id", "SecondarySource", "link", [
+        ("source_id", "sourceId", "INTEGER"),
+    ]),
+    "CO_DEFENDANT": ("co_defendant", "Organization", "organization", "Organization", "co_defendant", [
+        ("shared_cases", "sharedCases", "INTEGER"),
+        ("first_filed", "firstFiled", "TEXT"),
+        ("last_filed", "lastFiled", "TEXT"),
+    ]),
+}
+
+INDEXES = [
+    "CREATE INDEX IF NOT EXISTS idx_g_cases_status ON cases(status)",
+    "CREATE INDEX IF NOT EXISTS idx_g_cases_date_filed ON cases(date_filed)",
+    "CREATE INDEX IF NOT EXISTS idx_g_cases_jurisdiction ON cases(jurisdiction_filed)",
+    "CREATE INDEX IF NOT EXISTS idx_g_organizations_name ON organizations(name)",
+    # Rankings of the SQLite read store (app.services.sqlite_store), ties by name
+    "CREATE INDEX IF NOT EXISTS idx_g_organizations_pagerank ON organizations(pagerank DESC, canonical_name)",
+    "CREATE INDEX IF NOT EXISTS idx_g_organizations_betweenness ON organizations(betweenness DESC, canonical_name)",
+    "CREATE INDEX IF NOT EXISTS idx_g_organizations_degree ON organizations(degree DESC, canonical_name)",
+]
+
+
+def add_missing_columns(conn) -> bool:
+    """
+    Add columns declared since an existing file was created (CREATE TABLE IF
+    NOT EXISTS leaves old tables alone) and clear those tables' hashes so the
+    sync refills them. Returns whether anything was added.
+    """
+    specs = [(t, cols) for t, _, _, cols in NODE_TABLES.values()]
+    specs += [(t, cols) for t, _, _, _, _, cols in REL_TABLES.values()]
+    added = False
+    for table, cols in specs:
+        existing = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+        if not existing:
+            continue
+        missing = [(c, t) for c, _, t in cols if c not in existing]
+        for column, sql_type in missing:
+            conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {sql_type}")
+        if missing:
+            conn.execute(f"UPDATE {table} SET content_hash = ''")  # noqa: S608
+            added = True
+    conn.commit()
+    return added
+
+
+def schema_sql() -> str:
+    stmts = ["CREATE TABLE IF NOT EXISTS export_meta (key TEXT PRIMARY KEY, value TEXT)"]
+    for table, _, key_col, cols in NODE_TABLES.values():
+        extra = "".join(f", {c} {t}" for c, _, t in cols)
+        stmts.append(
+            f"CREATE TABLE IF NOT EXISTS {table} ({key_col} TEXT PRIMARY KEY{extra}, "
+            f"properties TEXT NOT NULL, content_hash TEXT NOT NULL)"
+        )
+    for table, _, start_col, _, end_col, cols in REL_TABLES.values():
+        extra = "".join(f", {c} {t}" for c, _, t in cols)
+        stmts.append(
+            f"CREATE TABLE IF NOT EXISTS {table} ({start_col} TEXT NOT NULL, {end_col} TEXT NOT NULL{extra}, "
+            f"properties TEXT NOT NULL, content_hash TEXT NOT NULL, PRIMARY KEY ({start_col}, {end_col}))"
+        )
+        stmts.append(f"CREATE INDEX IF NOT EXISTS idx_g_{table}_{end_col} ON {table}({end_col})")
+    return ";\n".join(stmts + INDEXES) + ";\n"
+
+
+def _sql_value(val):
+    """Neo4j property -> SQLite value: lists as JSON, temporals as ISO text, bools as 0/1."""
+    if val is None or isinstance(val, (int, float, str)):
+        return int(val) if isinstance(val, bool) else val
+    if isinstance(val, (list, tuple)):
+        return json.dumps(list(val), default=str, ensure_ascii=False)
+    return str(val)
+
+
+def _row(keys: list, props: dict, cols: list) -> tuple:
+    properties = json.dumps(props, default=str, sort_keys=True, ensure_ascii=False)
+    values = [_sql_value(props.get(prop)) for _, prop, _ in cols]
+    digest = hashlib.sha1(json.dumps([keys, properties]).encode("utf-8")).hexdigest()
+    return (*keys, *values, properties, digest)
+
+
+async def _stream(driver, cypher: str):
+    """Yield lists of up to EXPORT_BATCH records as the server streams them."""
+    async with driver.session(fetch_size=EXPORT_BATCH) as session:
+        result = await session.run(cypher)
+        batch = []
+        async for record in result:
+            batch.append(record)
+            if len(batch) >= EXPORT_BATCH:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+
+async def _sync_table(conn, driver, table: str, key_cols: list, cols: list, cypher: str) -> dict:
+    """Upsert changed rows of one table and delete rows no longer in the graph."""
+    width = len(key_cols)
+    stored = {tuple(r[:width]): r[width] for r in conn.execute(
+        f"SELECT {', '.join(key_cols)}, content_hash FROM {table}"  # noqa: S608
+    )}
+    columns = key_cols + [c for c, _, _ in cols] + ["properties", "content_hash"]
+    upsert = (
+        f"INSERT OR REPLACE INTO {table} ({', '.join(columns)}) "  # noqa: S608
+        f"VALUES ({', '.join('?' * len(columns))})"
+    )
+    seen, counts = set(), {"inserted": 0, "updated": 0, "deleted": 0}
+    async for batch in _stream(driver, cypher):
+        rows = []
+        for record in batch:
+            keys = [record[k] for k in ("start", "end")] if width == 2 else [record["key"]]
+            if any(k is None for k in keys):
+                continue
+            keys = [str(k) for k in keys]
+            row = _row(keys, dict(record["props"] or {}), cols)
+            key = tuple(keys)
+            if key in seen:
+                continue
+            seen.add(key)
+            previous = stored.get(key)
+            if previous == row[-1]:
+                continue
+            counts["inserted" if previous is None else "updated"] += 1
+            rows.append(row)
+        conn.executemany(upsert, rows)
+    gone = [k for k in stored if k not in seen]
+    where = " AND ".join(f"{c} = ?" for c in key_cols)
+    conn.executemany(f"DELETE FROM {table} WHERE {where}", gone)  # noqa: S608
+    counts["deleted"] = len(gone)
+    conn.commit()
+    return counts
+
+
+async def export_graph(driver, db_path: str = DEFAULT_GRAPH_DB, full: bool = False) -> dict:
+    """
+    Bring db_path up to date with the graph. Returns {"graphVersion", "skipped",
+    "tables": {table: {inserted, updated, deleted}}}.
+    """
+    # Read the version first: writes racing the export bump it again, so the next run catches them
+    version = await get_graph_version(driver)
+    os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+    conn = sqlite3.connect(db_path)
+    try:
+        conn.execute("PRAGMA journal_mode=WAL")
+        migrated = add_missing_columns(conn)
+        conn.executescript(schema_sql())
+        meta = dict(conn.execute("SELECT key, value FROM export_meta"))
+        if not (full or migrated) and version > 0 and meta.get("graph_version") == str(version):
+            print(f"Graph version {version} already exported; nothing to do.")
+            return {"graphVersion": version, "skipped": True, "tables": {}}
+        if full:
+            for table, *_ in list(NODE_TABLES.values()) + list(REL_TABLES.values()):
+                conn.execute(f"DELETE FROM {table}")  # noqa: S608
+            conn.commit()
+
+        stats = {}
+        for label, (table, key_prop, key_col, cols) in NODE_TABLES.items():
+            stats[table] = await _sync_table(
+                conn, driver, table, [key_col], cols,
+                f"MATCH (n:{label}) RETURN n.{key_prop} AS key, properties(n) AS props",
+            )
+        for rel_type, (table, start, start_col, end, end_col, cols) in REL_TABLES.items():
+            start_key = NODE_TABLES[start][1]
+            end_key = NODE_TABLES[end][1]
+            stats[table] = await _sync_table(
+                conn, driver, table, [start_col, end_col], cols,
+                f"MATCH (a:{start})-[r:{rel_type}]->(b:{end}) "
+                f"RETURN a.{start_key} AS start, b.{end_key} AS end, properties(r) AS props",
+            )
+        conn.executemany(
+            "INSERT OR REPLACE INTO export_meta (key, value) VALUES (?, ?)",
+            [("graph_version", str(version)), ("exported_at", datetime.now(UTC).isoformat())],
+        )
+        conn.commit()
+        return {"graphVersion": version, "skipped": False, "tables": stats}
+    finally:
+        conn.close()
+
+
+async def main(full: bool = False, db_path: Optional[str] = None):
+    db_path = db_path or os.getenv("GRAPH_SQLITE_PATH") or DEFAULT_GRAPH_DB
+    uri = os.getenv("NEO4J_URI", "bolt://localhost:7687")
+    user = os.getenv("NEO4J_USER", "neo4j")
+    password = os.getenv("NEO4J_PASSWORD", "dail_password")
+    driver = await get_driver(uri, user, password)
+    start = time.perf_counter()
+    try:
+        result = await export_graph(driver, db_path, full)
+    finally:
+        await driver.close()
+    if result["skipped"]:
+        return
+    print(f"Graph version {result['graphVersion']} exported to {db_path}:")
+    for table, c in result["tables"].items():
+        print(f"  {table:<22} +{c['inserted']:<6} ~{c['updated']:<6} -{c['deleted']}")
+    print(f"Done in {time.perf_counter() - start:.1f}s.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export the Neo4j graph to SQLite for offline analytics.")
+    parser.add_argument("--full", action="store_true", help="rewrite every row, ignoring the graph version")
+    parser.add_argument("--db", default=None, help="SQLite output path (default data/dail_graph.db)")
+    args = parser.parse_args()
+    asyncio.run(main(args.full, args.db))
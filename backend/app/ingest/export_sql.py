@@ -6,21 +6,25 @@ Run after convert_xlsx.py has produced the clean CSVs:
     python -m app.ingest.export_sql   (from backend/ directory)
 
 Outputs (written to data/):
-    dail.db       — self-contained SQLite database (portable, no server needed)
+    dail.db       — self-contained SQLite database (portable, no server needed),
+                    with FTS5 full-text indexes over case text and source titles
     schema.sql    — CREATE TABLE statements for any SQL engine (Postgres, MySQL, SQLite)
-    data.sql      — INSERT statements for the four core tables
+    data.sql      — multi-row INSERT statements for the four core tables
+                    (or data.copy.sql with --format copy; add --gzip for .gz)
 
 This makes the pipeline SQL-ready: any SQL database can ingest schema.sql + data.sql
 directly, independent of Neo4j.
 """
 
+import argparse
+import gzip
 import os
+import shutil
 import sqlite3
-import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
 
-DATA_DIR = os.path.normpath(
-    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "data")
-)
+from app.ingest.dail_tables import DATA_DIR, DailTables, pipe_col, rows
+from app.ingest.sql_search import build_fts
 
 # ── SQL Schema ─────────────────────────────────────────────────────────────
 
@@ -88,61 +92,28 @@ CREATE INDEX IF NOT EXISTS idx_secondary_case_id     ON secondary_sources(case_i
 
 # ── Helpers ────────────────────────────────────────────────────────────────
 
-def _pipe(val) -> str:
-    """Convert a CSV list string or NaN into a pipe-separated string."""
-    try:
-        if pd.isna(val):
-            return ""
-    except Exception:
-        pass
-    s = str(val).strip()
-    # Already comma-separated in source — normalise to pipe for SQL storage
-    parts = [p.strip() for p in s.split(",") if p.strip() and p.strip().lower() not in ("nan", "none")]
-    return "|".join(parts)
-
-
-def _str(val) -> str:
-    try:
-        if pd.isna(val):
-            return ""
-    except Exception:
-        pass
-    return str(val).strip()
-
-
 def _escape(val: str) -> str:
     """Escape single quotes for SQL INSERT statements."""
     return val.replace("'", "''")
 
 # ── Loaders ────────────────────────────────────────────────────────────────
 
-def load_cases(conn: sqlite3.Connection) -> pd.DataFrame:
-    path = os.path.join(DATA_DIR, "dail_cases.csv")
-    df = pd.read_csv(path)
-    rows = []
-    for _, row in df.iterrows():
-        rows.append((
-            _str(row.get("Case_snug")),
-            _str(row.get("Record_Number")),
-            _str(row.get("Caption")),
-            _str(row.get("Brief_Description")),
-            _pipe(row.get("Area_of_Application_Text")),
-            _pipe(row.get("Cause_of_Action_Text")),
-            _pipe(row.get("Issue_Text")),
-            _pipe(row.get("Name_of_Algorithm_Text")),
-            _str(row.get("Organizations_involved")),
-            _str(row.get("Jurisdiction_Filed")),
-            _str(row.get("Date_Action_Filed")),
-            _str(row.get("Current_Jurisdiction")),
-            _str(row.get("Jurisdiction_Type_Text")),
-            _str(row.get("Status_Disposition")),
-            _str(row.get("Summary_of_Significance")),
-            _str(row.get("Summary_Facts_Activity_to_Date")),
-            _str(row.get("Most_Recent_Activity")),
-            _str(row.get("Class_Action")),
-            _str(row.get("Date_Added")),
-            "dail",
-        ))
+# Frame columns in SQL column order; list columns are stored pipe-separated
+LIST_COLUMNS = ["areaOfApplication", "causeOfAction", "issues", "algorithmNames"]
+CASE_COLUMNS = [
+    "id", "recordNumber", "caption", "briefDescription",
+    "areaOfApplication", "causeOfAction", "issues", "algorithmNames",
+    "organizations", "jurisdictionFiled", "dateFiled",
+    "currentJurisdiction", "jurisdictionType", "status",
+    "summarySignificance", "summaryFacts", "mostRecentActivity",
+    "isClassAction", "dateAdded", "source",
+]
+
+
+def load_cases(conn: sqlite3.Connection, tables: DailTables):
+    frame = tables.cases[CASE_COLUMNS].copy()
+    for col in LIST_COLUMNS:
+        frame[col] = pipe_col(frame[col])
     conn.executemany("""
         INSERT OR IGNORE INTO cases (
             id, record_number, caption, brief_description,
@@ -152,130 +123,166 @@ def load_cases(conn: sqlite3.Connection) -> pd.DataFrame:
             summary_significance, summary_facts, most_recent_activity,
             is_class_action, date_added, source
         ) VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)
-    """, rows)
-    print(f"  Cases loaded: {len(rows)}")
-    return df
+    """, rows(frame))
+    print(f"  Cases loaded: {len(frame)}")
 
 
-def load_dockets(conn: sqlite3.Connection, cases_df: pd.DataFrame):
-    path = os.path.join(DATA_DIR, "dail_dockets.csv")
-    if not os.path.exists(path):
+def load_dockets(conn: sqlite3.Connection, tables: DailTables):
+    if tables.dockets is None:
         print("  dail_dockets.csv not found, skipping.")
         return
-    df = pd.read_csv(path)
-    id_to_slug = dict(zip(cases_df["id"].astype(int), cases_df["Case_snug"]))
-    rows = []
-    for _, row in df.iterrows():
-        try:
-            case_num = int(float(_str(row.get("Case_Number"))))
-        except (ValueError, TypeError):
-            continue
-        slug = id_to_slug.get(case_num)
-        if not slug:
-            continue
-        rows.append((
-            _str(row.get("id")),
-            slug,
-            _str(row.get("court")),
-            _str(row.get("number")),
-            _str(row.get("link")),
-        ))
+    frame = tables.dockets[["id", "caseId", "court", "number", "link"]]
     conn.executemany(
         "INSERT OR IGNORE INTO dockets (id, case_id, court, number, link) VALUES (?,?,?,?,?)",
-        rows,
+        rows(frame),
     )
-    print(f"  Dockets loaded: {len(rows)}")
+    print(f"  Dockets loaded: {len(frame)}")
 
 
-def load_documents(conn: sqlite3.Connection, cases_df: pd.DataFrame):
-    path = os.path.join(DATA_DIR, "dail_documents.csv")
-    if not os.path.exists(path):
+def load_documents(conn: sqlite3.Connection, tables: DailTables):
+    if tables.documents is None:
         print("  dail_documents.csv not found, skipping.")
         return
-    df = pd.read_csv(path)
-    id_to_slug = dict(zip(cases_df["id"].astype(int), cases_df["Case_snug"]))
-    rows = []
-    for _, row in df.iterrows():
-        try:
-            case_num = int(float(_str(row.get("Case_Number"))))
-        except (ValueError, TypeError):
-            continue
-        slug = id_to_slug.get(case_num)
-        if not slug:
-            continue
-        rows.append((
-            _str(row.get("id")),
-            slug,
-            _str(row.get("court")),
-            _str(row.get("date")),
-            _str(row.get("link")),
-            _str(row.get("document")),
-            _str(row.get("cite_or_reference")),
-        ))
+    frame = tables.documents[["id", "caseId", "court", "date", "link", "docType", "cite"]]
     conn.executemany(
         "INSERT OR IGNORE INTO documents (id, case_id, court, date, link, document_type, cite_or_reference) VALUES (?,?,?,?,?,?,?)",
-        rows,
+        rows(frame),
     )
-    print(f"  Documents loaded: {len(rows)}")
+    print(f"  Documents loaded: {len(frame)}")
 
 
-def load_secondary_sources(conn: sqlite3.Connection, cases_df: pd.DataFrame):
-    path = os.path.join(DATA_DIR, "dail_secondary_sources.csv")
-    if not os.path.exists(path):
+def load_secondary_sources(conn: sqlite3.Connection, tables: DailTables):
+    if tables.secondary_sources is None:
         print("  dail_secondary_sources.csv not found, skipping.")
         return
-    df = pd.read_csv(path)
-    id_to_slug = dict(zip(cases_df["id"].astype(int), cases_df["Case_snug"]))
-    rows = []
-    for _, row in df.iterrows():
-        try:
-            case_num = int(float(_str(row.get("Case_Number"))))
-        except (ValueError, TypeError):
-            continue
-        slug = id_to_slug.get(case_num)
-        if not slug:
-            continue
-        link = _str(row.get("Secondary_Source_Link"))
-        if not link or link in ("nan", ""):
-            continue
-        rows.append((
-            int(row.get("id", 0)),
-            slug,
-            _str(row.get("Secondary_Source_Title")),
-            link,
-        ))
+    frame = tables.secondary_sources[["id", "caseId", "title", "link"]]
     conn.executemany(
         "INSERT OR IGNORE INTO secondary_sources (id, case_id, title, link) VALUES (?,?,?,?)",
-        rows,
+        rows(frame),
+    )
+    print(f"  Secondary sources loaded: {len(frame)}")
+
+
+EXPORT_TABLES = ["cases", "dockets", "documents", "secondary_sources"]
+DEFAULT_BATCH_ROWS = 500
+
+
+def _sql_literal(val) -> str:
+    if val is None:
+        return "NULL"
+    if isinstance(val, (int, float)):
+        return repr(val)
+    return f"'{_escape(str(val))}'"
+
+
+def _copy_field(val) -> str:
+    """Postgres COPY text format: backslash escapes, \\N for NULL."""
+    if val is None:
+        return "\\N"
+    return (
+        str(val).replace("\\", "\\\\").replace("\t", "\\t")
+        .replace("\n", "\\n").replace("\r", "\\r")
     )
-    print(f"  Secondary sources loaded: {len(rows)}")
-
-
-def export_data_sql(conn: sqlite3.Connection):
-    """Write a data.sql file with INSERT statements for all four tables."""
-    out_path = os.path.join(DATA_DIR, "data.sql")
-    tables = ["cases", "dockets", "documents", "secondary_sources"]
-    with open(out_path, "w", encoding="utf-8") as f:
-        f.write("-- DAIL Living Case Graph — Data Export\n")
-        f.write("-- Generated by export_sql.py\n\n")
-        for table in tables:
-            cursor = conn.execute(f"SELECT * FROM {table}")  # noqa: S608
-            cols = [d[0] for d in cursor.description]
-            rows = cursor.fetchall()
-            f.write(f"-- {table}: {len(rows)} rows\n")
-            for row in rows:
-                vals = ", ".join(
-                    f"'{_escape(str(v))}'" if v is not None else "NULL"
-                    for v in row
-                )
-                f.write(f"INSERT OR IGNORE INTO {table} ({', '.join(cols)}) VALUES ({vals});\n")
-            f.write("\n")
-    print(f"  data.sql written ({os.path.getsize(out_path) // 1024} KB)")
+
+
+def _open_out(path: str, compress: bool):
+    if compress:
+        return gzip.open(path, "wt", encoding="utf-8", compresslevel=6)
+    return open(path, "w", encoding="utf-8")
+
+
+def write_table_sql(conn: sqlite3.Connection, table: str, f, fmt: str = "insert",
+                    batch_rows: int = DEFAULT_BATCH_ROWS) -> int:
+    """
+    Stream one table to `f` with a cursor, batch_rows at a time: multi-row
+    INSERTs, or a COPY ... FROM STDIN block when fmt == "copy". Returns rows written.
+    """
+    count = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]  # noqa: S608
+    cursor = conn.execute(f"SELECT * FROM {table}")  # noqa: S608
+    cols = ", ".join(d[0] for d in cursor.description)
+    f.write(f"-- {table}: {count} rows\n")
+    if fmt == "copy":
+        f.write(f"COPY {table} ({cols}) FROM STDIN;\n")
+    while True:
+        rows = cursor.fetchmany(batch_rows)
+        if not rows:
+            break
+        if fmt == "copy":
+            f.write("".join("\t".join(map(_copy_field, row)) + "\n" for row in rows))
+        else:
+            values = ",\n".join(f"({', '.join(map(_sql_literal, row))})" for row in rows)
+            f.write(f"INSERT OR IGNORE INTO {table} ({cols}) VALUES\n{values};\n")
+    if fmt == "copy":
+        f.write("\\.\n")
+    f.write("\n")
+    return count
+
+
+def _write_part(db_path: str, table: str, part_path: str, fmt: str, compress: bool, batch_rows: int) -> int:
+    """Worker: export one table to its own file over a read-only connection."""
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    try:
+        with _open_out(part_path, compress) as f:
+            return write_table_sql(conn, table, f, fmt, batch_rows)
+    finally:
+        conn.close()
+
+
+def export_data_sql(
+    db_path: str,
+    fmt: str = "insert",
+    compress: bool = False,
+    batch_rows: int = DEFAULT_BATCH_ROWS,
+    jobs: int = 1,
+    out_dir: str = DATA_DIR,
+) -> str:
+    """
+    Write data.sql (multi-row INSERTs) or data.copy.sql (Postgres COPY) for
+    all four tables, gzipped on the fly when compress is set. With jobs > 1
+    each table is written by its own process and the parts are concatenated
+    in table order (gzip members concatenate into one valid stream).
+    Returns the output path.
+    """
+    name = "data.sql" if fmt == "insert" else "data.copy.sql"
+    out_path = os.path.join(out_dir, name + (".gz" if compress else ""))
+    header = "-- DAIL Living Case Graph — Data Export\n-- Generated by export_sql.py\n\n"
+
+    if jobs <= 1:
+        conn = sqlite3.connect(db_path)
+        try:
+            with _open_out(out_path, compress) as f:
+                f.write(header)
+                for table in EXPORT_TABLES:
+                    write_table_sql(conn, table, f, fmt, batch_rows)
+        finally:
+            conn.close()
+    else:
+        parts = [f"{out_path}.part{i}" for i in range(len(EXPORT_TABLES) + 1)]
+        try:
+            with _open_out(parts[0], compress) as f:
+                f.write(header)
+            with ProcessPoolExecutor(max_workers=jobs) as pool:
+                futures = [
+                    pool.submit(_write_part, db_path, table, part, fmt, compress, batch_rows)
+                    for table, part in zip(EXPORT_TABLES, parts[1:])
+                ]
+                for future in futures:
+                    future.result()
+            with open(out_path, "wb") as out:
+                for part in parts:
+                    with open(part, "rb") as f:
+                        shutil.copyfileobj(f, out)
+        finally:
+            for part in parts:
+                if os.path.exists(part):
+                    os.remove(part)
+    print(f"  {os.path.basename(out_path)} written ({os.path.getsize(out_path) // 1024} KB)")
+    return out_path
 
 
 # ── Main ───────────────────────────────────────────────────────────────────
 
-def main():
+def main(fmt: str = "insert", compress: bool = False, batch_rows: int = DEFAULT_BATCH_ROWS, jobs: int = 1):
     # Verify clean CSVs exist
     required = ["dail_cases.csv"]
     missing = [f for f in required if not os.path.exists(os.path.join(DATA_DIR, f))]
@@ -298,31 +305,54 @@ def main():
     conn.executescript(SCHEMA_SQL)
 
     print("\nLoading tables into dail.db ...")
-    cases_df = load_cases(conn)
-    load_dockets(conn, cases_df)
-    load_documents(conn, cases_df)
-    load_secondary_sources(conn, cases_df)
+    tables = DailTables()
+    load_cases(conn, tables)
+    load_dockets(conn, tables)
+    load_documents(conn, tables)
+    load_secondary_sources(conn, tables)
     conn.commit()
 
+    # SQLite-only: FTS5 indexes for ranked text search (see sql_search.py)
+    print("\nBuilding full-text indexes ...")
+    build_fts(conn)
+
     # Summary
     print("\nDatabase summary:")
     for table in ["cases", "dockets", "documents", "secondary_sources"]:
         count = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]  # noqa: S608
         print(f"  {table:<25} {count:>5} rows")
 
-    # Export data.sql
-    print("\nExporting data.sql ...")
-    export_data_sql(conn)
     conn.close()
 
+    # Export data.sql
+    print("\nExporting table data ...")
+    out_path = export_data_sql(db_path, fmt, compress, batch_rows, jobs)
+    data_name = os.path.basename(out_path)
+
     print(f"\nSQL pipeline complete. Outputs written to data/:")
     print(f"  dail.db        — SQLite database (open with DB Browser for SQLite or any SQL tool)")
+    print(f"                   full-text search: app.ingest.sql_search.search_cases")
     print(f"  schema.sql     — CREATE TABLE statements (compatible with PostgreSQL / MySQL / SQLite)")
-    print(f"  data.sql       — INSERT statements for all four tables")
+    if fmt == "copy":
+        print(f"  {data_name:<14} — COPY ... FROM STDIN blocks for all four tables (PostgreSQL)")
+    else:
+        print(f"  {data_name:<14} — multi-row INSERT statements for all four tables")
     print(f"\nTo load into PostgreSQL:")
     print(f"  psql -d your_db -f data/schema.sql")
-    print(f"  psql -d your_db -f data/data.sql")
+    if compress:
+        print(f"  gunzip -c data/{data_name} | psql -d your_db")
+    else:
+        print(f"  psql -d your_db -f data/{data_name}")
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Export the clean DAIL tables to SQLite and SQL scripts.")
+    parser.add_argument(
+        "--format", choices=["insert", "copy"], default="insert",
+        help="multi-row INSERTs (data.sql) or PostgreSQL COPY blocks (data.copy.sql)",
+    )
+    parser.add_argument("--gzip", action="store_true", help="compress the data file on the fly")
+    parser.add_argument("--batch-rows", type=int, default=DEFAULT_BATCH_ROWS, help="rows per INSERT / fetch")
+    parser.add_argument("--jobs", type=int, default=1, help="tables written in parallel")
+    args = parser.parse_args()
+    main(args.format, args.gzip, args.batch_rows, args.jobs)
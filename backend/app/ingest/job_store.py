@@ -0,0 +1,206 @@
+"""
+Local SQLite checkpoint store for CourtListener ingest runs.
+
+Each run is a job; each docket it touches moves through
+fetched -> deduped -> classified -> written (or skipped), and every
+transition is committed immediately. A job whose owning process has died
+is picked up again by the next ingest, which continues from the last
+checkpoint instead of re-running classification.
+"""
+import json
+import os
+import socket
+import sqlite3
+import uuid
+from datetime import datetime, UTC
+from typing import Optional
+
+# Resolve data/ relative to project root: backend/app/ingest/ -> up 3 -> dail-knowledge-graph/data/
+DATA_DIR = os.path.normpath(
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "data")
+)
+DEFAULT_JOB_DB = os.path.join(DATA_DIR, "ingest_jobs.db")
+
+FETCHED = "fetched"
+DEDUPED = "deduped"
+SKIPPED = "skipped"
+CLASSIFIED = "classified"
+WRITTEN = "written"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS ingest_jobs (
+    id            TEXT PRIMARY KEY,
+    filed_after   TEXT NOT NULL,
+    status        TEXT NOT NULL,          -- running | complete
+    search_done   INTEGER NOT NULL DEFAULT 0,
+    cases_found   INTEGER NOT NULL DEFAULT 0,
+    requests_made INTEGER NOT NULL DEFAULT 0,
+    owner         TEXT,                   -- host:pid of the process working the job
+    created_at    TEXT NOT NULL,
+    updated_at    TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS ingest_job_dockets (
+    job_id         TEXT NOT NULL REFERENCES ingest_jobs(id),
+    cl_id          TEXT NOT NULL,          -- CourtListener docket id
+    docket_number  TEXT,
+    state          TEXT NOT NULL,
+    staging        TEXT NOT NULL,          -- StagingCase JSON
+    classification TEXT,                   -- classifier output JSON
+    outcome        TEXT,                   -- added | queued | rejected
+    updated_at     TEXT NOT NULL,
+    PRIMARY KEY (job_id, cl_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_job_dockets_state ON ingest_job_dockets(job_id, state);
+"""
+
+
+def _now() -> str:
+    return datetime.now(UTC).isoformat()
+
+
+def _owner() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def _owner_alive(owner: Optional[str]) -> bool:
+    """True if owner names a live process on this host."""
+    if not owner:
+        return False
+    host, _, pid = owner.rpartition(":")
+    if host != socket.gethostname():
+        return False
+    try:
+        os.kill(int(pid), 0)
+    except (ValueError, ProcessLookupError):
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class JobStore:
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.getenv("INGEST_JOB_DB", DEFAULT_JOB_DB)
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self.conn = sqlite3.connect(self.path, isolation_level=None)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    # ── Jobs ───────────────────────────────────────────────────────────────
+
+    def find_resumable(self) -> Optional[dict]:
+        """Return the oldest unfinished job whose owner is no longer running."""
+        rows = self.conn.execute(
+            "SELECT * FROM ingest_jobs WHERE status = 'running' ORDER BY created_at"
+        ).fetchall()
+        for row in rows:
+            if row["owner"] == _owner() or not _owner_alive(row["owner"]):
+                return dict(row)
+        return None
+
+    def start_or_resume(self, filed_after: str) -> dict:
+        """Claim a resumable job, or create a new one."""
+        job = self.find_resumable()
+        if job is None:
+            job = {"id": str(uuid.uuid4()), "filed_after": filed_after}
+            self.conn.execute(
+                "INSERT INTO ingest_jobs (id, filed_after, status, owner, created_at, updated_at) "
+                "VALUES (?, ?, 'running', ?, ?, ?)",
+                (job["id"], filed_after, _owner(), _now(), _now()),
+            )
+        else:
+            self.conn.execute(
+                "UPDATE ingest_jobs SET owner = ?, updated_at = ? WHERE id = ?",
+                (_owner(), _now(), job["id"]),
+            )
+        return self.get_job(job["id"])
+
+    def get_job(self, job_id: str) -> dict:
+        return dict(self.conn.execute("SELECT * FROM ingest_jobs WHERE id = ?", (job_id,)).fetchone())
+
+    def finish_search(self, job_id: str, cases_found: int):
+        self.conn.execute(
+            "UPDATE ingest_jobs SET search_done = 1, cases_found = ?, updated_at = ? WHERE id = ?",
+            (cases_found, _now(), job_id),
+        )
+
+    def add_requests(self, job_id: str, count: int):
+        """Accumulate CourtListener requests across every process that worked the job."""
+        self.conn.execute(
+            "UPDATE ingest_jobs SET requests_made = requests_made + ?, updated_at = ? WHERE id = ?",
+            (count, _now(), job_id),
+        )
+
+    def complete(self, job_id: str):
+        self.conn.execute(
+            "UPDATE ingest_jobs SET status = 'complete', owner = NULL, updated_at = ? WHERE id = ?",
+            (_now(), job_id),
+        )
+
+    # ── Dockets ────────────────────────────────────────────────────────────
+
+    def record_fetched(self, job_id: str, staging: dict):
+        """Insert a fetched docket; a docket already checkpointed keeps its state."""
+        self.conn.execute(
+            "INSERT OR IGNORE INTO ingest_job_dockets "
+            "(job_id, cl_id, docket_number, state, staging, updated_at) VALUES (?, ?, ?, ?, ?, ?)",
+            (job_id, staging["clSourceId"], staging.get("docketNumber"), FETCHED,
+             json.dumps(staging), _now()),
+        )
+
+    def has_docket_number(self, job_id: str, docket_number: str) -> bool:
+        return self.conn.execute(
+            "SELECT 1 FROM ingest_job_dockets WHERE job_id = ? AND docket_number = ?",
+            (job_id, docket_number),
+        ).fetchone() is not None
+
+    def update_staging(self, job_id: str, staging: dict):
+        self.conn.execute(
+            "UPDATE ingest_job_dockets SET staging = ?, updated_at = ? WHERE job_id = ? AND cl_id = ?",
+            (json.dumps(staging), _now(), job_id, staging["clSourceId"]),
+        )
+
+    def set_state(
+        self,
+        job_id: str,
+        cl_id: str,
+        state: str,
+        classification: Optional[dict] = None,
+        outcome: Optional[str] = None,
+    ):
+        self.conn.execute(
+            "UPDATE ingest_job_dockets SET state = ?, "
+            "classification = COALESCE(?, classification), outcome = COALESCE(?, outcome), "
+            "updated_at = ? WHERE job_id = ? AND cl_id = ?",
+            (state, json.dumps(classification) if classification is not None else None,
+             outcome, _now(), job_id, cl_id),
+        )
+
+    def dockets(self, job_id: str, state: str) -> list:
+        """Dockets of a job in the given state, with staging/classification decoded."""
+        rows = self.conn.execute(
+            "SELECT * FROM ingest_job_dockets WHERE job_id = ? AND state = ? ORDER BY cl_id",
+            (job_id, state),
+        ).fetchall()
+        out = []
+        for row in rows:
+            item = dict(row)
+            item["staging"] = json.loads(item["staging"])
+            if item["classification"]:
+                item["classification"] = json.loads(item["classification"])
+            out.append(item)
+        return out
+
+    def outcome_counts(self, job_id: str) -> dict:
+        rows = self.conn.execute(
+            "SELECT outcome, COUNT(*) AS n FROM ingest_job_dockets "
+            "WHERE job_id = ? AND outcome IS NOT NULL GROUP BY outcome",
+            (job_id,),
+        ).fetchall()
+        return {row["outcome"]: row["n"] for row in rows}
@@ -0,0 +1,108 @@
+"""
+Leader election for the ingest scheduler.
+
+Every API worker runs APScheduler, but only the current leader carries the
+ingest jobs. Two backends:
+
+    file   — an exclusive lock on a local file; one leader per host (default)
+    neo4j  — a TTL lease on a (:SchedulerLease) node; one leader across hosts
+
+Both expose the same async acquire()/release(); acquire() also renews.
+"""
+import logging
+import os
+import socket
+import uuid
+from typing import Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+logger = logging.getLogger(__name__)
+
+# Resolve data/ relative to project root: backend/app/ingest/ -> up 3 -> dail-knowledge-graph/data/
+DATA_DIR = os.path.normpath(
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "data")
+)
+DEFAULT_LOCK_FILE = os.path.join(DATA_DIR, "scheduler.lock")
+DEFAULT_LEASE_TTL = 60
+
+
+def _holder_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+class FileLeaderLock:
+    """Non-blocking exclusive lock held for the life of the process."""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or DEFAULT_LOCK_FILE
+        self._fd: Optional[int] = None
+
+    async def acquire(self) -> bool:
+        if self._fd is not None:
+            return True
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:
+                msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+        except OSError:
+            os.close(fd)
+            return False
+        os.ftruncate(fd, 0)
+        os.write(fd, f"{socket.gethostname()}:{os.getpid()}\n".encode())
+        self._fd = fd
+        return True
+
+    async def release(self):
+        if self._fd is None:
+            return
+        try:
+            if fcntl is not None:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+            else:
+                msvcrt.locking(self._fd, msvcrt.LK_UNLCK, 1)
+        finally:
+            os.close(self._fd)
+            self._fd = None
+
+
+class Neo4jLease:
+    """TTL lease on a (:SchedulerLease) node, using server time so host clocks don't matter."""
+
+    def __init__(self, driver, name: str = "ingest-scheduler", ttl_seconds: int = DEFAULT_LEASE_TTL):
+        self.driver = driver
+        self.name = name
+        self.ttl_ms = ttl_seconds * 1000
+        self.holder = _holder_id()
+
+    async def acquire(self) -> bool:
+        async with self.driver.session() as session:
+            # Touching _lock takes the node's write lock (held to commit), so
+            # concurrent acquirers read the holder only after each other's writes
+            result = await session.run("""
+                MERGE (l:SchedulerLease {name: $name})
+                SET l._lock = true
+                REMOVE l._lock
+                WITH l
+                WHERE l.holder IS NULL OR l.holder = $holder OR l.expiresAt < timestamp()
+                SET l.holder = $holder,
+                    l.expiresAt = timestamp() + $ttl,
+                    l.renewedAt = timestamp()
+                RETURN l.holder AS holder
+            """, name=self.name, holder=self.holder, ttl=self.ttl_ms)
+            record = await result.single()
+            return record is not None and record["holder"] == self.holder
+
+    async def release(self):
+        async with self.driver.session() as session:
+            await session.run("""
+                MATCH (l:SchedulerLease {name: $name, holder: $holder})
+                SET l.holder = null, l.expiresAt = 0
+            """, name=self.name, holder=self.holder)
@@ -0,0 +1,304 @@
+"""
+Incremental runner for the data pipeline:
+
+    convert ──┬── seed ── extract ──┬── analytics ───┬── snapshot
+              │                     └── communities ─┴── export_graph
+              └── export_sql
+
+Each stage declares the files it reads and writes. A stage's fingerprint is
+a hash of its input files' contents (plus the fingerprint of any upstream
+stage that leaves nothing on disk, e.g. seed -> extract). A stage is skipped
+when its fingerprint matches the last successful run and its outputs still
+exist; independent stages run in parallel worker processes. State and
+per-stage timings are kept in data/.pipeline_state.json.
+
+Run from backend/:
+    python -m app.ingest.pipeline               # run what changed
+    python -m app.ingest.pipeline --dry-run     # show what would run
+    python -m app.ingest.pipeline --force seed  # re-run seed (and what depends on it)
+"""
+import argparse
+import asyncio
+import hashlib
+import importlib
+import json
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import datetime, UTC
+from typing import Callable, Optional, Union
+
+from app.ingest import convert_xlsx
+from app.ingest.dail_tables import DATA_DIR
+
+TABLES = ["dail_cases", "dail_dockets", "dail_documents", "dail_secondary_sources"]
+SOURCE_FILES = [
+    convert_xlsx.CASES_XLSX,
+    convert_xlsx.DOCKETS_XLSX,
+    convert_xlsx.DOCUMENTS_XLSX,
+    convert_xlsx.SECONDARY_SOURCES_XLSX,
+]
+TABLE_CSVS = [f"{t}.csv" for t in TABLES]
+# Parquet copies are optional (pyarrow): fingerprinted as inputs, never required as outputs
+TABLE_FILES = TABLE_CSVS + [f"{t}.parquet" for t in TABLES]
+
+
+class Stage:
+    """
+    One pipeline step. `run` is a callable or a "module:function" path (the
+    latter is what worker processes receive); coroutine results are awaited.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        run: Union[str, Callable],
+        inputs: list = (),
+        outputs: list = (),
+        after: list = (),
+    ):
+        self.name = name
+        self.run = run
+        self.inputs = list(inputs)
+        self.outputs = list(outputs)
+        self.after = list(after)
+
+
+def default_stages() -> list:
+    return [
+        Stage("convert", "app.ingest.convert_xlsx:main", inputs=SOURCE_FILES, outputs=TABLE_CSVS),
+        Stage("seed", "app.ingest.seed_from_excel:main", inputs=TABLE_FILES, after=["convert"]),
+        Stage("extract", "app.ingest.entity_extractor:main", after=["seed"]),
+        Stage("analytics", "app.ingest.analytics:main", after=["extract"]),
+        Stage("communities", "app.ingest.communities:main", after=["extract"]),
+        Stage(
+            "snapshot", "app.ingest.snapshot:main",
+            outputs=["graph_snapshot/manifest.json"], after=["analytics", "communities"],
+        ),
+        # Syncs the API's SQLite read store
+        Stage(
+            "export_graph", "app.ingest.export_graph:main",
+            outputs=["dail_graph.db"], after=["analytics", "communities"],
+        ),
+        Stage(
+            "export_sql", "app.ingest.export_sql:main",
+            inputs=TABLE_FILES, outputs=["dail.db", "schema.sql", "data.sql"], after=["convert"],
+        ),
+    ]
+
+
+def _call(run: Union[str, Callable]):
+    if isinstance(run, str):
+        module, _, func = run.partition(":")
+        run = getattr(importlib.import_module(module), func)
+    result = run()
+    if asyncio.iscoroutine(result):
+        asyncio.run(result)
+
+
+def _timed_call(run: Union[str, Callable]) -> float:
+    start = time.perf_counter()
+    _call(run)
+    return time.perf_counter() - start
+
+
+class Pipeline:
+    def __init__(self, stages: list, data_dir: str = DATA_DIR, state_file: Optional[str] = None):
+        self.stages = {s.name: s for s in stages}
+        self.data_dir = data_dir
+        self.state_file = state_file or os.path.join(data_dir, ".pipeline_state.json")
+        self.state = self._load_state()
+        for stage in stages:
+            missing = [d for d in stage.after if d not in self.stages]
+            if missing:
+                raise ValueError(f"Stage {stage.name} depends on unknown stage(s): {missing}")
+
+    # ── State ──────────────────────────────────────────────────────────────
+
+    def _load_state(self) -> dict:
+        try:
+            with open(self.state_file, encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {"stages": {}, "files": {}}
+
+    def _save_state(self):
+        os.makedirs(os.path.dirname(os.path.abspath(self.state_file)), exist_ok=True)
+        tmp = f"{self.state_file}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.state, f, indent=2, sort_keys=True)
+        os.replace(tmp, self.state_file)
+
+    # ── Fingerprints ───────────────────────────────────────────────────────
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.data_dir, name)
+
+    def file_hash(self, name: str) -> Optional[str]:
+        """Content hash of a data file, reusing the cached hash while size and mtime are unchanged."""
+        path = self._path(name)
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return None
+        cached = self.state["files"].get(name)
+        if cached and cached["size"] == st.st_size and cached["mtime_ns"] == st.st_mtime_ns:
+            return cached["sha256"]
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        self.state["files"][name] = {
+            "size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha256": digest.hexdigest(),
+        }
+        return digest.hexdigest()
+
+    def fingerprint(self, stage: Stage) -> str:
+        parts = [f"{name}={self.file_hash(name)}" for name in sorted(stage.inputs)]
+        for dep in sorted(stage.after):
+            if not self.stages[dep].outputs:
+                recorded = self.state["stages"].get(dep, {})
+                parts.append(f"{dep}@{recorded.get('fingerprint')}")
+        return hashlib.sha256("\n".join(parts).encode()).hexdigest()
+
+    def is_current(self, stage: Stage) -> bool:
+        outputs_exist = all(os.path.exists(self._path(o)) for o in stage.outputs)
+        if stage.inputs and stage.outputs and outputs_exist and not any(
+            os.path.exists(self._path(i)) for i in stage.inputs
+        ):
+            # e.g. clean CSVs checked out without the source workbooks: nothing to rebuild from
+            return True
+        recorded = self.state["stages"].get(stage.name)
+        return (
+            recorded is not None
+            and recorded.get("fingerprint") == self.fingerprint(stage)
+            and outputs_exist
+        )
+
+    # ── Execution ──────────────────────────────────────────────────────────
+
+    def _order(self) -> list:
+        order, seen = [], set()
+
+        def visit(name, path=()):
+            if name in path:
+                raise ValueError(f"Pipeline cycle: {' -> '.join(path + (name,))}")
+            if name in seen:
+                return
+            for dep in self.stages[name].after:
+                visit(dep, path + (name,))
+            seen.add(name)
+            order.append(name)
+
+        for name in self.stages:
+            visit(name)
+        return order
+
+    def _downstream(self, names: set) -> set:
+        out = set(names)
+        changed = True
+        while changed:
+            changed = False
+            for stage in self.stages.values():
+                if stage.name not in out and out.intersection(stage.after):
+                    out.add(stage.name)
+                    changed = True
+        return out
+
+    def run(self, force: Optional[list] = None, dry_run: bool = False, executor=None, jobs: int = 2) -> dict:
+        """
+        Run stale stages in dependency order, independent ones concurrently.
+        `force` names stages to re-run regardless (an empty list forces all).
+        Returns {stage: {"status": ran|skipped|failed|blocked, "seconds": float}};
+        a dry run executes nothing and reports stale stages and everything
+        after them as "would run".
+        """
+        unknown = set(force or []) - set(self.stages)
+        if unknown:
+            raise ValueError(f"Unknown stage(s): {sorted(unknown)}")
+        forced = set(self.stages) if force == [] else self._downstream(set(force or []))
+        order = self._order()
+        results: dict = {}
+        pending = list(order)
+        running = {}
+        own_executor = executor is None and not dry_run
+        if own_executor:
+            executor = ProcessPoolExecutor(max_workers=jobs)
+        try:
+            while pending or running:
+                for name in list(pending):
+                    stage = self.stages[name]
+                    deps = [results.get(d, {}).get("status") for d in stage.after]
+                    if any(s in ("failed", "blocked") for s in deps):
+                        results[name] = {"status": "blocked", "seconds": 0.0}
+                        pending.remove(name)
+                        continue
+                    if any(s is None for s in deps):
+                        continue
+                    pending.remove(name)
+                    if name not in forced and self.is_current(stage):
+                        results[name] = {"status": "skipped", "seconds": 0.0}
+                        print(f"[pipeline] {name}: up to date, skipped")
+                        continue
+                    if dry_run:
+                        # Its outputs would change, so everything after it would run too
+                        forced |= self._downstream({name})
+                        results[name] = {"status": "would run", "seconds": 0.0}
+                        print(f"[pipeline] {name}: would run")
+                        continue
+                    print(f"[pipeline] {name}: running")
+                    running[name] = executor.submit(_timed_call, stage.run)
+                if not running:
+                    continue
+                done, _ = wait(list(running.values()), return_when=FIRST_COMPLETED)
+                for name, future in list(running.items()):
+                    if future not in done:
+                        continue
+                    del running[name]
+                    self._finish(name, future, results)
+        finally:
+            if own_executor:
+                executor.shutdown()
+        self._report(results)
+        return results
+
+    def _finish(self, name: str, future, results: dict):
+        stage = self.stages[name]
+        try:
+            seconds = future.result()
+        except BaseException as e:
+            results[name] = {"status": "failed", "seconds": 0.0}
+            print(f"[pipeline] {name}: FAILED — {e}")
+            return
+        results[name] = {"status": "ran", "seconds": seconds}
+        self.state["stages"][name] = {
+            "fingerprint": self.fingerprint(stage),
+            "finishedAt": datetime.now(UTC).isoformat(),
+            "seconds": round(seconds, 3),
+        }
+        self._save_state()
+        print(f"[pipeline] {name}: done in {seconds:.1f}s")
+
+    def _report(self, results: dict):
+        print("\nPipeline summary:")
+        for name in self._order():
+            r = results.get(name, {"status": "-", "seconds": 0.0})
+            print(f"  {name:<12} {r['status']:<10} {r['seconds']:>8.1f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the DAIL data pipeline incrementally.")
+    parser.add_argument(
+        "--force", nargs="*", metavar="STAGE",
+        help="re-run these stages and everything downstream (no names: all stages)",
+    )
+    parser.add_argument("--dry-run", action="store_true", help="report what would run")
+    parser.add_argument("--jobs", type=int, default=2, help="stages to run in parallel (default 2)")
+    args = parser.parse_args()
+    results = Pipeline(default_stages()).run(force=args.force, dry_run=args.dry_run, jobs=args.jobs)
+    if any(r["status"] in ("failed", "blocked") for r in results.values()):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
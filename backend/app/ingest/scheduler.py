@@ -1,19 +1,165 @@
 import asyncio
 import logging
 import os
-import uuid
 import json
 from datetime import datetime, timedelta, UTC
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from app.models.graph_models import StagingCase
 from app.services.courtlistener import CourtListenerClient, AI_LITIGATION_KEYWORDS
 from app.services.claude_service import classify_incoming_case
-from app.services.neo4j_service import get_driver
+from app.services.query_planner import QueryPlanner, build_query, attribute_keywords
+from app.services.neo4j_service import bump_graph_version, get_driver
+from app.services.graph_snapshot import DEFAULT_SNAPSHOT_DIR
+from app.services.sqlite_store import DEFAULT_GRAPH_DB
+from app.ingest.export_graph import export_graph
+from app.ingest.snapshot import write_snapshot
+from app.ingest.enrichment import enrich_candidates, DEFAULT_CONCURRENCY, DEFAULT_MAX_CHARS
+from app.ingest.job_store import JobStore, FETCHED, DEDUPED, SKIPPED, CLASSIFIED, WRITTEN
+from app.ingest.leader import FileLeaderLock, Neo4jLease, DEFAULT_LEASE_TTL
 
 logger = logging.getLogger(__name__)
 scheduler = AsyncIOScheduler()
 
+# One ingest job per process at a time; the job store handles restarts across processes.
+_ingest_lock = asyncio.Lock()
 
-async def ingest_new_cases() -> dict:
+
+async def _search_phase(cl: CourtListenerClient, store: JobStore, job: dict):
+    """Run the keyword plan and checkpoint every new docket as fetched."""
+    job_id = job["id"]
+    cases_found = 0
+    seen: dict = {}
+    # Keywords are packed into OR queries; the planner widens batches as rate-limit headroom shrinks
+    planner = QueryPlanner(AI_LITIGATION_KEYWORDS)
+    while planner.has_pending():
+        batch = planner.next_batch(cl.rate_limit_remaining)
+        results = await cl.search(
+            build_query(batch), job["filed_after"], limit=min(50, 10 * len(batch))
+        )
+        cases_found += len(results)
+        for docket in results:
+            staging = cl.parse_to_staging(docket)
+            if not staging.docketNumber:
+                continue
+            # Hits that match no keyword locally matched server-side text; credit the whole batch
+            matched = attribute_keywords(docket, batch) or batch
+            if staging.docketNumber in seen:
+                known = seen[staging.docketNumber]
+                known.matchedKeywords = list(dict.fromkeys(known.matchedKeywords + matched))
+                store.update_staging(job_id, known.model_dump())
+                continue
+            if store.has_docket_number(job_id, staging.docketNumber):
+                continue  # checkpointed before a restart
+            staging.matchedKeywords = matched
+            seen[staging.docketNumber] = staging
+            store.record_fetched(job_id, staging.model_dump())
+    store.finish_search(job_id, cases_found)
+
+
+async def _dedupe_phase(driver, store: JobStore, job_id: str):
+    """Drop fetched dockets that already exist in Neo4j."""
+    for item in store.dockets(job_id, FETCHED):
+        async with driver.session() as session:
+            r = await session.run(
+                "MATCH (c:Case) WHERE c.docketNumber = $dn RETURN c LIMIT 1",
+                dn=item["docket_number"],
+            )
+            exists = await r.single()
+        store.set_state(job_id, item["cl_id"], SKIPPED if exists else DEDUPED)
+
+
+async def _write_case(driver, store: JobStore, job_id: str, staging: StagingCase, classification: dict):
+    """Write one classified docket. Every statement is keyed by the CourtListener id, so replays are no-ops."""
+    if not classification.get("isAiLitigation", False):
+        store.set_state(job_id, staging.clSourceId, WRITTEN, outcome="rejected")
+        return
+
+    confidence = classification.get("confidence", 0.0)
+    case_id = f"cl-{staging.clSourceId}"
+
+    async with driver.session() as session:
+        if confidence >= 0.85:
+            # Auto-add to main graph
+            await session.run(
+                """
+                MERGE (c:Case {id: $id})
+                SET c.caption = $caption,
+                    c.courtName = $courtName,
+                    c.dateFiled = $dateFiled,
+                    c.docketNumber = $docketNumber,
+                    c.source = 'courtlistener',
+                    c.status = 'Active',
+                    c.areaOfApplication = $areas,
+                    c.causeOfAction = $causes,
+                    c.autoClassified = true,
+                    c.classificationConfidence = $conf,
+                    c.absoluteUrl = $url,
+                    c.opinionText = $opinionText,
+                    c.matchedKeywords = $keywords,
+                    c.ingestedAt = $ts
+            """,
+                id=case_id,
+                caption=staging.caption,
+                courtName=staging.courtName,
+                dateFiled=staging.dateFiled,
+                docketNumber=staging.docketNumber,
+                areas=classification.get("areaOfApplication", []),
+                causes=classification.get("causeOfAction", []),
+                conf=confidence,
+                url=staging.absoluteUrl,
+                opinionText=staging.opinionText,
+                keywords=staging.matchedKeywords,
+                ts=datetime.now(UTC).isoformat(),
+            )
+            outcome = "added"
+        else:
+            # Queue for human review
+            await session.run(
+                """
+                MERGE (c:Case {id: $id})
+                SET c.caption = $caption,
+                    c.courtName = $courtName,
+                    c.dateFiled = $dateFiled,
+                    c.docketNumber = $docketNumber,
+                    c.source = 'courtlistener',
+                    c.status = 'pending_review',
+                    c.autoClassified = true,
+                    c.classificationConfidence = $conf,
+                    c.absoluteUrl = $url,
+                    c.opinionText = $opinionText,
+                    c.matchedKeywords = $keywords,
+                    c.ingestedAt = $ts
+            """,
+                id=case_id,
+                caption=staging.caption,
+                courtName=staging.courtName,
+                dateFiled=staging.dateFiled,
+                docketNumber=staging.docketNumber,
+                conf=confidence,
+                url=staging.absoluteUrl,
+                opinionText=staging.opinionText,
+                keywords=staging.matchedKeywords,
+                ts=datetime.now(UTC).isoformat(),
+            )
+            # Create review item (deterministic id so a replayed write does not duplicate it)
+            await session.run(
+                """
+                MERGE (r:ReviewItem {id: $id})
+                ON CREATE SET r.caseId = $caseId, r.type = 'classification',
+                              r.payload = $payload, r.confidence = $conf,
+                              r.status = 'pending', r.createdAt = $ts
+            """,
+                id=f"{case_id}-classification",
+                caseId=case_id,
+                payload=json.dumps(classification),
+                conf=confidence,
+                ts=datetime.now(UTC).isoformat(),
+            )
+            outcome = "queued"
+    store.set_state(job_id, staging.clSourceId, WRITTEN, outcome=outcome)
+
+
+async def _run_ingest_job() -> dict:
     uri = os.getenv("NEO4J_URI", "bolt://localhost:7687")
     user = os.getenv("NEO4J_USER", "neo4j")
     password = os.getenv("NEO4J_PASSWORD", "dail_password")
@@ -22,152 +168,153 @@ async def ingest_new_cases() -> dict:
     cl = CourtListenerClient(
         os.getenv("COURTLISTENER_BASE_URL", "https://www.courtlistener.com")
     )
-    filed_after = (datetime.now() - timedelta(days=7)).strftime("%Y-%m-%d")
-    seen_dockets: set = set()
-    cases_found = 0
-    cases_added = 0
-    cases_queued = 0
+    store = JobStore()
+    job = store.start_or_resume((datetime.now() - timedelta(days=7)).strftime("%Y-%m-%d"))
+    job_id = job["id"]
+    logger.info(f"Ingest job {job_id} started (filed_after={job['filed_after']}, search_done={bool(job['search_done'])})")
 
     try:
-        # Limit to 5 keywords per run to respect rate limits
-        for keyword in AI_LITIGATION_KEYWORDS[:5]:
-            results = await cl.search(keyword, filed_after, limit=10)
-            cases_found += len(results)
-            for docket in results:
-                staging = cl.parse_to_staging(docket)
-                if not staging.docketNumber or staging.docketNumber in seen_dockets:
-                    continue
-                seen_dockets.add(staging.docketNumber)
-
-                # Deduplicate against existing Neo4j cases
-                async with driver.session() as session:
-                    r = await session.run(
-                        "MATCH (c:Case) WHERE c.docketNumber = $dn RETURN c LIMIT 1",
-                        dn=staging.docketNumber,
-                    )
-                    if await r.single():
-                        continue  # already in DB
-
-                # Classify with Claude
-                classification = await classify_incoming_case(
-                    api_key,
-                    staging.caption,
-                    staging.courtName or "",
-                    staging.dateFiled or "",
-                    "",
-                )
-
-                if not classification.get("isAiLitigation", False):
-                    continue
-
-                confidence = classification.get("confidence", 0.0)
-                case_id = f"cl-{staging.clSourceId}"
-
-                async with driver.session() as session:
-                    if confidence >= 0.85:
-                        # Auto-add to main graph
-                        await session.run(
-                            """
-                            MERGE (c:Case {id: $id})
-                            SET c.caption = $caption,
-                                c.courtName = $courtName,
-                                c.dateFiled = $dateFiled,
-                                c.docketNumber = $docketNumber,
-                                c.source = 'courtlistener',
-                                c.status = 'Active',
-                                c.areaOfApplication = $areas,
-                                c.causeOfAction = $causes,
-                                c.autoClassified = true,
-                                c.classificationConfidence = $conf,
-                                c.absoluteUrl = $url,
-                                c.ingestedAt = $ts
-                        """,
-                            id=case_id,
-                            caption=staging.caption,
-                            courtName=staging.courtName,
-                            dateFiled=staging.dateFiled,
-                            docketNumber=staging.docketNumber,
-                            areas=classification.get("areaOfApplication", []),
-                            causes=classification.get("causeOfAction", []),
-                            conf=confidence,
-                            url=staging.absoluteUrl,
-                            ts=datetime.now(UTC).isoformat(),
-                        )
-                        cases_added += 1
-                    else:
-                        # Queue for human review
-                        await session.run(
-                            """
-                            MERGE (c:Case {id: $id})
-                            SET c.caption = $caption,
-                                c.courtName = $courtName,
-                                c.dateFiled = $dateFiled,
-                                c.docketNumber = $docketNumber,
-                                c.source = 'courtlistener',
-                                c.status = 'pending_review',
-                                c.autoClassified = true,
-                                c.classificationConfidence = $conf,
-                                c.absoluteUrl = $url,
-                                c.ingestedAt = $ts
-                        """,
-                            id=case_id,
-                            caption=staging.caption,
-                            courtName=staging.courtName,
-                            dateFiled=staging.dateFiled,
-                            docketNumber=staging.docketNumber,
-                            conf=confidence,
-                            url=staging.absoluteUrl,
-                            ts=datetime.now(UTC).isoformat(),
-                        )
-                        # Create review item
-                        item_id = str(uuid.uuid4())
-                        await session.run(
-                            """
-                            CREATE (r:ReviewItem {
-                                id: $id, caseId: $caseId, type: 'classification',
-                                payload: $payload, confidence: $conf,
-                                status: 'pending', createdAt: $ts
-                            })
-                        """,
-                            id=item_id,
-                            caseId=case_id,
-                            payload=json.dumps(classification),
-                            conf=confidence,
-                            ts=datetime.now(UTC).isoformat(),
-                        )
-                        cases_queued += 1
-
-        # Log ingest run
+        if not job["search_done"]:
+            await _search_phase(cl, store, job)
+        await _dedupe_phase(driver, store, job_id)
+
+        # Dockets classified before a restart only need writing
+        for item in store.dockets(job_id, CLASSIFIED):
+            await _write_case(driver, store, job_id, StagingCase(**item["staging"]), item["classification"])
+
+        # Opinion text arrives in completion order; classify each as it lands
+        candidates = [StagingCase(**item["staging"]) for item in store.dockets(job_id, DEDUPED)]
+        async for staging in enrich_candidates(
+            cl,
+            candidates,
+            concurrency=int(os.getenv("ENRICH_CONCURRENCY", DEFAULT_CONCURRENCY)),
+            max_chars=int(os.getenv("OPINION_TEXT_CHARS", DEFAULT_MAX_CHARS)),
+        ):
+            store.update_staging(job_id, staging.model_dump())
+            # Classify with Claude
+            classification = await classify_incoming_case(
+                api_key,
+                staging.caption,
+                staging.courtName or "",
+                staging.dateFiled or "",
+                staging.opinionText or "",
+            )
+            store.set_state(job_id, staging.clSourceId, CLASSIFIED, classification=classification)
+            await _write_case(driver, store, job_id, staging, classification)
+
+        store.add_requests(job_id, cl.request_count)
+        job = store.get_job(job_id)
+        outcomes = store.outcome_counts(job_id)
+        cases_found = job["cases_found"]
+        cases_added = outcomes.get("added", 0)
+        cases_queued = outcomes.get("queued", 0)
+
+        # Log ingest run (one record per job, even if it was resumed)
         async with driver.session() as session:
             await session.run(
                 """
-                CREATE (ir:IngestRun {
-                    timestamp: $ts,
-                    casesFound: $found,
-                    casesAdded: $added,
-                    casesQueued: $queued
-                })
+                MERGE (ir:IngestRun {jobId: $jobId})
+                SET ir.timestamp = $ts,
+                    ir.casesFound = $found,
+                    ir.casesAdded = $added,
+                    ir.casesQueued = $queued,
+                    ir.requestsMade = $requests
             """,
+                jobId=job_id,
                 ts=datetime.now(UTC).isoformat(),
                 found=cases_found,
                 added=cases_added,
                 queued=cases_queued,
+                requests=job["requests_made"],
             )
+        await bump_graph_version(driver)
+        store.complete(job_id)
+        await _sync_read_store(driver)
+        await _write_graph_snapshot(driver)
 
         logger.info(
-            f"Ingest complete: found={cases_found}, added={cases_added}, queued={cases_queued}"
+            f"Ingest job {job_id} complete: found={cases_found}, added={cases_added}, "
+            f"queued={cases_queued}, requests={job['requests_made']}"
         )
         return {
+            "jobId": job_id,
             "casesFound": cases_found,
             "casesAdded": cases_added,
             "casesQueued": cases_queued,
         }
+    except BaseException:
+        store.add_requests(job_id, cl.request_count)
+        raise
     finally:
         await cl.aclose()
+        store.close()
 
 
-def start_scheduler():
-    """Start the APScheduler for weekly ingestion."""
+async def _sync_read_store(driver):
+    """Bring the SQLite read store up to date with what the job wrote; failures only log."""
+    db_path = os.getenv("GRAPH_SQLITE_PATH", DEFAULT_GRAPH_DB)
+    if not db_path:
+        return
+    try:
+        result = await export_graph(driver, db_path)
+        logger.info(f"SQLite read store synced to graph version {result['graphVersion']}")
+    except Exception as e:
+        logger.warning(f"SQLite read store sync failed ({db_path}): {e}")
+
+
+async def _write_graph_snapshot(driver):
+    """
+    Rewrite the replica's cold-start snapshot. Ingest jobs run only on the
+    elected leader, so this is the one API process that writes snapshots.
+    """
+    snapshot_dir = os.getenv("GRAPH_SNAPSHOT_DIR", DEFAULT_SNAPSHOT_DIR)
+    if os.getenv("GRAPH_READ_BACKEND", "neo4j") != "replica" or not snapshot_dir:
+        return
+    try:
+        manifest = await write_snapshot(driver, snapshot_dir)
+        if manifest:
+            logger.info(f"Graph snapshot written at version {manifest['graphVersion']}")
+    except Exception as e:
+        logger.warning(f"Graph snapshot write failed ({snapshot_dir}): {e}")
+
+
+async def ingest_new_cases() -> dict:
+    """Run (or resume) a CourtListener ingest job."""
+    if _ingest_lock.locked():
+        logger.info("Ingest already running in this process; skipping.")
+        return {"status": "already running"}
+    async with _ingest_lock:
+        return await _run_ingest_job()
+
+
+def has_resumable_ingest() -> bool:
+    store = JobStore()
+    try:
+        return store.find_resumable() is not None
+    finally:
+        store.close()
+
+
+# Only the elected leader carries the ingest jobs; every worker runs the election job.
+LEADER_CHECK_SECONDS = 20
+_elector = None
+
+
+async def _make_elector():
+    mode = os.getenv("SCHEDULER_LEADER_MODE", "file").lower()
+    if mode == "none":
+        return None
+    if mode == "neo4j":
+        driver = await get_driver(
+            os.getenv("NEO4J_URI", "bolt://localhost:7687"),
+            os.getenv("NEO4J_USER", "neo4j"),
+            os.getenv("NEO4J_PASSWORD", "dail_password"),
+        )
+        return Neo4jLease(driver, ttl_seconds=int(os.getenv("SCHEDULER_LEASE_TTL", DEFAULT_LEASE_TTL)))
+    return FileLeaderLock(os.getenv("SCHEDULER_LOCK_FILE") or None)
+
+
+def _add_ingest_jobs():
     scheduler.add_job(
         ingest_new_cases,
         "interval",
@@ -176,11 +323,66 @@ def start_scheduler():
         replace_existing=True,
         max_instances=1,
     )
+    if has_resumable_ingest():
+        # Pick up a job interrupted by a restart straight away
+        scheduler.add_job(ingest_new_cases, id="resume_ingest", replace_existing=True)
+        logger.info("Found an interrupted ingest job; resuming from checkpoint.")
+
+
+def _remove_ingest_jobs():
+    for job_id in ("weekly_ingest", "resume_ingest"):
+        if scheduler.get_job(job_id):
+            scheduler.remove_job(job_id)
+
+
+async def _elect_leader():
+    """Acquire or renew leadership and add/remove the ingest jobs to match."""
+    global _elector
+    if _elector is None:
+        _elector = await _make_elector()
+        if _elector is None:
+            _add_ingest_jobs()
+            scheduler.remove_job("leader_election")
+            logger.info("Leader election disabled; this worker owns the ingest jobs.")
+            return
+    try:
+        is_leader = await _elector.acquire()
+    except Exception as e:
+        logger.warning(f"Leader election failed, standing down: {e}")
+        is_leader = False
+    owns_jobs = scheduler.get_job("weekly_ingest") is not None
+    if is_leader and not owns_jobs:
+        _add_ingest_jobs()
+        logger.info(f"Worker {os.getpid()} elected scheduler leader; ingest jobs added.")
+    elif not is_leader and owns_jobs:
+        _remove_ingest_jobs()
+        logger.info(f"Worker {os.getpid()} lost scheduler leadership; ingest jobs removed.")
+
+
+def start_scheduler():
+    """Start APScheduler; the weekly ingest job is added once this worker wins leader election."""
+    scheduler.add_job(
+        _elect_leader,
+        "interval",
+        seconds=LEADER_CHECK_SECONDS,
+        id="leader_election",
+        next_run_time=datetime.now(),
+        replace_existing=True,
+        max_instances=1,
+    )
     scheduler.start()
-    logger.info("CourtListener ingest scheduler started (weekly interval).")
+    logger.info("CourtListener ingest scheduler started (weekly interval, leader-elected).")
 
 
-def stop_scheduler():
+async def stop_scheduler():
+    global _elector
     if scheduler.running:
         scheduler.shutdown(wait=False)
         logger.info("Scheduler stopped.")
+    # Hand leadership over promptly instead of waiting for a lease to expire
+    if _elector is not None:
+        try:
+            await _elector.release()
+        except Exception as e:
+            logger.warning(f"Could not release scheduler leadership: {e}")
+        _elector = None
@@ -0,0 +1,141 @@
+"""
+Differential reseeding: compare freshly cleaned DAIL rows against the
+content hashes stored by the previous seed, so a refresh only writes what
+changed.
+
+Cases, Dockets and Documents carry their hash on the node. SecondarySource
+nodes are shared by link across cases, so their hash (and the DAIL row id
+used as key) lives on the HAS_SECONDARY_SOURCE relationship instead. Only
+rows the seeder wrote are considered: CourtListener cases and nodes seeded
+before hashes existed are never deleted by a diff.
+"""
+import pandas as pd
+
+STORED_HASH_QUERIES = {
+    "cases": """
+        MATCH (n:Case {source: 'dail'}) WHERE n.contentHash IS NOT NULL
+        RETURN n.id AS key, n.contentHash AS hash
+    """,
+    "dockets": """
+        MATCH (n:Docket) WHERE n.contentHash IS NOT NULL
+        RETURN n.id AS key, n.contentHash AS hash
+    """,
+    "documents": """
+        MATCH (n:Document) WHERE n.contentHash IS NOT NULL
+        RETURN n.id AS key, n.contentHash AS hash
+    """,
+    "secondary_sources": """
+        MATCH (:Case)-[r:HAS_SECONDARY_SOURCE]->(:SecondarySource) WHERE r.contentHash IS NOT NULL
+        RETURN r.sourceId AS key, r.contentHash AS hash
+    """,
+}
+
+DELETE_QUERIES = {
+    "cases": """
+        UNWIND $keys AS key
+        MATCH (n:Case {id: key, source: 'dail'})
+        DETACH DELETE n
+    """,
+    "dockets": """
+        UNWIND $keys AS key
+        MATCH (n:Docket {id: key})
+        DETACH DELETE n
+    """,
+    "documents": """
+        UNWIND $keys AS key
+        MATCH (n:Document {id: key})
+        DETACH DELETE n
+    """,
+    "secondary_sources": """
+        UNWIND $keys AS key
+        MATCH (:Case)-[r:HAS_SECONDARY_SOURCE {sourceId: key}]->()
+        DELETE r
+    """,
+}
+
+# Shared nodes left without any case after deletes or re-links
+PRUNE_QUERY = """
+    MATCH (n) WHERE (n:LegalTheory OR n:Court OR n:SecondarySource) AND NOT EXISTS { (n)--() }
+    DELETE n
+"""
+
+# Deleted first children-to-parent, so a removed case never strands its own rows mid-run
+DELETE_ORDER = ["secondary_sources", "documents", "dockets", "cases"]
+
+
+class Delta:
+    """Rows to write (inserted + changed) and keys to delete for one table."""
+
+    def __init__(self, inserted: pd.DataFrame, changed: pd.DataFrame, deleted: list):
+        self.inserted = inserted
+        self.changed = changed
+        self.deleted = deleted
+
+    @property
+    def upserts(self) -> pd.DataFrame:
+        return pd.concat([self.inserted, self.changed])
+
+    def __bool__(self) -> bool:
+        return bool(len(self.inserted) or len(self.changed) or self.deleted)
+
+    def summary(self) -> str:
+        return f"+{len(self.inserted)} ~{len(self.changed)} -{len(self.deleted)}"
+
+
+def diff_rows(frame: pd.DataFrame, stored: dict, key: str = "id") -> Delta:
+    """
+    Split `frame` (which has a contentHash column) against stored {key: hash}.
+    Duplicate keys keep the last row, matching what repeated MERGEs leave behind.
+    """
+    frame = frame.drop_duplicates(subset=key, keep="last")
+    previous = frame[key].map(stored)
+    inserted = frame[previous.isna()]
+    changed = frame[previous.notna() & previous.ne(frame["contentHash"])]
+    deleted = sorted(set(stored) - set(frame[key]), key=str)
+    return Delta(inserted, changed, deleted)
+
+
+async def fetch_stored_hashes(driver, table: str) -> dict:
+    async with driver.session() as session:
+        result = await session.run(STORED_HASH_QUERIES[table])
+        return {record["key"]: record["hash"] async for record in result}
+
+
+async def compute_deltas(driver, tables) -> dict:
+    """Delta per DAIL table present in `tables` (a DailTables)."""
+    deltas = {}
+    for name in STORED_HASH_QUERIES:
+        frame = getattr(tables, name)
+        if frame is None:
+            continue
+        deltas[name] = diff_rows(frame, await fetch_stored_hashes(driver, name))
+    return deltas
+
+
+async def delete_rows(driver, table: str, keys: list):
+    if not keys:
+        return
+    async with driver.session() as session:
+        await session.execute_write(_run, DELETE_QUERIES[table], keys=keys)
+
+
+async def clear_case_links(driver, case_ids: list):
+    """Drop derived theory/court edges of changed cases before they are rebuilt."""
+    if not case_ids:
+        return
+    async with driver.session() as session:
+        await session.execute_write(_run, """
+            UNWIND $keys AS key
+            MATCH (:Case {id: key})-[r:ASSERTS_CLAIM|FILED_IN]->()
+            DELETE r
+        """, keys=case_ids)
+
+
+async def prune_orphans(driver):
+    async with driver.session() as session:
+        await session.execute_write(_run, PRUNE_QUERY)
+
+
+async def _run(tx, cypher: str, **params):
+    result = await tx.run(cypher, **params)
+    await result.consume()
@@ -1,292 +1,271 @@
+import argparse
 import asyncio
-import pandas as pd
 import os
+import time
+from typing import Optional
+
+import pandas as pd
 from dotenv import load_dotenv
-from app.services.neo4j_service import get_driver, init_schema
+from app.services.neo4j_service import bump_graph_version, get_driver, init_schema, refresh_co_defendants
+from app.ingest.batch_writer import DEFAULT_BATCH_SIZE, write_batches
+from app.ingest import bulk_import
+from app.ingest.dail_tables import DailTables, records
+from app.ingest.seed_diff import DELETE_ORDER, clear_case_links, compute_deltas, delete_rows, prune_orphans
+# Cell-level cleaning rules now live with the columnar loader; re-exported for existing callers
+from app.ingest.dail_tables import clean_date, clean_list, clean_val  # noqa: F401
 
 load_dotenv()
 
-# Resolve data/ relative to project root: backend/app/ingest/ -> up 3 -> dail-knowledge-graph/data/
-DATA_DIR = os.path.normpath(
-    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "data")
-)
-
-
-def clean_val(val) -> str:
-    try:
-        if pd.isna(val):
-            return ""
-    except Exception:
-        pass
-    return str(val).strip()
-
-
-def clean_list(val) -> list:
-    """Parse comma-separated values into a clean Python list."""
-    try:
-        if pd.isna(val):
-            return []
-    except Exception:
-        pass
-    s = str(val).strip()
-    if s.startswith("'") or s.startswith('"'):
-        parts = [p.strip().strip("'\"") for p in s.split(",")]
-    else:
-        parts = [p.strip() for p in s.split(",")]
-    return [p for p in parts if p and p.lower() not in ("nan", "none", "")]
-
-
-def clean_date(val) -> str | None:
-    try:
-        if pd.isna(val):
-            return None
-    except Exception:
-        pass
-    try:
-        return pd.to_datetime(val).strftime("%Y-%m-%d")
-    except Exception:
-        return None
-
 
-async def seed_cases(driver):
-    df = pd.read_csv(f"{DATA_DIR}/dail_cases.csv")
-    print(f"Seeding {len(df)} cases...")
-    batch_size = 50
-    for i in range(0, len(df), batch_size):
-        batch = df.iloc[i : i + batch_size]
-        records = []
-        for _, row in batch.iterrows():
-            records.append(
-                {
-                    "id": clean_val(row.get("Case_snug")),
-                    "recordNumber": clean_val(row.get("Record_Number")),
-                    "caption": clean_val(row.get("Caption")),
-                    "briefDescription": clean_val(row.get("Brief_Description")),
-                    "areaOfApplication": clean_list(row.get("Area_of_Application_Text")),
-                    "causeOfAction": clean_list(row.get("Cause_of_Action_Text")),
-                    "issues": clean_list(row.get("Issue_Text")),
-                    "algorithmNames": clean_list(row.get("Name_of_Algorithm_Text")),
-                    "organizations": clean_val(row.get("Organizations_involved")),
-                    "jurisdictionFiled": clean_val(row.get("Jurisdiction_Filed")),
-                    "dateFiled": clean_date(row.get("Date_Action_Filed")),
-                    "currentJurisdiction": clean_val(row.get("Current_Jurisdiction")),
-                    "jurisdictionType": clean_val(row.get("Jurisdiction_Type_Text")),
-                    "status": clean_val(row.get("Status_Disposition")),
-                    "summarySignificance": clean_val(row.get("Summary_of_Significance")),
-                    "summaryFacts": clean_val(row.get("Summary_Facts_Activity_to_Date")),
-                    "mostRecentActivity": clean_val(row.get("Most_Recent_Activity")),
-                    "isClassAction": clean_val(row.get("Class_Action")),
-                    "dateAdded": clean_date(row.get("Date_Added")),
-                    "source": "dail",
-                }
-            )
-        async with driver.session() as session:
-            await session.run(
-                """
-                UNWIND $records AS rec
-                MERGE (c:Case {id: rec.id})
-                SET c += {
-                    recordNumber: rec.recordNumber,
-                    caption: rec.caption,
-                    briefDescription: rec.briefDescription,
-                    areaOfApplication: rec.areaOfApplication,
-                    causeOfAction: rec.causeOfAction,
-                    issues: rec.issues,
-                    algorithmNames: rec.algorithmNames,
-                    organizations: rec.organizations,
-                    jurisdictionFiled: rec.jurisdictionFiled,
-                    dateFiled: rec.dateFiled,
-                    currentJurisdiction: rec.currentJurisdiction,
-                    jurisdictionType: rec.jurisdictionType,
-                    status: rec.status,
-                    summarySignificance: rec.summarySignificance,
-                    summaryFacts: rec.summaryFacts,
-                    mostRecentActivity: rec.mostRecentActivity,
-                    isClassAction: rec.isClassAction,
-                    dateAdded: rec.dateAdded,
-                    source: rec.source
-                }
-            """,
-                records=records,
-            )
-        print(f"  Seeded cases {i + 1} to {min(i + batch_size, len(df))}")
+async def seed_cases(driver, tables: DailTables, frame: Optional[pd.DataFrame] = None):
+    rows = records(tables.cases if frame is None else frame)
+    print(f"Seeding {len(rows)} cases...")
+    await write_batches(
+        driver,
+        "Cases",
+        """
+        UNWIND $rows AS rec
+        MERGE (c:Case {id: rec.id})
+        SET c += {
+            recordNumber: rec.recordNumber,
+            caption: rec.caption,
+            briefDescription: rec.briefDescription,
+            areaOfApplication: rec.areaOfApplication,
+            causeOfAction: rec.causeOfAction,
+            issues: rec.issues,
+            algorithmNames: rec.algorithmNames,
+            organizations: rec.organizations,
+            jurisdictionFiled: rec.jurisdictionFiled,
+            dateFiled: rec.dateFiled,
+            currentJurisdiction: rec.currentJurisdiction,
+            jurisdictionType: rec.jurisdictionType,
+            status: rec.status,
+            summarySignificance: rec.summarySignificance,
+            summaryFacts: rec.summaryFacts,
+            mostRecentActivity: rec.mostRecentActivity,
+            isClassAction: rec.isClassAction,
+            dateAdded: rec.dateAdded,
+            source: rec.source,
+            contentHash: rec.contentHash
+        }
+    """,
+        rows,
+    )
     print("Cases seeded.")
 
 
-async def seed_dockets(driver):
-    try:
-        df = pd.read_csv(f"{DATA_DIR}/dail_dockets.csv")
-    except FileNotFoundError:
+async def seed_dockets(driver, tables: DailTables, frame: Optional[pd.DataFrame] = None):
+    if tables.dockets is None:
         print("No dail_dockets.csv found, skipping.")
         return
-
-    # Build lookup: numeric case id -> Case_snug (slug is the graph node id)
-    cases_df = pd.read_csv(f"{DATA_DIR}/dail_cases.csv")
-    id_to_slug = dict(zip(cases_df["id"].astype(int), cases_df["Case_snug"]))
-
-    print(f"Seeding {len(df)} dockets...")
-    linked = 0
-    orphaned = 0
-    async with driver.session() as session:
-        for _, row in df.iterrows():
-            try:
-                case_num = int(float(clean_val(row.get("Case_Number"))))
-            except (ValueError, TypeError):
-                continue
-            slug = id_to_slug.get(case_num)
-            if not slug:
-                orphaned += 1
-                continue
-            await session.run(
-                """
-                MATCH (c:Case {id: $caseId})
-                MERGE (d:Docket {id: $id})
-                SET d.court = $court, d.number = $number, d.link = $link
-                MERGE (c)-[:HAS_DOCKET]->(d)
-            """,
-                caseId=slug,
-                id=clean_val(row.get("id")),
-                court=clean_val(row.get("court")),
-                number=clean_val(row.get("number")),
-                link=clean_val(row.get("link")),
-            )
-            linked += 1
-    print(f"  Dockets: {linked} linked, {orphaned} orphaned")
+    rows = records(tables.dockets if frame is None else frame)
+    print(f"Seeding {len(rows)} dockets...")
+    await write_batches(
+        driver,
+        "Dockets",
+        """
+        UNWIND $rows AS rec
+        MATCH (c:Case {id: rec.caseId})
+        MERGE (d:Docket {id: rec.id})
+        SET d.court = rec.court, d.number = rec.number, d.link = rec.link,
+            d.contentHash = rec.contentHash
+        MERGE (c)-[:HAS_DOCKET]->(d)
+        WITH c, d
+        CALL { WITH c, d MATCH (old:Case)-[r:HAS_DOCKET]->(d) WHERE old <> c DELETE r }
+    """,
+        rows,
+    )
+    print(f"  Dockets: {len(rows)} linked, {tables.orphaned['dockets']} orphaned")
     print("Dockets seeded.")
 
 
-async def seed_documents(driver):
-    try:
-        df = pd.read_csv(f"{DATA_DIR}/dail_documents.csv")
-    except FileNotFoundError:
+async def seed_documents(driver, tables: DailTables, frame: Optional[pd.DataFrame] = None):
+    if tables.documents is None:
         print("No dail_documents.csv found, skipping.")
         return
-
-    # Build lookup: numeric case id -> Case_snug
-    cases_df = pd.read_csv(f"{DATA_DIR}/dail_cases.csv")
-    id_to_slug = dict(zip(cases_df["id"].astype(int), cases_df["Case_snug"]))
-
-    print(f"Seeding {len(df)} documents...")
-    linked = 0
-    orphaned = 0
-    async with driver.session() as session:
-        for _, row in df.iterrows():
-            try:
-                case_num = int(float(clean_val(row.get("Case_Number"))))
-            except (ValueError, TypeError):
-                continue
-            slug = id_to_slug.get(case_num)
-            if not slug:
-                orphaned += 1
-                continue
-            await session.run(
-                """
-                MATCH (c:Case {id: $caseId})
-                MERGE (doc:Document {id: $id})
-                SET doc.court = $court, doc.date = $date, doc.link = $link,
-                    doc.type = $docType, doc.citeOrReference = $cite
-                MERGE (c)-[:HAS_DOCUMENT]->(doc)
-            """,
-                caseId=slug,
-                id=clean_val(row.get("id")),
-                court=clean_val(row.get("court")),
-                date=clean_val(row.get("date")),
-                link=clean_val(row.get("link")),
-                docType=clean_val(row.get("document")),
-                cite=clean_val(row.get("cite_or_reference")),
-            )
-            linked += 1
-    print(f"  Documents: {linked} linked, {orphaned} orphaned")
+    rows = records(tables.documents if frame is None else frame)
+    print(f"Seeding {len(rows)} documents...")
+    await write_batches(
+        driver,
+        "Documents",
+        """
+        UNWIND $rows AS rec
+        MATCH (c:Case {id: rec.caseId})
+        MERGE (doc:Document {id: rec.id})
+        SET doc.court = rec.court, doc.date = rec.date, doc.link = rec.link,
+            doc.type = rec.docType, doc.citeOrReference = rec.cite,
+            doc.contentHash = rec.contentHash
+        MERGE (c)-[:HAS_DOCUMENT]->(doc)
+        WITH c, doc
+        CALL { WITH c, doc MATCH (old:Case)-[r:HAS_DOCUMENT]->(doc) WHERE old <> c DELETE r }
+    """,
+        rows,
+    )
+    print(f"  Documents: {len(rows)} linked, {tables.orphaned['documents']} orphaned")
     print("Documents seeded.")
 
 
-async def seed_legal_theories(driver):
-    print("Seeding LegalTheory nodes...")
-    async with driver.session() as session:
-        await session.run("""
-            MATCH (c:Case) WHERE size(c.causeOfAction) > 0
-            UNWIND c.causeOfAction AS theory
-            WITH trim(theory) AS t WHERE t <> ''
-            MERGE (lt:LegalTheory {name: t})
-            WITH lt, t
-            MATCH (c:Case) WHERE t IN c.causeOfAction
-            MERGE (c)-[:ASSERTS_CLAIM]->(lt)
-        """)
-    print("LegalTheory nodes and relationships seeded.")
-
-
-async def seed_courts(driver):
-    print("Seeding Court nodes...")
+async def seed_theories_and_courts(
+    driver,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    case_ids: Optional[list] = None,
+):
+    """
+    Materialize LegalTheory and Court nodes in one pass over the cases.
+
+    Each case's causeOfAction list is unwound once and the theory node and
+    ASSERTS_CLAIM edge are merged together (the constraint-backed MERGE is an
+    index lookup), so the cost is linear in cases + claims rather than
+    rescanning every case per theory. CALL { } IN TRANSACTIONS commits every
+    batch_size cases, which needs an implicit (auto-commit) transaction.
+    Pass case_ids to limit the pass to those cases (differential reseed).
+    """
+    print("Seeding LegalTheory and Court nodes...")
+    start = time.perf_counter()
     async with driver.session() as session:
-        await session.run("""
-            MATCH (c:Case) WHERE c.jurisdictionFiled IS NOT NULL AND c.jurisdictionFiled <> ''
-            WITH c, c.jurisdictionFiled AS courtName, c.jurisdictionType AS jType
-            MERGE (ct:Court {name: courtName})
-            SET ct.jurisdictionType = jType
-            MERGE (c)-[:FILED_IN]->(ct)
-        """)
-    print("Court nodes and relationships seeded.")
-
-
-async def seed_secondary_sources(driver):
-    """Seed (:SecondarySource) nodes and link to cases via HAS_SECONDARY_SOURCE."""
-    try:
-        df = pd.read_csv(f"{DATA_DIR}/dail_secondary_sources.csv")
-    except FileNotFoundError:
+        result = await session.run("""
+            MATCH (c:Case)
+            WHERE ($ids IS NULL OR c.id IN $ids)
+              AND (size(coalesce(c.causeOfAction, [])) > 0
+                   OR coalesce(c.jurisdictionFiled, '') <> '')
+            CALL {
+                WITH c
+                FOREACH (t IN [x IN coalesce(c.causeOfAction, []) WHERE trim(x) <> '' | trim(x)] |
+                    MERGE (lt:LegalTheory {name: t})
+                    MERGE (c)-[:ASSERTS_CLAIM]->(lt)
+                )
+                FOREACH (_ IN CASE WHEN coalesce(c.jurisdictionFiled, '') <> '' THEN [1] ELSE [] END |
+                    MERGE (ct:Court {name: c.jurisdictionFiled})
+                    SET ct.jurisdictionType = c.jurisdictionType
+                    MERGE (c)-[:FILED_IN]->(ct)
+                )
+            } IN TRANSACTIONS OF $batch ROWS
+        """, batch=batch_size, ids=case_ids)
+        summary = await result.consume()
+    counters = summary.counters
+    print(
+        f"  LegalTheory/Court: {counters.nodes_created} nodes, "
+        f"{counters.relationships_created} relationships in {time.perf_counter() - start:.2f}s"
+    )
+    print("LegalTheory and Court nodes seeded.")
+
+
+async def seed_secondary_sources(driver, tables: DailTables, frame: Optional[pd.DataFrame] = None):
+    """
+    Seed (:SecondarySource) nodes and link to cases via HAS_SECONDARY_SOURCE.
+    The DAIL row id and content hash sit on the relationship, since one
+    source node is shared by every case citing the same link.
+    """
+    if tables.secondary_sources is None:
         print("No dail_secondary_sources.csv found, skipping.")
         return
+    rows = records(tables.secondary_sources if frame is None else frame)
+    print(f"Seeding {len(rows)} secondary sources...")
+    await write_batches(
+        driver,
+        "Secondary sources",
+        """
+        UNWIND $rows AS rec
+        CALL { WITH rec MATCH (:Case)-[old:HAS_SECONDARY_SOURCE {sourceId: rec.id}]->() DELETE old }
+        WITH rec
+        MATCH (c:Case {id: rec.caseId})
+        MERGE (s:SecondarySource {link: rec.link})
+        SET s.title = rec.title, s.sourceId = rec.id
+        MERGE (c)-[r:HAS_SECONDARY_SOURCE]->(s)
+        SET r.sourceId = rec.id, r.contentHash = rec.contentHash
+    """,
+        rows,
+    )
+    orphaned = tables.orphaned["secondary_sources"]
+    print(f"  Secondary sources: {len(rows)} linked, {orphaned} orphaned (case not found)")
+
+
+async def seed_full(driver, tables: DailTables):
+    """Write every row, as on a first seed."""
+    # Every other stage links to Case nodes, so cases go first; the rest are independent
+    await seed_cases(driver, tables)
+    await asyncio.gather(
+        seed_dockets(driver, tables),
+        seed_documents(driver, tables),
+        seed_secondary_sources(driver, tables),
+    )
+    # Batches committed inside CALL { } IN TRANSACTIONS are not retried by the
+    # driver, so this stage runs alone rather than contending for Case locks
+    await seed_theories_and_courts(driver)
+
+
+async def seed_delta(driver, tables: DailTables) -> Optional[list]:
+    """
+    Write only rows whose content hash differs from the last seed, and remove
+    vanished rows. Returns the ids of cases written or deleted, or None when
+    nothing changed.
+    """
+    deltas = await compute_deltas(driver, tables)
+    for name, delta in deltas.items():
+        print(f"  {name}: {delta.summary()}")
+    if not any(deltas.values()):
+        print("DAIL tables unchanged; nothing to seed.")
+        return None
 
-    # Build lookup: numeric case id -> Case_snug (slug used as graph id)
-    cases_df = pd.read_csv(f"{DATA_DIR}/dail_cases.csv")
-    id_to_slug = dict(zip(cases_df["id"].astype(int), cases_df["Case_snug"]))
-
-    print(f"Seeding {len(df)} secondary sources...")
-    linked = 0
-    orphaned = 0
-
-    async with driver.session() as session:
-        for _, row in df.iterrows():
-            case_num = int(row.get("Case_Number", 0))
-            slug = id_to_slug.get(case_num)
-            if not slug:
-                orphaned += 1
-                continue
-            link = str(row.get("Secondary_Source_Link", "")).strip()
-            title = str(row.get("Secondary_Source_Title", "")).strip()
-            if not link or link in ("nan", ""):
-                continue
-            await session.run(
-                """
-                MATCH (c:Case {id: $slug})
-                MERGE (s:SecondarySource {link: $link})
-                SET s.title = $title, s.sourceId = $srcId
-                MERGE (c)-[:HAS_SECONDARY_SOURCE]->(s)
-            """,
-                slug=slug,
-                link=link,
-                title=title,
-                srcId=int(row.get("id", 0)),
-            )
-            linked += 1
-
-    print(f"  Secondary sources: {linked} linked, {orphaned} orphaned (case not found)")
-
-
-async def main():
+    for name in DELETE_ORDER:
+        if name in deltas:
+            await delete_rows(driver, name, deltas[name].deleted)
+
+    cases = deltas["cases"]
+    await clear_case_links(driver, cases.changed["id"].tolist())
+    await seed_cases(driver, tables, cases.upserts)
+    await asyncio.gather(
+        seed_dockets(driver, tables, _upserts(deltas, "dockets")),
+        seed_documents(driver, tables, _upserts(deltas, "documents")),
+        seed_secondary_sources(driver, tables, _upserts(deltas, "secondary_sources")),
+    )
+    touched = cases.upserts["id"].tolist()
+    if touched:
+        await seed_theories_and_courts(driver, case_ids=touched)
+    # Filing dates feed CO_DEFENDANT; a deleted case's defendants are no longer
+    # reachable from its id, so deletions fall back to a full recompute
+    await refresh_co_defendants(driver, None if len(cases.deleted) else cases.changed["id"].tolist())
+    await prune_orphans(driver)
+    return touched + list(cases.deleted)
+
+
+def _upserts(deltas: dict, name: str) -> Optional[pd.DataFrame]:
+    return deltas[name].upserts if name in deltas else None
+
+
+async def main(full: bool = False):
     uri = os.getenv("NEO4J_URI", "bolt://localhost:7687")
     user = os.getenv("NEO4J_USER", "neo4j")
     password = os.getenv("NEO4J_PASSWORD", "dail_password")
     driver = await get_driver(uri, user, password)
     await init_schema(driver)
-    await seed_cases(driver)
-    await seed_dockets(driver)
-    await seed_documents(driver)
-    await seed_secondary_sources(driver)
-    await seed_legal_theories(driver)
-    await seed_courts(driver)
+    start = time.perf_counter()
+    tables = DailTables()
+    if full:
+        await seed_full(driver, tables)
+        await bump_graph_version(driver)
+    elif (touched := await seed_delta(driver, tables)) is not None:
+        await bump_graph_version(driver, case_ids=touched)
     await driver.close()
-    print("\nAll seeding complete.")
+    print(f"\nAll seeding complete in {time.perf_counter() - start:.1f}s.")
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    parser = argparse.ArgumentParser(description="Seed Neo4j from the clean DAIL CSVs.")
+    parser.add_argument(
+        "--full", action="store_true",
+        help="rewrite every row instead of only rows changed since the last seed",
+    )
+    parser.add_argument(
+        "--bulk", nargs="?", const=bulk_import.DEFAULT_IMPORT_DIR, metavar="DIR",
+        help="write neo4j-admin import files to DIR (default data/import/) instead of seeding over Bolt",
+    )
+    parser.add_argument(
+        "--organizations", default=bulk_import.DEFAULT_ORGANIZATIONS_CSV, metavar="CSV",
+        help="entity extraction CSV to include as Organization nodes in --bulk mode",
+    )
+    args = parser.parse_args()
+    if args.bulk:
+        bulk_import.run(args.bulk, args.organizations)
+    else:
+        asyncio.run(main(full=args.full))
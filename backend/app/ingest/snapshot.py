@@ -0,0 +1,83 @@
+"""
+Write the binary graph snapshot the API's in-process replica starts from.
+    python -m app.ingest.snapshot             (from backend/ directory)
+    python -m app.ingest.snapshot --force     (rewrite even if current)
+    python -m app.ingest.snapshot --verify    (check every file's SHA-256)
+
+Reads cases, organizations, AI systems, legal theories and their
+relationships from Neo4j and saves them as memory-mappable arrays under
+data/graph_snapshot/ (see app.services.graph_snapshot). Skipped when the
+snapshot already holds the current graph version. This module is the only
+snapshot writer: the pipeline stage runs main(), and the scheduler leader
+calls write_snapshot() after each ingest job.
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from typing import Optional
+
+from dotenv import load_dotenv
+
+from app.services.graph_replica import GraphReplica, fetch_rows, replica_to_arrays
+from app.services.graph_snapshot import DEFAULT_SNAPSHOT_DIR, load_snapshot, read_manifest, save_snapshot
+from app.services.neo4j_service import get_driver, get_graph_version
+
+load_dotenv()
+
+
+async def write_snapshot(driver, snapshot_dir: str = DEFAULT_SNAPSHOT_DIR, force: bool = False) -> Optional[dict]:
+    """Save the graph as a snapshot; returns the manifest (plus "stats"), or None when it was already current."""
+    # Read the version first: anything written during the export shows up as a newer version
+    version = await get_graph_version(driver)
+    manifest = read_manifest(snapshot_dir)
+    if not force and manifest and manifest.get("graphVersion") == version:
+        return None
+    replica = GraphReplica.build(version, *await fetch_rows(driver))
+    manifest = save_snapshot(replica_to_arrays(replica), version, snapshot_dir)
+    return {**manifest, "stats": replica.stats()}
+
+
+async def main(force: bool = False, snapshot_dir: Optional[str] = None):
+    snapshot_dir = snapshot_dir or os.getenv("GRAPH_SNAPSHOT_DIR") or DEFAULT_SNAPSHOT_DIR
+    uri = os.getenv("NEO4J_URI", "bolt://localhost:7687")
+    user = os.getenv("NEO4J_USER", "neo4j")
+    password = os.getenv("NEO4J_PASSWORD", "dail_password")
+    driver = await get_driver(uri, user, password)
+    try:
+        start = time.perf_counter()
+        manifest = await write_snapshot(driver, snapshot_dir, force)
+        if manifest is None:
+            print(f"Graph snapshot already at version {read_manifest(snapshot_dir)['graphVersion']}; nothing to write.")
+            return
+        size = sum(entry["size"] for entry in manifest["arrays"].values())
+        stats = manifest["stats"]
+        print(f"Graph snapshot v{manifest['graphVersion']}: {stats['cases']} cases, "
+              f"{stats['relationships']} relationships, {size / 1e6:.1f} MB in "
+              f"{time.perf_counter() - start:.1f}s -> {snapshot_dir}")
+    finally:
+        await driver.close()
+
+
+def verify(snapshot_dir: Optional[str] = None) -> bool:
+    """Check every array file against its manifest checksum (API startup only checks sizes)."""
+    snapshot_dir = snapshot_dir or os.getenv("GRAPH_SNAPSHOT_DIR") or DEFAULT_SNAPSHOT_DIR
+    loaded = load_snapshot(snapshot_dir, verify=True)
+    if loaded is None:
+        print(f"Graph snapshot in {snapshot_dir} is missing or invalid.")
+        return False
+    print(f"Graph snapshot v{loaded[0]['graphVersion']} in {snapshot_dir}: "
+          f"{len(loaded[1])} arrays match their checksums.")
+    return True
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Write the binary graph snapshot for API cold starts.")
+    parser.add_argument("--force", action="store_true", help="rewrite even if the snapshot is current")
+    parser.add_argument("--dir", default=None, help=f"snapshot directory (default {DEFAULT_SNAPSHOT_DIR})")
+    parser.add_argument("--verify", action="store_true", help="only check the existing snapshot's checksums")
+    args = parser.parse_args()
+    if args.verify:
+        sys.exit(0 if verify(args.dir) else 1)
+    asyncio.run(main(args.force, args.dir))
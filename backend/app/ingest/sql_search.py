@@ -0,0 +1,91 @@
+"""
+Full-text search over the exported dail.db.
+
+export_sql builds two SQLite FTS5 indexes after loading the tables:
+
+    cases_fts              caption, brief description, summaries, issues, causes of action
+    secondary_sources_fts  secondary source titles
+
+Both are external-content tables (the text lives only in the base tables)
+tokenized with `porter unicode61`, so "scraped" matches "scraping".
+They are SQLite-specific and deliberately kept out of the portable
+schema.sql.
+
+    from app.ingest.sql_search import search_cases
+    search_cases(sqlite3.connect("data/dail.db"), "facial recognition")
+"""
+import re
+import sqlite3
+
+FTS_SQL = """\
+CREATE VIRTUAL TABLE IF NOT EXISTS cases_fts USING fts5(
+    caption, brief_description, summary_significance, summary_facts, issues, cause_of_action,
+    content='cases', content_rowid='rowid', tokenize='porter unicode61'
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS secondary_sources_fts USING fts5(
+    title, content='secondary_sources', content_rowid='id', tokenize='porter unicode61'
+);
+"""
+
+# bm25 column weights, in cases_fts column order: a caption hit outranks a summary hit
+CASE_WEIGHTS = (10.0, 4.0, 2.0, 1.0, 3.0, 3.0)
+
+_TOKEN = re.compile(r"\w+\*?", re.UNICODE)
+
+
+def build_fts(conn: sqlite3.Connection):
+    """Create the FTS5 tables and index the rows currently in the base tables."""
+    conn.executescript(FTS_SQL)
+    conn.execute("INSERT INTO cases_fts(cases_fts) VALUES ('rebuild')")
+    conn.execute("INSERT INTO secondary_sources_fts(secondary_sources_fts) VALUES ('rebuild')")
+    conn.execute("INSERT INTO cases_fts(cases_fts) VALUES ('optimize')")
+    conn.commit()
+
+
+def fts_query(text: str) -> str:
+    """
+    User text -> FTS5 MATCH expression. Every word is quoted so operators and
+    punctuation in the input cannot raise syntax errors; words are ANDed and a
+    trailing * keeps prefix matching ("algorith*").
+    """
+    terms = []
+    for token in _TOKEN.findall(text or ""):
+        word, star = token.rstrip("*"), "*" if token.endswith("*") else ""
+        if word:
+            terms.append(f'"{word}"{star}')
+    return " ".join(terms)
+
+
+def search_cases(conn: sqlite3.Connection, text: str, limit: int = 20) -> list:
+    """Cases ranked by bm25 (best first), with a highlighted snippet."""
+    query = fts_query(text)
+    if not query:
+        return []
+    weights = ", ".join(str(w) for w in CASE_WEIGHTS)
+    cursor = conn.execute(f"""
+        SELECT c.id, c.caption, c.status, c.date_filed,
+               snippet(cases_fts, -1, '[', ']', '…', 12) AS snippet,
+               bm25(cases_fts, {weights}) AS score
+        FROM cases_fts JOIN cases c ON c.rowid = cases_fts.rowid
+        WHERE cases_fts MATCH ?
+        ORDER BY score
+        LIMIT ?
+    """, (query, limit))
+    cols = [d[0] for d in cursor.description]
+    return [dict(zip(cols, row)) for row in cursor]
+
+
+def search_secondary_sources(conn: sqlite3.Connection, text: str, limit: int = 20) -> list:
+    """Secondary sources ranked by bm25 on their titles."""
+    query = fts_query(text)
+    if not query:
+        return []
+    cursor = conn.execute("""
+        SELECT s.id, s.case_id, s.title, s.link, bm25(secondary_sources_fts) AS score
+        FROM secondary_sources_fts JOIN secondary_sources s ON s.id = secondary_sources_fts.rowid
+        WHERE secondary_sources_fts MATCH ?
+        ORDER BY score
+        LIMIT ?
+    """, (query, limit))
+    cols = [d[0] for d in cursor.description]
+    return [dict(zip(cols, row)) for row in cursor]
@@ -6,6 +6,8 @@ from fastapi.middleware.cors import CORSMiddleware
 from app.api.dependencies import get_settings
 from app.api.routes import cases, graph, review, search, ingest
 from app.services import neo4j_service
+from app.services.graph_replica import replica_manager
+from app.services.sqlite_store import read_store
 from app.ingest.scheduler import start_scheduler, stop_scheduler
 
 logging.basicConfig(
@@ -25,12 +27,18 @@ async def lifespan(app: FastAPI):
         settings.neo4j_user,
         settings.neo4j_password,
     )
+    # Unreachable Neo4j only logs here; case / defendant reads then fall back to the read store
     await neo4j_service.init_schema(driver)
+    read_store.configure(settings.graph_sqlite_path, primary=settings.graph_read_backend == "sqlite")
+    if settings.graph_read_backend == "replica":
+        logger.info("Loading in-process graph replica...")
+        await replica_manager.start(driver, settings.graph_replica_refresh_seconds, settings.graph_snapshot_dir)
     logger.info("Starting CourtListener ingestion scheduler...")
     start_scheduler()
     yield
     # Shutdown
-    stop_scheduler()
+    await stop_scheduler()
+    await replica_manager.stop()
     await neo4j_service.close_driver()
     logger.info("Application shutdown complete.")
 
@@ -83,6 +91,12 @@ async def health():
             settings.neo4j_password,
         )
         overview = await neo4j_service.get_node_counts(driver)
-        return {"status": "ok", "neo4j": "connected", "graph": overview}
+        return {
+            "status": "ok", "neo4j": "connected", "graph": overview,
+            "replica": replica_manager.status(), "readStore": read_store.status(),
+        }
     except Exception as e:
-        return {"status": "degraded", "neo4j": "unavailable", "error": str(e)}
+        return {
+            "status": "degraded", "neo4j": "unavailable", "error": str(e),
+            "replica": replica_manager.status(), "readStore": read_store.status(),
+        }
@@ -55,6 +55,12 @@ class CaseNeighbors(BaseModel):
     courts: List[str] = []
 
 
+class NeighborhoodRequest(BaseModel):
+    caseIds: List[str] = Field(default_factory=list, max_length=500)
+    organizations: List[str] = Field(default_factory=list, max_length=100)
+    limitPerOrganization: int = Field(25, ge=1, le=200)
+
+
 class DefendantRanking(BaseModel):
     canonicalName: str
     caseCount: int
@@ -78,6 +84,9 @@ class StagingCase(BaseModel):
     dateFiled: Optional[str] = None
     docketNumber: Optional[str] = None
     absoluteUrl: Optional[str] = None
+    clusterIds: List[str] = []
+    opinionText: Optional[str] = None
+    matchedKeywords: List[str] = []
 
 
 class WaveSignal(BaseModel):
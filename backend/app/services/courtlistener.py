@@ -1,5 +1,16 @@
+import asyncio
+import email.utils
+import hashlib
 import httpx
+import json
 import logging
+import os
+import random
+import re
+import time
+from html.parser import HTMLParser
+from importlib.util import find_spec
+from typing import Optional
 from app.models.graph_models import StagingCase
 
 logger = logging.getLogger(__name__)
@@ -17,15 +28,203 @@ AI_LITIGATION_KEYWORDS = [
     "biometric",
 ]
 
+# Resolve data/ relative to project root: backend/app/services/ -> up 3 -> dail-knowledge-graph/data/
+DEFAULT_CACHE_DIR = os.path.normpath(
+    os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "data", "cache", "courtlistener"
+    )
+)
+
+# Responses worth retrying: rate limiting and transient upstream failures.
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Connection refused / DNS failures are not retried — they rarely clear within a backoff window.
+RETRY_EXCEPTIONS = (
+    httpx.TimeoutException,
+    httpx.ReadError,
+    httpx.WriteError,
+    httpx.RemoteProtocolError,
+)
+
+_ID_FROM_URL = re.compile(r"/(\d+)/?$")
+
+# Opinion body fields in order of preference; all but plain_text carry markup.
+OPINION_TEXT_FIELDS = [
+    "plain_text",
+    "html_with_citations",
+    "html",
+    "html_lawbox",
+    "html_columbia",
+    "xml_harvard",
+]
+
 
 class CourtListenerClient:
-    def __init__(self, base_url: str = "https://www.courtlistener.com"):
+    def __init__(
+        self,
+        base_url: str = "https://www.courtlistener.com",
+        cache_dir: Optional[str] = None,
+        cache_ttl: float = 7 * 24 * 3600,
+        max_retries: int = 4,
+        backoff_base: float = 1.0,
+        backoff_max: float = 60.0,
+        max_connections: int = 10,
+    ):
         self.base_url = base_url.rstrip("/")
+        self.cache_dir = (
+            cache_dir if cache_dir is not None
+            else os.getenv("COURTLISTENER_CACHE_DIR", DEFAULT_CACHE_DIR)
+        )
+        self.cache_ttl = cache_ttl
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        # Observed from X-RateLimit-* headers; None until the server reports them.
+        self.rate_limit_limit: Optional[int] = None
+        self.rate_limit_remaining: Optional[int] = None
+        self.request_count = 0
+        self._paused_until = 0.0
         self.client = httpx.AsyncClient(
-            timeout=30.0,
+            timeout=httpx.Timeout(30.0, connect=10.0),
             headers={"User-Agent": "DAIL-Research-Bot/1.0"},
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+                keepalive_expiry=60.0,
+            ),
+            # HTTP/2 multiplexes requests over one keep-alive connection; needs the h2 extra.
+            http2=find_spec("h2") is not None,
         )
 
+    # ── Transport ──────────────────────────────────────────────────────────
+
+    def _backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff."""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    def _retry_after(self, headers: httpx.Headers) -> Optional[float]:
+        """Parse a Retry-After header (delta seconds or HTTP date)."""
+        value = headers.get("Retry-After")
+        if not value:
+            return None
+        try:
+            delay = float(value)
+        except ValueError:
+            try:
+                delay = email.utils.parsedate_to_datetime(value).timestamp() - time.time()
+            except (TypeError, ValueError):
+                return None
+        return min(max(delay, 0.0), self.backoff_max)
+
+    def _record_rate_limit(self, headers: httpx.Headers):
+        """Track X-RateLimit-* headers and pause once the window is exhausted."""
+        try:
+            if "X-RateLimit-Limit" in headers:
+                self.rate_limit_limit = int(headers["X-RateLimit-Limit"])
+            if "X-RateLimit-Remaining" in headers:
+                self.rate_limit_remaining = int(headers["X-RateLimit-Remaining"])
+        except ValueError:
+            return
+        if self.rate_limit_remaining == 0 and "X-RateLimit-Reset" in headers:
+            try:
+                reset = float(headers["X-RateLimit-Reset"])
+            except ValueError:
+                return
+            # Reset is either an epoch timestamp or a delta in seconds.
+            delay = reset - time.time() if reset > 1e9 else reset
+            self._paused_until = time.monotonic() + min(max(delay, 0.0), self.backoff_max)
+
+    async def _request(self, url: str, params: Optional[dict] = None, headers: Optional[dict] = None) -> httpx.Response:
+        """GET with retries on 429/5xx and transient transport errors."""
+        attempt = 0
+        while True:
+            wait = self._paused_until - time.monotonic()
+            if wait > 0:
+                logger.info(f"CourtListener rate limit exhausted; pausing {wait:.1f}s")
+                await asyncio.sleep(wait)
+            try:
+                r = await self.client.get(url, params=params, headers=headers)
+            except RETRY_EXCEPTIONS as e:
+                if attempt >= self.max_retries:
+                    raise
+                delay = self._backoff(attempt)
+                logger.warning(f"CourtListener request to {url} failed ({e!r}); retrying in {delay:.1f}s")
+            else:
+                self.request_count += 1
+                self._record_rate_limit(r.headers)
+                if r.status_code not in RETRY_STATUSES or attempt >= self.max_retries:
+                    return r
+                delay = self._retry_after(r.headers)
+                if delay is None:
+                    delay = self._backoff(attempt)
+                logger.warning(f"CourtListener returned {r.status_code} for {url}; retrying in {delay:.1f}s")
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    # ── On-disk cache with conditional revalidation ────────────────────────
+
+    def _cache_path(self, url: str, params: Optional[dict]) -> Optional[str]:
+        if not self.cache_dir:
+            return None
+        key = url + "?" + json.dumps(params or {}, sort_keys=True)
+        return os.path.join(self.cache_dir, hashlib.sha256(key.encode()).hexdigest() + ".json")
+
+    def _read_cache(self, path: Optional[str]) -> Optional[dict]:
+        if not path or not os.path.exists(path):
+            return None
+        try:
+            with open(path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable cache entry {path}: {e}")
+            return None
+
+    def _write_cache(self, path: Optional[str], entry: dict):
+        if not path:
+            return
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp = f"{path}.{os.getpid()}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(entry, f)
+            os.replace(tmp, path)
+        except OSError as e:
+            logger.warning(f"Could not write cache entry {path}: {e}")
+
+    async def _get_cached_json(self, url: str, params: Optional[dict] = None) -> dict:
+        """
+        Fetch a JSON body through the on-disk cache. Fresh entries are served
+        without a request; stale ones are revalidated with ETag/If-Modified-Since.
+        """
+        path = self._cache_path(url, params)
+        entry = self._read_cache(path)
+        if entry and time.time() - entry.get("fetchedAt", 0) < self.cache_ttl:
+            return entry["body"]
+
+        headers = {}
+        if entry:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("lastModified"):
+                headers["If-Modified-Since"] = entry["lastModified"]
+        r = await self._request(url, params=params, headers=headers)
+        if r.status_code == 304 and entry:
+            entry["fetchedAt"] = time.time()
+            self._write_cache(path, entry)
+            return entry["body"]
+        r.raise_for_status()
+        body = r.json()
+        self._write_cache(path, {
+            "url": url,
+            "etag": r.headers.get("ETag"),
+            "lastModified": r.headers.get("Last-Modified"),
+            "fetchedAt": time.time(),
+            "body": body,
+        })
+        return body
+
+    # ── API ────────────────────────────────────────────────────────────────
+
     async def search(self, query: str, filed_after: str, limit: int = 20) -> list:
         url = f"{self.base_url}/api/rest/v4/dockets/"
         params = {
@@ -36,7 +235,7 @@ class CourtListenerClient:
             "page_size": limit,
         }
         try:
-            r = await self.client.get(url, params=params)
+            r = await self._request(url, params=params)
             r.raise_for_status()
             data = r.json()
             return data.get("results", [])
@@ -44,15 +243,34 @@ class CourtListenerClient:
             logger.error(f"CourtListener search failed for '{query}': {e}")
             return []
 
-    async def get_opinion_text(self, cluster_id: int) -> str:
+    async def get_cluster(self, cluster_id: int) -> dict:
         url = f"{self.base_url}/api/rest/v4/clusters/{cluster_id}/"
+        return await self._get_cached_json(url, params={"format": "json"})
+
+    async def get_opinion(self, opinion_id: int) -> dict:
+        url = f"{self.base_url}/api/rest/v4/opinions/{opinion_id}/"
+        return await self._get_cached_json(url, params={"format": "json"})
+
+    async def get_opinion_text(self, cluster_id: int) -> str:
+        """Return the plain text of the first sub-opinion of a cluster that has any."""
         try:
-            r = await self.client.get(url, params={"format": "json"})
-            r.raise_for_status()
-            data = r.json()
-            return data.get("plain_text", "") or data.get("html_with_citations", "")[:2000]
-        except Exception:
-            return ""
+            cluster = await self.get_cluster(cluster_id)
+            # Older payloads carried the text on the cluster itself.
+            text = _opinion_body(cluster)
+            if text:
+                return text
+            for ref in cluster.get("sub_opinions", []):
+                match = _ID_FROM_URL.search(str(ref))
+                if not match:
+                    continue
+                text = _opinion_body(await self.get_opinion(int(match.group(1))))
+                if text:
+                    return text
+        except httpx.HTTPStatusError as e:
+            logger.warning(f"CourtListener cluster {cluster_id}: HTTP {e.response.status_code}")
+        except (httpx.HTTPError, ValueError) as e:
+            logger.warning(f"CourtListener cluster {cluster_id}: {e!r}")
+        return ""
 
     def parse_to_staging(self, d: dict) -> StagingCase:
         return StagingCase(
@@ -62,7 +280,70 @@ class CourtListenerClient:
             dateFiled=str(d.get("date_filed", ""))[:10] if d.get("date_filed") else None,
             docketNumber=d.get("docket_number", ""),
             absoluteUrl=d.get("absolute_url", ""),
+            clusterIds=[
+                m.group(1) for m in (_ID_FROM_URL.search(str(c)) for c in d.get("clusters") or []) if m
+            ],
         )
 
     async def aclose(self):
         await self.client.aclose()
+
+
+def _opinion_body(data: dict) -> str:
+    for field in OPINION_TEXT_FIELDS:
+        body = data.get(field) or ""
+        if body.strip():
+            return body if field == "plain_text" else strip_html(body)
+    return ""
+
+
+class _TextExtractor(HTMLParser):
+    """Collects text content, skipping script/style, until max_chars is reached."""
+
+    SKIP_TAGS = {"script", "style", "head"}
+    BLOCK_TAGS = {"p", "div", "br", "li", "tr", "h1", "h2", "h3", "h4", "blockquote", "pre"}
+
+    def __init__(self, max_chars: int):
+        super().__init__(convert_charrefs=True)
+        self.max_chars = max_chars
+        self.parts: list = []
+        self.size = 0
+        self._skip_depth = 0
+
+    @property
+    def full(self) -> bool:
+        return self.size >= self.max_chars
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self.SKIP_TAGS:
+            self._skip_depth += 1
+        elif tag in self.BLOCK_TAGS:
+            self.parts.append("\n")
+
+    def handle_endtag(self, tag):
+        if tag in self.SKIP_TAGS and self._skip_depth:
+            self._skip_depth -= 1
+
+    def handle_data(self, data):
+        if self._skip_depth or self.full:
+            return
+        self.parts.append(data)
+        self.size += len(data)
+
+
+def strip_html(html: str, max_chars: int = 200_000, chunk_size: int = 64 * 1024) -> str:
+    """
+    Convert opinion markup to plain text. The parser is fed in chunks and stops
+    once max_chars of text have been collected, so very long opinions are not
+    parsed (or held as text) in full.
+    """
+    parser = _TextExtractor(max_chars)
+    for start in range(0, len(html), chunk_size):
+        parser.feed(html[start:start + chunk_size])
+        if parser.full:
+            break
+    parser.close()
+    text = "".join(parser.parts)
+    text = re.sub(r"[ \t\r\f\v]+", " ", text)
+    text = re.sub(r"\s*\n\s*", "\n", text)
+    return text.strip()[:max_chars]
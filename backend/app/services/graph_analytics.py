@@ -0,0 +1,306 @@
+"""
+Vectorized centrality over the case–organization–system–theory graph.
+
+The graph is pulled from Neo4j once into integer-indexed arrays (CSR
+adjacency, undirected) and scored with NumPy:
+
+    degree       number of distinct neighbors
+    pagerank     power iteration, damping 0.85, dangling mass spread uniformly
+    betweenness  Brandes' algorithm from a sample of source nodes (level-
+                 synchronous BFS per source), scaled to the full graph
+
+Scores are written back by app.ingest.analytics so API rankings are an
+index read. The same module clusters the weighted defendant/theory
+projection (Louvain or label propagation) for app.ingest.communities.
+"""
+from typing import Optional
+
+import numpy as np
+
+ANALYTICS_REL_TYPES = ["NAMED_DEFENDANT", "INVOLVES_SYSTEM", "ASSERTS_CLAIM"]
+
+EDGES_QUERY = """
+    MATCH (c:Case)-[r:NAMED_DEFENDANT|INVOLVES_SYSTEM|ASSERTS_CLAIM]->(n)
+    RETURN c.id AS case,
+           CASE type(r) WHEN 'NAMED_DEFENDANT' THEN 'Organization'
+                        WHEN 'INVOLVES_SYSTEM' THEN 'AISystem' ELSE 'LegalTheory' END AS label,
+           CASE type(r) WHEN 'NAMED_DEFENDANT' THEN n.canonicalName ELSE n.name END AS key
+"""
+
+
+class GraphMatrix:
+    """
+    Nodes as (label, key) pairs indexed 0..n-1 and an undirected CSR
+    adjacency: the neighbors of node i are indices[indptr[i]:indptr[i + 1]].
+    """
+
+    def __init__(self, nodes: list, src: np.ndarray, dst: np.ndarray):
+        self.nodes = nodes
+        self.index = {node: i for i, node in enumerate(nodes)}
+        n = len(nodes)
+        # Symmetrize and drop duplicate edges
+        pairs = np.unique(np.stack([np.concatenate([src, dst]), np.concatenate([dst, src])], axis=1), axis=0) \
+            if len(src) else np.empty((0, 2), dtype=np.int64)
+        self.src = pairs[:, 0].astype(np.int64)
+        self.dst = pairs[:, 1].astype(np.int64)
+        self.indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(self.src, minlength=n), out=self.indptr[1:])
+        self.indices = self.dst  # pairs are sorted by source, so dst is already in CSR order
+
+    @classmethod
+    def from_edges(cls, edges: list) -> "GraphMatrix":
+        """edges: [((label, key), (label, key)), ...]"""
+        index: dict = {}
+        src, dst = [], []
+        for a, b in edges:
+            src.append(index.setdefault(a, len(index)))
+            dst.append(index.setdefault(b, len(index)))
+        return cls(list(index), np.array(src, dtype=np.int64), np.array(dst, dtype=np.int64))
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def degree(self) -> np.ndarray:
+        return np.diff(self.indptr)
+
+    def neighbors_of(self, frontier: np.ndarray) -> tuple:
+        """(source, neighbor) index arrays for every edge leaving `frontier`."""
+        starts = self.indptr[frontier]
+        counts = self.indptr[frontier + 1] - starts
+        total = int(counts.sum())
+        if total == 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+        sources = np.repeat(frontier, counts)
+        offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+        return sources, self.indices[np.repeat(starts, counts) + offsets]
+
+
+async def load_graph(driver) -> GraphMatrix:
+    """Pull the analytics edges from Neo4j into a GraphMatrix."""
+    edges = []
+    async with driver.session() as session:
+        result = await session.run(EDGES_QUERY)
+        async for r in result:
+            if r["key"] is not None:
+                edges.append((("Case", r["case"]), (r["label"], r["key"])))
+    return GraphMatrix.from_edges(edges)
+
+
+def pagerank(graph: GraphMatrix, damping: float = 0.85, tol: float = 1e-10, max_iter: int = 100) -> np.ndarray:
+    n = len(graph)
+    if n == 0:
+        return np.empty(0)
+    degree = graph.degree().astype(float)
+    dangling = degree == 0
+    rank = np.full(n, 1.0 / n)
+    inv_degree = np.divide(1.0, degree, out=np.zeros(n), where=~dangling)
+    for _ in range(max_iter):
+        spread = np.bincount(graph.dst, weights=(rank * inv_degree)[graph.src], minlength=n)
+        new = (1.0 - damping) / n + damping * (spread + rank[dangling].sum() / n)
+        if np.abs(new - rank).sum() < tol:
+            return new
+        rank = new
+    return rank
+
+
+def betweenness(graph: GraphMatrix, samples: Optional[int] = 256, seed: int = 0) -> np.ndarray:
+    """
+    Brandes betweenness (undirected, unnormalized) from `samples` random
+    sources, scaled by n / samples; exact when samples is None or >= n.
+    """
+    n = len(graph)
+    scores = np.zeros(n)
+    if n == 0:
+        return scores
+    if samples is None or samples >= n:
+        sources = np.arange(n)
+    else:
+        sources = np.random.default_rng(seed).choice(n, size=samples, replace=False)
+    for s in sources:
+        dist = np.full(n, -1, dtype=np.int64)
+        sigma = np.zeros(n)
+        dist[s], sigma[s] = 0, 1.0
+        frontier = np.array([s], dtype=np.int64)
+        levels = []  # (u, v) edges of the shortest-path DAG, per BFS level
+        depth = 0
+        while len(frontier):
+            u, v = graph.neighbors_of(frontier)
+            unseen = dist[v] < 0
+            dist[np.unique(v[unseen])] = depth + 1
+            on_path = dist[v] == depth + 1
+            u, v = u[on_path], v[on_path]
+            np.add.at(sigma, v, sigma[u])
+            levels.append((u, v))
+            frontier = np.unique(v)
+            depth += 1
+        delta = np.zeros(n)
+        for u, v in reversed(levels):
+            np.add.at(delta, u, sigma[u] / sigma[v] * (1.0 + delta[v]))
+        delta[s] = 0.0
+        scores += delta
+    # Each undirected pair is counted from both ends
+    return scores * (n / len(sources)) / 2.0
+
+
+def centrality(graph: GraphMatrix, samples: Optional[int] = 256) -> dict:
+    """{"degree", "pagerank", "betweenness"} arrays aligned with graph.nodes."""
+    return {
+        "degree": graph.degree(),
+        "pagerank": pagerank(graph),
+        "betweenness": betweenness(graph, samples),
+    }
+
+
+# ── Communities ────────────────────────────────────────────────────────────
+
+# Organization–organization weight: shared cases, read from the maintained
+# CO_DEFENDANT projection (one edge per pair; see neo4j_service.refresh_co_defendants).
+# Organization–theory weight: cases asserting the theory, scaled down for
+# theories nearly everyone asserts
+PROJECTION_QUERY = """
+    MATCH (a:Organization)-[r:CO_DEFENDANT]->(b:Organization)
+    RETURN 'Organization' AS toLabel, a.canonicalName AS org, b.canonicalName AS other,
+           r.sharedCases AS cases
+    UNION ALL
+    MATCH (a:Organization)<-[:NAMED_DEFENDANT]-(c:Case)-[:ASSERTS_CLAIM]->(t:LegalTheory)
+    RETURN 'LegalTheory' AS toLabel, a.canonicalName AS org, t.name AS other,
+           count(DISTINCT c) AS cases
+"""
+
+
+def weighted_csr(n: int, src: np.ndarray, dst: np.ndarray, weight: np.ndarray) -> tuple:
+    """
+    Symmetrized CSR (indptr, indices, weights), parallel edges summed. A
+    self-loop of weight w is stored as 2w, so row sums are weighted degrees.
+    """
+    rows = np.concatenate([src, dst]).astype(np.int64)
+    cols = np.concatenate([dst, src]).astype(np.int64)
+    w = np.concatenate([weight, weight]).astype(float)
+    keys, inverse = np.unique(rows * n + cols, return_inverse=True)
+    summed = np.bincount(inverse, weights=w)
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(keys // n, minlength=n), out=indptr[1:])
+    return indptr, keys % n, summed
+
+
+def _local_moves(indptr, indices, weights, resolution: float, rng, max_passes: int = 20) -> np.ndarray:
+    """Louvain phase one: move single nodes to the neighboring community with the best modularity gain."""
+    n = len(indptr) - 1
+    k = np.bincount(np.repeat(np.arange(n), np.diff(indptr)), weights=weights, minlength=n)
+    m2 = k.sum()
+    community = np.arange(n)
+    tot = k.copy()
+    if m2 == 0:
+        return community
+    for _ in range(max_passes):
+        moved = 0
+        for i in rng.permutation(n):
+            lo, hi = indptr[i], indptr[i + 1]
+            nbrs, w = indices[lo:hi], weights[lo:hi]
+            not_self = nbrs != i
+            current = community[i]
+            tot[current] -= k[i]
+            if not not_self.any():
+                tot[current] += k[i]
+                continue
+            cand, inverse = np.unique(community[nbrs[not_self]], return_inverse=True)
+            w_to = np.bincount(inverse, weights=w[not_self])
+            gains = w_to - resolution * tot[cand] * k[i] / m2
+            stay = np.flatnonzero(cand == current)
+            stay_gain = gains[stay[0]] if len(stay) else -resolution * tot[current] * k[i] / m2
+            best = int(np.argmax(gains))
+            target = cand[best] if gains[best] > stay_gain + 1e-12 else current
+            tot[target] += k[i]
+            if target != current:
+                community[i] = target
+                moved += 1
+        if not moved:
+            break
+    return community
+
+
+def louvain(n: int, src: np.ndarray, dst: np.ndarray, weight: np.ndarray,
+            resolution: float = 1.0, seed: int = 0) -> np.ndarray:
+    """Community label per node (0 = largest community) by multi-level Louvain."""
+    rng = np.random.default_rng(seed)
+    labels = np.arange(n)
+    indptr, indices, weights = weighted_csr(n, src, dst, weight)
+    size = n
+    while True:
+        community = _local_moves(indptr, indices, weights, resolution, rng)
+        _, community = np.unique(community, return_inverse=True)
+        merged = community.max() + 1 if size else 0
+        labels = community[labels]
+        if merged == size:
+            break
+        # Phase two: collapse communities into nodes; internal edges become self-loops
+        rows = np.repeat(np.arange(size), np.diff(indptr))
+        keep = rows <= indices  # each undirected edge once
+        w = weights[keep]
+        w[rows[keep] == indices[keep]] /= 2.0  # stored self-loops are already doubled
+        indptr, indices, weights = weighted_csr(
+            merged, community[rows[keep]], community[indices[keep]], w
+        )
+        size = merged
+    return _by_size(labels)
+
+
+def label_propagation(n: int, src: np.ndarray, dst: np.ndarray, weight: np.ndarray,
+                      seed: int = 0, max_iter: int = 50) -> np.ndarray:
+    """Community label per node (0 = largest) by weighted asynchronous label propagation."""
+    rng = np.random.default_rng(seed)
+    indptr, indices, weights = weighted_csr(n, src, dst, weight)
+    labels = np.arange(n)
+    for _ in range(max_iter):
+        changed = 0
+        for i in rng.permutation(n):
+            lo, hi = indptr[i], indptr[i + 1]
+            if lo == hi:
+                continue
+            cand, inverse = np.unique(labels[indices[lo:hi]], return_inverse=True)
+            score = np.bincount(inverse, weights=weights[lo:hi])
+            best = cand[np.flatnonzero(score == score.max())]
+            if labels[i] not in best:
+                labels[i] = rng.choice(best)
+                changed += 1
+        if not changed:
+            break
+    return _by_size(labels)
+
+
+def _by_size(labels: np.ndarray) -> np.ndarray:
+    """Renumber labels so community 0 is the largest (ties by first member)."""
+    if not len(labels):
+        return labels
+    _, first, inverse, counts = np.unique(labels, return_index=True, return_inverse=True, return_counts=True)
+    order = np.lexsort((first, -counts))
+    rank = np.empty_like(order)
+    rank[order] = np.arange(len(order))
+    return rank[inverse]
+
+
+async def load_projection(driver) -> tuple:
+    """
+    The weighted defendant/theory projection as (nodes, src, dst, weight),
+    nodes being (label, key) pairs.
+    """
+    index: dict = {}
+    src, dst, weight = [], [], []
+    theory_orgs: dict = {}
+    async with driver.session() as session:
+        result = await session.run(PROJECTION_QUERY)
+        async for r in result:
+            a = index.setdefault(("Organization", r["org"]), len(index))
+            b = index.setdefault((r["toLabel"], r["other"]), len(index))
+            src.append(a)
+            dst.append(b)
+            weight.append(float(r["cases"]))
+            if r["toLabel"] == "LegalTheory":
+                theory_orgs[b] = theory_orgs.get(b, 0) + 1
+    weight = np.array(weight)
+    dst = np.array(dst, dtype=np.int64)
+    orgs = sum(1 for label, _ in index if label == "Organization")
+    # idf-style damping: a theory asserted against most defendants says little about clusters
+    idf = {t: np.log1p(orgs / count) for t, count in theory_orgs.items()}
+    weight = weight * np.array([idf.get(int(d), 1.0) for d in dst])
+    return list(index), np.array(src, dtype=np.int64), dst, weight
@@ -0,0 +1,527 @@
+"""
+In-process read replica of the case graph, so the hot analytic reads
+(rankings, cases-by-year, defendant / theory case lists, similar cases,
+waves) never leave the process.
+
+Layout (all NumPy):
+
+    ids        Case / Organization / AISystem / LegalTheory keys interned to
+               dense ints; an index never changes for the life of the replica
+    cases      columnar: caption, status, dateFiled, jurisdictionType, plus
+               derived filing year and datetime64 filing date
+    nodes      per label columns (category, pagerank, betweenness, degree)
+    adjacency  per relationship type, CSR in both directions
+               (case -> targets, target -> cases)
+
+The replica polls the graph version (GraphMeta). When every version since
+its own was logged with the cases it touched (bump_graph_version(case_ids=))
+only those cases' rows and relationships are re-read, plus the small
+Organization / AISystem / LegalTheory tables; otherwise it reloads fully.
+Each refresh builds a new GraphReplica and swaps it in, so a request always
+reads one consistent version.
+
+Enabled with GRAPH_READ_BACKEND=replica; neo4j_service read functions answer
+from it once it has loaded and fall back to Cypher until then. With a
+snapshot directory (app.services.graph_snapshot) the replica starts from the
+snapshot file and catches up from Neo4j. API workers only read snapshots;
+they are written by one process at a time (app.ingest.snapshot: the
+pipeline stage, and the scheduler leader after each ingest job).
+"""
+import asyncio
+import logging
+import time
+from datetime import datetime, UTC
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from app.services.graph_analytics import GraphMatrix
+from app.services.graph_snapshot import load_snapshot, pack_strings, unpack_strings
+
+logger = logging.getLogger(__name__)
+
+CASE_COLUMNS = ["caption", "status", "dateFiled", "jurisdictionType"]
+# label: (key property, {column: property})
+NODE_COLUMNS = {
+    "Organization": ("canonicalName", {"pagerank": "pagerank", "betweenness": "betweenness", "degree": "degree"}),
+    "AISystem": ("name", {"category": "category", "pagerank": "pagerank", "betweenness": "betweenness", "degree": "degree"}),
+    "LegalTheory": ("name", {}),
+}
+REL_TARGETS = {"NAMED_DEFENDANT": "Organization", "INVOLVES_SYSTEM": "AISystem", "ASSERTS_CLAIM": "LegalTheory"}
+SCORE_COLUMNS = ["pagerank", "betweenness", "degree"]
+
+VERSION_QUERY = """
+    OPTIONAL MATCH (m:GraphMeta {name: 'graph'})
+    RETURN coalesce(m.version, 0) AS version,
+           COLLECT { MATCH (g:GraphChange) WHERE g.version > $since RETURN g {.version, .caseIds} } AS changes
+"""
+CASES_QUERY = """
+    MATCH (c:Case) WHERE $ids IS NULL OR c.id IN $ids
+    RETURN c.id AS key, c.caption AS caption, c.status AS status,
+           c.dateFiled AS dateFiled, c.jurisdictionType AS jurisdictionType
+"""
+EDGES_QUERY = """
+    MATCH (c:Case)-[:{rel}]->(n:{label}) WHERE $ids IS NULL OR c.id IN $ids
+    RETURN c.id AS case, n.{key} AS key
+"""
+
+
+class Interned:
+    """Keys interned to dense ints in first-seen order."""
+
+    def __init__(self, keys: list = ()):
+        self.keys = list(keys)
+        self.index = {key: i for i, key in enumerate(self.keys)}
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def intern(self, key) -> int:
+        i = self.index.get(key)
+        if i is None:
+            i = self.index[key] = len(self.keys)
+            self.keys.append(key)
+        return i
+
+    def copy(self) -> "Interned":
+        clone = Interned()
+        clone.keys, clone.index = list(self.keys), dict(self.index)
+        return clone
+
+
+def _csr(n: int, rows: np.ndarray, cols: np.ndarray) -> tuple:
+    """(indptr, indices) with each row's columns sorted."""
+    order = np.lexsort((cols, rows))
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=n), out=indptr[1:])
+    return indptr, cols[order]
+
+
+def _grow(column: np.ndarray, n: int, fill) -> np.ndarray:
+    if len(column) >= n:
+        return column.copy()
+    return np.concatenate([column, np.full(n - len(column), fill, dtype=column.dtype)])
+
+
+class GraphReplica:
+    """One immutable version of the graph; build with GraphReplica.build()."""
+
+    def __init__(self, version: int, source: str = "neo4j"):
+        self.version = version
+        self.source = source
+        self.loaded_at = datetime.now(UTC).isoformat()
+        self.cases = Interned()
+        self.case_alive = np.zeros(0, dtype=bool)
+        self.case_columns: dict = {c: np.empty(0, dtype=object) for c in CASE_COLUMNS}
+        self.nodes = {label: Interned() for label in NODE_COLUMNS}
+        self.node_alive = {label: np.zeros(0, dtype=bool) for label in NODE_COLUMNS}
+        self.node_columns: dict = {label: {} for label in NODE_COLUMNS}
+        self.edges = {rel: (np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)) for rel in REL_TARGETS}
+        self.forward: dict = {}
+        self.reverse: dict = {}
+        self._matrix: Optional[GraphMatrix] = None
+
+    # --- building -----------------------------------------------------------
+
+    @classmethod
+    def build(cls, version: int, case_rows: list, node_rows: dict, edge_rows: dict,
+              base: Optional["GraphReplica"] = None, case_ids: Optional[list] = None) -> "GraphReplica":
+        """
+        A replica from fetched rows. With `base` and `case_ids`, case_rows and
+        edge_rows cover only those cases and everything else is carried over.
+        """
+        replica = cls(version)
+        partial = base is not None and case_ids is not None
+        if partial:
+            replica.cases = base.cases.copy()
+            replica.nodes = {label: interned.copy() for label, interned in base.nodes.items()}
+            replica.case_alive = base.case_alive.copy()
+            columns = base.case_columns
+        else:
+            columns = {c: np.empty(0, dtype=object) for c in CASE_COLUMNS}
+        refreshed = np.array([replica.cases.intern(cid) for cid in case_ids or []], dtype=np.int64)
+        fetched = np.array([replica.cases.intern(row["key"]) for row in case_rows], dtype=np.int64)
+        edge_cases = {
+            rel: np.array([replica.cases.intern(r["case"]) for r in edge_rows[rel]], dtype=np.int64)
+            for rel in REL_TARGETS
+        }
+        n = len(replica.cases)
+        replica.case_alive = _grow(replica.case_alive, n, False)
+        replica.case_alive[refreshed] = False  # requested but not returned: deleted
+        replica.case_alive[fetched] = True
+        for column in CASE_COLUMNS:
+            values = _grow(columns[column], n, None)
+            values[fetched] = [row[column] for row in case_rows] if case_rows else []
+            replica.case_columns[column] = values
+        replica._derive_dates()
+        replica._derive_status()
+
+        for label, (_, props) in NODE_COLUMNS.items():
+            interned = replica.nodes[label]
+            idx = np.array([interned.intern(row["key"]) for row in node_rows[label]], dtype=np.int64)
+            alive = np.zeros(len(interned), dtype=bool)
+            alive[idx] = True
+            replica.node_alive[label] = alive
+            for column in props:
+                numeric = column in SCORE_COLUMNS
+                values = np.full(len(interned), np.nan if numeric else None, dtype=float if numeric else object)
+                values[idx] = [
+                    (np.nan if row[column] is None else row[column]) if numeric else row[column]
+                    for row in node_rows[label]
+                ] if len(idx) else []
+                replica.node_columns[label][column] = values
+
+        for rel, label in REL_TARGETS.items():
+            interned = replica.nodes[label]
+            rows = edge_cases[rel]
+            cols = np.array([interned.intern(r["key"]) for r in edge_rows[rel]], dtype=np.int64)
+            if partial:
+                old_rows, old_cols = base.edges[rel]
+                keep = ~np.isin(old_rows, refreshed)
+                rows, cols = np.concatenate([old_rows[keep], rows]), np.concatenate([old_cols[keep], cols])
+            # MERGE keeps one relationship per pair; collapse duplicates defensively
+            pairs = np.unique(np.stack([rows, cols], axis=1), axis=0) if len(rows) else np.empty((0, 2), dtype=np.int64)
+            rows, cols = pairs[:, 0], pairs[:, 1]
+            replica.edges[rel] = (rows, cols)
+            replica.forward[rel] = _csr(len(replica.cases), rows, cols)
+            replica.reverse[rel] = _csr(len(interned), cols, rows)
+        # Relationship targets first seen in edges widen their label's columns
+        for label in NODE_COLUMNS:
+            n_label = len(replica.nodes[label])
+            replica.node_alive[label] = _grow(replica.node_alive[label], n_label, False)
+            for column, values in replica.node_columns[label].items():
+                replica.node_columns[label][column] = _grow(values, n_label, np.nan if values.dtype == float else None)
+        return replica
+
+    def _derive_dates(self):
+        dates = pd.Series(self.case_columns["dateFiled"], dtype=object)
+        text = dates.where(dates.map(lambda v: isinstance(v, str) and v != ""), None)
+        self.case_year = pd.to_numeric(text.str[:4], errors="coerce").fillna(0).to_numpy(dtype=np.int16)
+        self.case_filed = pd.to_datetime(text, errors="coerce", format="ISO8601").to_numpy(dtype="datetime64[D]")
+
+    def _derive_status(self):
+        self.case_active = self.case_columns["status"] == "Active"
+        self.case_inactive = self.case_columns["status"] == "Inactive"
+
+    # --- reads (same shapes as the Cypher in neo4j_service) ------------------
+
+    def _targets(self, rel: str, case: int) -> np.ndarray:
+        indptr, indices = self.forward[rel]
+        return indices[indptr[case]:indptr[case + 1]]
+
+    def _cases_of(self, rel: str, target: int) -> np.ndarray:
+        indptr, indices = self.reverse[rel]
+        return indices[indptr[target]:indptr[target + 1]]
+
+    def _case_counts(self, rel: str) -> np.ndarray:
+        return np.diff(self.reverse[rel][0])
+
+    def _case_row(self, case: int, *columns) -> dict:
+        row = {"id": self.cases.keys[case]}
+        for column in columns:
+            row[column] = self.case_columns[column][case]
+        return row
+
+    def top_defendants(self, limit: int = 20, rank_by: str = "caseCount") -> list:
+        counts = self._case_counts("NAMED_DEFENDANT")
+        rows, cols = self.edges["NAMED_DEFENDANT"]
+        active = np.bincount(cols, weights=self.case_active[rows], minlength=len(counts)).astype(int)
+        inactive = np.bincount(cols, weights=self.case_inactive[rows], minlength=len(counts)).astype(int)
+        names = self.nodes["Organization"].keys
+        if rank_by in SCORE_COLUMNS:
+            score = self.node_columns["Organization"][rank_by]
+            candidates = np.flatnonzero(~np.isnan(score) & self.node_alive["Organization"])
+            top = candidates[np.argsort(-score[candidates], kind="stable")][:limit]
+            top = top[counts[top] > 0]
+        else:
+            candidates = np.flatnonzero(counts > 0)
+            top = candidates[np.lexsort((np.array([names[i] for i in candidates], dtype=str), -counts[candidates]))][:limit]
+        out = []
+        for i in top:
+            row = {"canonicalName": names[i], "caseCount": int(counts[i]),
+                   "activeCount": int(active[i]), "inactiveCount": int(inactive[i])}
+            if rank_by in SCORE_COLUMNS:
+                row["score"] = _score(self.node_columns["Organization"][rank_by][i], rank_by)
+            out.append(row)
+        return out
+
+    def top_ai_systems(self, limit: int = 15, rank_by: str = "caseCount") -> list:
+        counts = self._case_counts("INVOLVES_SYSTEM")
+        names = self.nodes["AISystem"].keys
+        category = self.node_columns["AISystem"]["category"]
+        if rank_by in SCORE_COLUMNS:
+            score = self.node_columns["AISystem"][rank_by]
+            candidates = np.flatnonzero(~np.isnan(score) & self.node_alive["AISystem"])
+            top = candidates[np.argsort(-score[candidates], kind="stable")][:limit]
+        else:
+            candidates = np.flatnonzero(counts > 0)
+            top = candidates[np.lexsort((np.array([names[i] for i in candidates], dtype=str), -counts[candidates]))][:limit]
+        out = []
+        for i in top:
+            row = {"name": names[i], "category": category[i], "caseCount": int(counts[i])}
+            if rank_by in SCORE_COLUMNS:
+                row["score"] = _score(self.node_columns["AISystem"][rank_by][i], rank_by)
+            out.append(row)
+        return out
+
+    def cases_by_year(self) -> list:
+        years = self.case_year[self.case_alive]
+        values, counts = np.unique(years[years >= 2016], return_counts=True)
+        return [{"year": str(y), "count": int(c)} for y, c in zip(values.tolist(), counts.tolist())]
+
+    def defendant_cases(self, org_name: str) -> list:
+        org = self.nodes["Organization"].index.get(org_name)
+        if org is None:
+            return []
+        theories, systems = self.nodes["LegalTheory"].keys, self.nodes["AISystem"].keys
+        out = []
+        for case in self._cases_of("NAMED_DEFENDANT", org):
+            row = self._case_row(case, "caption", "status", "dateFiled", "jurisdictionType")
+            row["theories"] = [theories[t] for t in self._targets("ASSERTS_CLAIM", case)]
+            row["aiSystems"] = [systems[s] for s in self._targets("INVOLVES_SYSTEM", case)]
+            out.append(row)
+        return out
+
+    def cases_by_theory(self, theory_name: str) -> list:
+        theory = self.nodes["LegalTheory"].index.get(theory_name)
+        if theory is None:
+            return []
+        return [
+            self._case_row(case, "caption", "status", "dateFiled", "jurisdictionType")
+            for case in self._cases_of("ASSERTS_CLAIM", theory)
+        ]
+
+    def similar_cases(self, case_id: str, limit: int = 10) -> list:
+        target = self.cases.index.get(case_id)
+        if target is None or not self.case_alive[target]:
+            return []
+        n = len(self.cases)
+
+        def shared(rel: str) -> np.ndarray:
+            indptr, indices = self.reverse[rel]
+            targets = self._targets(rel, target)
+            others = np.concatenate([indices[indptr[t]:indptr[t + 1]] for t in targets]) if len(targets) else []
+            return np.bincount(np.asarray(others, dtype=np.int64), minlength=n)
+
+        orgs = shared("NAMED_DEFENDANT")
+        total = orgs + shared("ASSERTS_CLAIM")
+        total[orgs == 0] = 0  # only cases sharing a defendant qualify
+        total[target] = 0
+        candidates = np.flatnonzero(total >= 2)
+        top = candidates[np.argsort(-total[candidates], kind="stable")][:limit]
+        return [
+            {**self._case_row(case, "caption", "status"), "totalOverlap": int(total[case])}
+            for case in top
+        ]
+
+    def waves(self, window_days: int = 60, threshold: int = 3) -> list:
+        since = np.datetime64("today", "D") - np.timedelta64(window_days, "D")
+        recent = self.case_alive & (self.case_filed >= since)
+        rows, cols = self.edges["NAMED_DEFENDANT"]
+        counts = np.bincount(cols[recent[rows]], minlength=len(self.nodes["Organization"]))
+        theories = self.nodes["LegalTheory"].keys
+        jurisdiction = self.case_columns["jurisdictionType"]
+        out = []
+        for org in np.flatnonzero(counts >= threshold)[np.argsort(-counts[counts >= threshold], kind="stable")]:
+            cases = self._cases_of("NAMED_DEFENDANT", org)
+            cases = cases[recent[cases]]
+            out.append({
+                "defendant": self.nodes["Organization"].keys[org],
+                "caseCount": int(counts[org]),
+                "theories": list(dict.fromkeys(theories[t] for c in cases for t in self._targets("ASSERTS_CLAIM", c))),
+                "jurisdictions": list(dict.fromkeys(jurisdiction[c] for c in cases if jurisdiction[c] is not None)),
+            })
+        return out
+
+    def graph_matrix(self) -> GraphMatrix:
+        """
+        The case relationships as the undirected GraphMatrix of
+        app.services.graph_analytics (nodes with at least one edge), built
+        once per replica for the path finder.
+        """
+        if self._matrix is None:
+            nodes = [("Case", key) for key in self.cases.keys]
+            offsets = {}
+            for label in NODE_COLUMNS:
+                offsets[label] = len(nodes)
+                nodes += [(label, key) for key in self.nodes[label].keys]
+            src = np.concatenate([self.edges[rel][0] for rel in REL_TARGETS])
+            dst = np.concatenate([self.edges[rel][1] + offsets[label] for rel, label in REL_TARGETS.items()])
+            used = np.unique(np.concatenate([src, dst]))
+            remap = np.full(len(nodes), -1, dtype=np.int64)
+            remap[used] = np.arange(len(used))
+            self._matrix = GraphMatrix([nodes[i] for i in used.tolist()], remap[src], remap[dst])
+        return self._matrix
+
+    def stats(self) -> dict:
+        return {
+            "version": self.version,
+            "source": self.source,
+            "loadedAt": self.loaded_at,
+            "cases": int(self.case_alive.sum()),
+            "relationships": sum(len(rows) for rows, _ in self.edges.values()),
+        }
+
+
+def replica_to_arrays(replica: GraphReplica) -> dict:
+    """Flat {name: ndarray} for graph_snapshot.save_snapshot (strings packed, no object arrays)."""
+    arrays = {"cases.alive": replica.case_alive, "cases.year": replica.case_year, "cases.filed": replica.case_filed}
+
+    def strings(name: str, values):
+        for part, array in pack_strings(values).items():
+            arrays[f"{name}.{part}"] = array
+
+    strings("cases.keys", replica.cases.keys)
+    for column in CASE_COLUMNS:
+        strings(f"cases.{column}", replica.case_columns[column])
+    for label in NODE_COLUMNS:
+        strings(f"{label}.keys", replica.nodes[label].keys)
+        arrays[f"{label}.alive"] = replica.node_alive[label]
+        for column, values in replica.node_columns[label].items():
+            if values.dtype == object:
+                strings(f"{label}.{column}", values)
+            else:
+                arrays[f"{label}.{column}"] = values
+    for rel in REL_TARGETS:
+        arrays[f"{rel}.rows"], arrays[f"{rel}.cols"] = replica.edges[rel]
+        arrays[f"{rel}.forward.indptr"], arrays[f"{rel}.forward.indices"] = replica.forward[rel]
+        arrays[f"{rel}.reverse.indptr"], arrays[f"{rel}.reverse.indices"] = replica.reverse[rel]
+    return arrays
+
+
+def replica_from_arrays(version: int, arrays: dict) -> GraphReplica:
+    """Inverse of replica_to_arrays; numeric arrays are used as given (memory-mapped from a snapshot)."""
+    replica = GraphReplica(version, source="snapshot")
+
+    def strings(name: str) -> np.ndarray:
+        return unpack_strings(arrays[f"{name}.data"], arrays[f"{name}.offsets"], arrays[f"{name}.null"])
+
+    replica.cases = Interned(strings("cases.keys").tolist())
+    replica.case_alive = arrays["cases.alive"]
+    replica.case_year, replica.case_filed = arrays["cases.year"], arrays["cases.filed"]
+    replica.case_columns = {column: strings(f"cases.{column}") for column in CASE_COLUMNS}
+    replica._derive_status()
+    for label, (_, props) in NODE_COLUMNS.items():
+        replica.nodes[label] = Interned(strings(f"{label}.keys").tolist())
+        replica.node_alive[label] = arrays[f"{label}.alive"]
+        replica.node_columns[label] = {
+            column: arrays[f"{label}.{column}"] if f"{label}.{column}" in arrays else strings(f"{label}.{column}")
+            for column in props
+        }
+    for rel in REL_TARGETS:
+        replica.edges[rel] = (arrays[f"{rel}.rows"], arrays[f"{rel}.cols"])
+        replica.forward[rel] = (arrays[f"{rel}.forward.indptr"], arrays[f"{rel}.forward.indices"])
+        replica.reverse[rel] = (arrays[f"{rel}.reverse.indptr"], arrays[f"{rel}.reverse.indices"])
+    return replica
+
+
+def _score(value: float, column: str):
+    return int(value) if column == "degree" else float(value)
+
+
+async def fetch_rows(driver, case_ids: Optional[list] = None) -> tuple:
+    """(case_rows, node_rows, edge_rows) for GraphReplica.build; case_ids None reads every case."""
+    async with driver.session() as session:
+        result = await session.run(CASES_QUERY, ids=case_ids)
+        case_rows = [dict(r) async for r in result]
+        node_rows = {}
+        for label, (key, props) in NODE_COLUMNS.items():
+            fields = ", ".join([f"n.{key} AS key"] + [f"n.{p} AS {c}" for c, p in props.items()])
+            result = await session.run(f"MATCH (n:{label}) RETURN {fields}")
+            node_rows[label] = [dict(r) async for r in result if r["key"] is not None]
+        edge_rows = {}
+        for rel, label in REL_TARGETS.items():
+            query = EDGES_QUERY.format(rel=rel, label=label, key=NODE_COLUMNS[label][0])
+            result = await session.run(query, ids=case_ids)
+            edge_rows[rel] = [dict(r) async for r in result if r["key"] is not None]
+    return case_rows, node_rows, edge_rows
+
+
+class ReplicaManager:
+    """Holds the current GraphReplica and keeps it at the graph's version."""
+
+    def __init__(self):
+        self.enabled = False
+        self.current: Optional[GraphReplica] = None
+        self._task: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+
+    def serving(self) -> Optional[GraphReplica]:
+        """The replica to answer reads from, or None to use Neo4j."""
+        return self.current if self.enabled else None
+
+    async def refresh(self, driver) -> bool:
+        """Bring the replica to the graph's version; True if anything was re-read."""
+        async with self._lock:
+            base = self.current
+            since = base.version if base else 0
+            async with driver.session() as session:
+                result = await session.run(VERSION_QUERY, since=since)
+                record = await result.single()
+            version, changes = record["version"], record["changes"]
+            if base is not None and version == base.version:
+                return False
+            logged = {c["version"] for c in changes if c["version"] <= version}
+            incremental = (
+                base is not None and version > base.version
+                and len(logged) == version - base.version
+                and all(c["caseIds"] is not None for c in changes)
+            )
+            case_ids = sorted({cid for c in changes for cid in c["caseIds"]}) if incremental else None
+            start = time.perf_counter()
+            rows = await fetch_rows(driver, case_ids)
+            self.current = GraphReplica.build(version, *rows, base=base if incremental else None, case_ids=case_ids)
+            logger.info(
+                f"Graph replica at version {version} ({'incremental, %d cases' % len(case_ids) if incremental else 'full'}) "
+                f"in {time.perf_counter() - start:.2f}s"
+            )
+            return True
+
+    async def start(self, driver, interval: float = 30.0, snapshot_dir: Optional[str] = None):
+        """
+        Load now and poll the graph version every interval seconds. With a
+        snapshot_dir, start from the snapshot there (serving it even if Neo4j
+        is down) and catch up from Neo4j if it is stale; the snapshot itself
+        is left to its writer. Without any replica, reads stay on Neo4j.
+        """
+        self.enabled = True
+        if snapshot_dir:
+            start = time.perf_counter()
+            loaded = load_snapshot(snapshot_dir)
+            if loaded:
+                manifest, arrays = loaded
+                self.current = replica_from_arrays(manifest["graphVersion"], arrays)
+                logger.info(f"Graph replica loaded from snapshot (version {manifest['graphVersion']}) "
+                            f"in {(time.perf_counter() - start) * 1000:.0f}ms")
+        try:
+            await self.refresh(driver)
+        except Exception as e:
+            if self.current:
+                logger.warning(f"Neo4j unreachable; serving snapshot version {self.current.version}: {e}")
+            else:
+                logger.warning(f"Graph replica load failed, reads stay on Neo4j until it succeeds: {e}")
+        self._task = asyncio.create_task(self._poll(driver, interval))
+
+    async def _poll(self, driver, interval: float):
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.refresh(driver)
+            except Exception as e:
+                logger.warning(f"Graph replica refresh failed (serving version "
+                               f"{self.current.version if self.current else None}): {e}")
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            self._task = None
+        self.enabled = False
+
+    def status(self) -> dict:
+        if not self.enabled:
+            return {"enabled": False}
+        return {"enabled": True, **(self.current.stats() if self.current else {"version": None})}
+
+
+replica_manager = ReplicaManager()
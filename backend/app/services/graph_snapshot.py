@@ -0,0 +1,155 @@
+"""
+Binary snapshot files for the in-process graph replica, so a fresh API
+process can serve reads before (or without) a warm Neo4j.
+
+    data/graph_snapshot/
+        manifest.json        {format, graphVersion, createdAt, dir,
+                              arrays: {name: {file, dtype, shape, size, sha256}}}
+        v<version>-<id>/     one .npy file per array
+
+Every array is a plain .npy (no pickles) and is loaded with mmap_mode="r",
+so numeric columns and CSR adjacency are paged in on demand. Strings are
+stored as NUL-terminated UTF-8 bytes plus int64 offsets and a null mask
+(pack_strings).
+
+The manifest is replaced atomically after all arrays are written, so a
+reader sees either the previous snapshot or the new one; array directories
+the manifest no longer points to are removed afterwards. Only one process
+writes (app.ingest.snapshot); API workers only load.
+
+Loads check the format and each file's size, dtype and shape, and return
+None on any mismatch. SHA-256 is checked only with verify=True, since
+hashing reads every byte and would defeat the memory-mapped cold start.
+"""
+import hashlib
+import json
+import logging
+import os
+import shutil
+import uuid
+from datetime import datetime, UTC
+from typing import Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_FORMAT = 1
+MANIFEST = "manifest.json"
+# services/ -> up 3 -> dail-knowledge-graph/data/
+DEFAULT_SNAPSHOT_DIR = os.path.normpath(
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "data", "graph_snapshot")
+)
+
+
+def pack_strings(values) -> dict:
+    """
+    {"data": uint8, "offsets": int64 (n + 1), "null": bool} for a sequence of
+    str / None. Each string is UTF-8 followed by a NUL byte; offsets[i] is
+    where string i starts.
+    """
+    encoded = [(b"" if v is None else str(v).encode("utf-8")) + b"\0" for v in values]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(b) for b in encoded], out=offsets[1:])
+    return {
+        "data": np.frombuffer(b"".join(encoded), dtype=np.uint8),
+        "offsets": offsets,
+        "null": np.array([v is None for v in values], dtype=bool),
+    }
+
+
+def unpack_strings(data: np.ndarray, offsets: np.ndarray, null: np.ndarray) -> np.ndarray:
+    buf = data.tobytes()
+    parts = buf.decode("utf-8").split("\0")[:-1]
+    if len(parts) != len(null):  # a value contained NUL: slice by offsets instead
+        bounds = offsets.tolist()
+        parts = [buf[a:b - 1].decode("utf-8") for a, b in zip(bounds, bounds[1:])]
+    out = np.empty(len(null), dtype=object)
+    out[:] = parts
+    out[null] = None
+    return out
+
+
+def _sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def read_manifest(snapshot_dir: str = DEFAULT_SNAPSHOT_DIR) -> Optional[dict]:
+    try:
+        with open(os.path.join(snapshot_dir, MANIFEST)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def save_snapshot(arrays: dict, graph_version: int, snapshot_dir: str = DEFAULT_SNAPSHOT_DIR) -> dict:
+    """Write {name: ndarray} as a new snapshot of graph_version; returns the manifest."""
+    os.makedirs(snapshot_dir, exist_ok=True)
+    stamp = f"v{graph_version}-{uuid.uuid4().hex[:8]}"
+    target = os.path.join(snapshot_dir, stamp)
+    os.makedirs(target)
+    entries = {}
+    for name, array in arrays.items():
+        file = f"{name}.npy"
+        path = os.path.join(target, file)
+        array = np.ascontiguousarray(array)
+        np.save(path, array, allow_pickle=False)
+        entries[name] = {
+            "file": file, "dtype": str(array.dtype), "shape": list(array.shape),
+            "size": os.path.getsize(path), "sha256": _sha256(path),
+        }
+    manifest = {
+        "format": SNAPSHOT_FORMAT,
+        "graphVersion": graph_version,
+        "createdAt": datetime.now(UTC).isoformat(),
+        "dir": stamp,
+        "arrays": entries,
+    }
+    tmp = os.path.join(snapshot_dir, f".{MANIFEST}.{stamp}")
+    with open(tmp, "w") as f:
+        json.dump(manifest, f, indent=1)
+    os.replace(tmp, os.path.join(snapshot_dir, MANIFEST))
+    # Keep whatever the manifest points at now, even if another writer swapped in after us
+    current = (read_manifest(snapshot_dir) or {}).get("dir")
+    for entry in os.listdir(snapshot_dir):
+        if entry != current and entry.startswith("v") and os.path.isdir(os.path.join(snapshot_dir, entry)):
+            shutil.rmtree(os.path.join(snapshot_dir, entry), ignore_errors=True)
+    return manifest
+
+
+def load_snapshot(snapshot_dir: str = DEFAULT_SNAPSHOT_DIR, verify: bool = False) -> Optional[tuple]:
+    """
+    (manifest, {name: read-only memory-mapped ndarray}), or None if missing or
+    invalid. Sizes, dtypes and shapes are always checked; verify=True also
+    hashes every file, which reads the whole snapshot (app.ingest.snapshot --verify).
+    """
+    manifest = read_manifest(snapshot_dir)
+    if manifest is None:
+        return None
+    if manifest.get("format") != SNAPSHOT_FORMAT:
+        logger.warning(f"Graph snapshot format {manifest.get('format')} is not {SNAPSHOT_FORMAT}; ignoring it")
+        return None
+    arrays = {}
+    try:
+        for name, entry in manifest["arrays"].items():
+            path = os.path.join(snapshot_dir, manifest["dir"], entry["file"])
+            if os.path.getsize(path) != entry["size"]:
+                logger.warning(f"Graph snapshot file for {name} has the wrong size; ignoring snapshot")
+                return None
+            if verify and _sha256(path) != entry["sha256"]:
+                logger.warning(f"Graph snapshot checksum mismatch for {name}; ignoring snapshot")
+                return None
+            # Zero-length files cannot be memory-mapped
+            array = np.load(path, mmap_mode="r" if np.prod(entry["shape"]) else None, allow_pickle=False)
+            if str(array.dtype) != entry["dtype"] or list(array.shape) != entry["shape"]:
+                logger.warning(f"Graph snapshot array {name} does not match its manifest; ignoring snapshot")
+                return None
+            arrays[name] = array
+    except (OSError, ValueError, KeyError) as e:
+        logger.warning(f"Graph snapshot unreadable, ignoring it: {e}")
+        return None
+    return manifest, arrays
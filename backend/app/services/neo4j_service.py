@@ -1,13 +1,39 @@
 from neo4j import AsyncGraphDatabase, AsyncDriver
+from neo4j.exceptions import ServiceUnavailable, SessionExpired
 from typing import Optional
+import functools
 import logging
 import json
+import uuid
+
+from app.services.graph_replica import replica_manager
+from app.services.sqlite_store import read_store
 
 logger = logging.getLogger(__name__)
 
 _driver: Optional[AsyncDriver] = None
 
 
+def sqlite_fallback(fn):
+    """
+    Answer from the SQLite read store (app.services.sqlite_store) when it is the
+    configured read backend, or when Neo4j is unreachable and an export exists.
+    The store has a method of the same name taking the same arguments minus the driver.
+    """
+    @functools.wraps(fn)
+    async def read(driver: AsyncDriver, *args, **kwargs):
+        if store := read_store.serving():
+            return getattr(store, fn.__name__)(*args, **kwargs)
+        try:
+            return await fn(driver, *args, **kwargs)
+        except (ServiceUnavailable, SessionExpired) as e:
+            if not (store := read_store.fallback()):
+                raise
+            logger.warning(f"Neo4j unavailable, {fn.__name__} served from {store.path}: {e}")
+            return getattr(store, fn.__name__)(*args, **kwargs)
+    return read
+
+
 async def get_driver(uri: str, user: str, password: str) -> AsyncDriver:
     global _driver
     if _driver is None:
@@ -36,6 +62,22 @@ async def init_schema(driver: AsyncDriver):
         "CREATE INDEX case_source IF NOT EXISTS FOR (c:Case) ON (c.source)",
         "CREATE INDEX org_name IF NOT EXISTS FOR (o:Organization) ON (o.name)",
         "CREATE CONSTRAINT secondary_source_link IF NOT EXISTS FOR (s:SecondarySource) REQUIRE s.link IS UNIQUE",
+        "CREATE CONSTRAINT scheduler_lease_name IF NOT EXISTS FOR (l:SchedulerLease) REQUIRE l.name IS UNIQUE",
+        "CREATE CONSTRAINT graph_meta_name IF NOT EXISTS FOR (m:GraphMeta) REQUIRE m.name IS UNIQUE",
+        "CREATE CONSTRAINT docket_id IF NOT EXISTS FOR (d:Docket) REQUIRE d.id IS UNIQUE",
+        "CREATE CONSTRAINT document_id IF NOT EXISTS FOR (d:Document) REQUIRE d.id IS UNIQUE",
+        "CREATE INDEX secondary_source_row IF NOT EXISTS FOR ()-[r:HAS_SECONDARY_SOURCE]-() ON (r.sourceId)",
+        "CREATE INDEX co_defendant_shared IF NOT EXISTS FOR ()-[r:CO_DEFENDANT]-() ON (r.sharedCases)",
+        "CREATE INDEX org_pagerank IF NOT EXISTS FOR (o:Organization) ON (o.pagerank)",
+        "CREATE INDEX org_betweenness IF NOT EXISTS FOR (o:Organization) ON (o.betweenness)",
+        "CREATE INDEX org_degree IF NOT EXISTS FOR (o:Organization) ON (o.degree)",
+        "CREATE INDEX ai_system_pagerank IF NOT EXISTS FOR (s:AISystem) ON (s.pagerank)",
+        "CREATE INDEX ai_system_betweenness IF NOT EXISTS FOR (s:AISystem) ON (s.betweenness)",
+        "CREATE INDEX ai_system_degree IF NOT EXISTS FOR (s:AISystem) ON (s.degree)",
+        "CREATE INDEX graph_change_version IF NOT EXISTS FOR (g:GraphChange) ON (g.version)",
+        "CREATE CONSTRAINT community_id IF NOT EXISTS FOR (m:Community) REQUIRE m.id IS UNIQUE",
+        "CREATE INDEX org_community IF NOT EXISTS FOR (o:Organization) ON (o.communityId)",
+        "CREATE INDEX theory_community IF NOT EXISTS FOR (t:LegalTheory) ON (t.communityId)",
     ]
     async with driver.session() as session:
         for stmt in constraints:
@@ -47,6 +89,43 @@ async def init_schema(driver: AsyncDriver):
     logger.info("Neo4j schema initialization complete.")
 
 
+async def get_graph_version(driver: AsyncDriver) -> int:
+    """Monotonic counter bumped by every writer; 0 before the first bump."""
+    async with driver.session() as session:
+        result = await session.run("MATCH (m:GraphMeta {name: 'graph'}) RETURN m.version AS version")
+        record = await result.single()
+        return record["version"] if record and record["version"] is not None else 0
+
+
+# GraphChange nodes log which cases each version touched, for incremental
+# consumers (the in-process replica); only the most recent are kept
+GRAPH_CHANGE_LOG = 200
+GRAPH_CHANGE_MAX_CASES = 10000
+
+
+async def bump_graph_version(driver: AsyncDriver, case_ids: Optional[list] = None) -> int:
+    """
+    Record that the graph changed, so version-gated consumers (exports, caches) refresh.
+    case_ids lists the cases whose properties or Case relationships changed ([] for
+    none); leave it None when unknown, and consumers re-read everything.
+    """
+    if case_ids is not None and len(case_ids) > GRAPH_CHANGE_MAX_CASES:
+        case_ids = None
+    async with driver.session() as session:
+        result = await session.run("""
+            MERGE (m:GraphMeta {name: 'graph'})
+            SET m.version = coalesce(m.version, 0) + 1, m.updatedAt = datetime()
+            WITH m
+            FOREACH (ids IN CASE WHEN $caseIds IS NULL THEN [] ELSE [$caseIds] END |
+                CREATE (:GraphChange {version: m.version, caseIds: ids, at: datetime()}))
+            WITH m
+            CALL { WITH m MATCH (g:GraphChange) WHERE g.version <= m.version - $keep DELETE g }
+            RETURN m.version AS version
+        """, caseIds=case_ids, keep=GRAPH_CHANGE_LOG)
+        record = await result.single()
+        return record["version"]
+
+
 async def get_graph_overview(driver: AsyncDriver) -> dict:
     async with driver.session() as session:
         result = await session.run("""
@@ -71,9 +150,29 @@ async def get_graph_overview(driver: AsyncDriver) -> dict:
         return {"cases": 0, "organizations": 0, "aiSystems": 0, "legalTheories": 0, "courts": 0, "relationships": 0}
 
 
-async def get_top_defendants(driver: AsyncDriver, limit: int = 20) -> list:
-    async with driver.session() as session:
-        result = await session.run("""
+# Stored centrality scores (app.ingest.analytics) the rankings can order by
+RANK_SCORES = ["pagerank", "betweenness", "degree"]
+
+
+@sqlite_fallback
+async def get_top_defendants(driver: AsyncDriver, limit: int = 20, rank_by: str = "caseCount") -> list:
+    if replica := replica_manager.serving():
+        return replica.top_defendants(limit, rank_by)
+    if rank_by in RANK_SCORES:
+        # Index-backed: take the top nodes by score first, then count only their cases
+        query = f"""
+            MATCH (o:Organization) WHERE o.{rank_by} IS NOT NULL
+            WITH o ORDER BY o.{rank_by} DESC LIMIT $limit
+            MATCH (o)<-[:NAMED_DEFENDANT]-(c:Case)
+            WITH o, count(c) AS total,
+                 sum(CASE WHEN c.status = 'Active' THEN 1 ELSE 0 END) AS active,
+                 sum(CASE WHEN c.status = 'Inactive' THEN 1 ELSE 0 END) AS inactive
+            ORDER BY o.{rank_by} DESC
+            RETURN o.canonicalName AS canonicalName, total AS caseCount,
+                   active AS activeCount, inactive AS inactiveCount, o.{rank_by} AS score
+        """
+    else:
+        query = """
             MATCH (o:Organization)<-[:NAMED_DEFENDANT]-(c:Case)
             WITH o, count(c) AS total,
                  sum(CASE WHEN c.status = 'Active' THEN 1 ELSE 0 END) AS active,
@@ -81,11 +180,16 @@ async def get_top_defendants(driver: AsyncDriver, limit: int = 20) -> list:
             ORDER BY total DESC LIMIT $limit
             RETURN o.canonicalName AS canonicalName, total AS caseCount,
                    active AS activeCount, inactive AS inactiveCount
-        """, limit=limit)
+        """
+    async with driver.session() as session:
+        result = await session.run(query, limit=limit)
         return [dict(r) async for r in result]
 
 
+@sqlite_fallback
 async def get_cases_by_year(driver: AsyncDriver) -> list:
+    if replica := replica_manager.serving():
+        return replica.cases_by_year()
     async with driver.session() as session:
         result = await session.run("""
             MATCH (c:Case)
@@ -114,32 +218,159 @@ async def search_organizations(driver: AsyncDriver, query: str, limit: int = 20)
         return [dict(r) async for r in result]
 
 
+# One row per case; theories and systems come from independent COLLECT subqueries
+# so their counts multiply nothing
+DEFENDANT_CASES_QUERY = """
+    MATCH (o:Organization {canonicalName: $name})<-[:NAMED_DEFENDANT]-(c:Case)
+    WITH DISTINCT c
+    RETURN c.id AS id, c.caption AS caption, c.status AS status,
+           c.dateFiled AS dateFiled, c.jurisdictionType AS jurisdictionType,
+           COLLECT { MATCH (c)-[:ASSERTS_CLAIM]->(t:LegalTheory) RETURN DISTINCT t.name } AS theories,
+           COLLECT { MATCH (c)-[:INVOLVES_SYSTEM]->(s:AISystem) RETURN DISTINCT s.name } AS aiSystems
+"""
+
+
+@sqlite_fallback
 async def get_defendant_cases(driver: AsyncDriver, org_name: str) -> list:
+    if replica := replica_manager.serving():
+        return replica.defendant_cases(org_name)
+    async with driver.session() as session:
+        result = await session.run(DEFENDANT_CASES_QUERY, name=org_name)
+        return [dict(r) async for r in result]
+
+
+# CO_DEFENDANT is a maintained projection of Organization<-Case->Organization:
+# one edge per pair, directed from the lower to the higher canonicalName. Every
+# pair of the selected organizations is recomputed and stamped with a build id;
+# their edges left with an older stamp no longer share a case and are removed.
+# $caseIds = null selects every organization (full rebuild).
+CO_DEFENDANT_UPSERT = """
+    MATCH (a:Organization)
+    WHERE $caseIds IS NULL
+       OR EXISTS { MATCH (a)<-[:NAMED_DEFENDANT]-(c:Case) WHERE c.id IN $caseIds }
+    CALL {
+        WITH a
+        MATCH (a)<-[:NAMED_DEFENDANT]-(c:Case)-[:NAMED_DEFENDANT]->(b:Organization)
+        WHERE b <> a AND ($caseIds IS NOT NULL OR a.canonicalName < b.canonicalName)
+        WITH a, b, count(DISTINCT c) AS shared,
+             min(c.dateFiled) AS firstFiled, max(c.dateFiled) AS lastFiled
+        WITH CASE WHEN a.canonicalName < b.canonicalName THEN [a, b] ELSE [b, a] END AS pair,
+             shared, firstFiled, lastFiled
+        WITH pair[0] AS lo, pair[1] AS hi, shared, firstFiled, lastFiled
+        MERGE (lo)-[r:CO_DEFENDANT]->(hi)
+        SET r.sharedCases = shared, r.firstFiled = firstFiled, r.lastFiled = lastFiled,
+            r.buildId = $buildId
+    } IN TRANSACTIONS OF $batch ROWS
+"""
+CO_DEFENDANT_PRUNE = """
+    MATCH (a:Organization)-[r:CO_DEFENDANT]-()
+    WHERE coalesce(r.buildId, '') <> $buildId
+      AND ($caseIds IS NULL
+           OR EXISTS { MATCH (a)<-[:NAMED_DEFENDANT]-(c:Case) WHERE c.id IN $caseIds })
+    WITH DISTINCT r
+    CALL { WITH r DELETE r } IN TRANSACTIONS OF $batch ROWS
+"""
+
+
+async def refresh_co_defendants(driver: AsyncDriver, case_ids: Optional[list] = None, batch: int = 500) -> dict:
+    """
+    Recompute CO_DEFENDANT edges for the organizations named in `case_ids`,
+    or for every organization when case_ids is None.
+    """
+    if case_ids is not None and not case_ids:
+        return {"created": 0, "deleted": 0}
+    build_id = str(uuid.uuid4())
+    params = {"caseIds": case_ids, "buildId": build_id, "batch": batch}
+    async with driver.session() as session:
+        result = await session.run(CO_DEFENDANT_UPSERT, **params)
+        created = (await result.consume()).counters.relationships_created
+        result = await session.run(CO_DEFENDANT_PRUNE, **params)
+        deleted = (await result.consume()).counters.relationships_deleted
+    return {"created": created, "deleted": deleted}
+
+
+async def get_co_defendants(driver: AsyncDriver, org_name: str, limit: int = 20) -> list:
     async with driver.session() as session:
         result = await session.run("""
-            MATCH (o:Organization {canonicalName: $name})<-[:NAMED_DEFENDANT]-(c:Case)
-            OPTIONAL MATCH (c)-[:ASSERTS_CLAIM]->(t:LegalTheory)
-            OPTIONAL MATCH (c)-[:INVOLVES_SYSTEM]->(s:AISystem)
-            RETURN c.id AS id, c.caption AS caption, c.status AS status,
-                   c.dateFiled AS dateFiled, c.jurisdictionType AS jurisdictionType,
-                   collect(DISTINCT t.name) AS theories,
-                   collect(DISTINCT s.name) AS aiSystems
-        """, name=org_name)
+            MATCH (o:Organization {canonicalName: $name})-[r:CO_DEFENDANT]-(other:Organization)
+            RETURN other.canonicalName AS canonicalName, r.sharedCases AS sharedCases,
+                   r.firstFiled AS firstFiled, r.lastFiled AS lastFiled
+            ORDER BY sharedCases DESC, canonicalName LIMIT $limit
+        """, name=org_name, limit=limit)
         return [dict(r) async for r in result]
 
 
-async def get_top_ai_systems(driver: AsyncDriver, limit: int = 15) -> list:
+async def get_top_co_defendant_pairs(driver: AsyncDriver, min_shared: int = 2, limit: int = 50) -> list:
     async with driver.session() as session:
         result = await session.run("""
+            MATCH (a:Organization)-[r:CO_DEFENDANT]->(b:Organization)
+            WHERE r.sharedCases >= $minShared
+            RETURN a.canonicalName AS organization, b.canonicalName AS coDefendant,
+                   r.sharedCases AS sharedCases, r.firstFiled AS firstFiled, r.lastFiled AS lastFiled
+            ORDER BY sharedCases DESC LIMIT $limit
+        """, minShared=min_shared, limit=limit)
+        return [dict(r) async for r in result]
+
+
+async def get_communities(driver: AsyncDriver, limit: int = 50, min_size: int = 2) -> list:
+    """Community summaries written by app.ingest.communities, largest first."""
+    async with driver.session() as session:
+        result = await session.run("""
+            MATCH (m:Community) WHERE m.size >= $minSize
+            RETURN m {.id, .size, .organizationCount, .theoryCount,
+                      .topOrganizations, .topTheories, .method, .runAt} AS community
+            ORDER BY m.size DESC, m.id LIMIT $limit
+        """, minSize=min_size, limit=limit)
+        return [r["community"] async for r in result]
+
+
+async def get_community(driver: AsyncDriver, community_id: int) -> Optional[dict]:
+    async with driver.session() as session:
+        result = await session.run("""
+            MATCH (m:Community {id: $id})
+            RETURN m {.id, .size, .organizationCount, .theoryCount, .method, .runAt} AS community,
+                   COLLECT {
+                       MATCH (o:Organization {communityId: $id})
+                       RETURN {canonicalName: o.canonicalName,
+                               caseCount: COUNT { (o)<-[:NAMED_DEFENDANT]-(:Case) }} AS org
+                       ORDER BY org.caseCount DESC, org.canonicalName
+                   } AS organizations,
+                   COLLECT {
+                       MATCH (t:LegalTheory {communityId: $id})
+                       RETURN t.name ORDER BY t.name
+                   } AS theories
+        """, id=community_id)
+        record = await result.single()
+        if not record:
+            return None
+        return {**record["community"], "organizations": record["organizations"], "theories": record["theories"]}
+
+
+async def get_top_ai_systems(driver: AsyncDriver, limit: int = 15, rank_by: str = "caseCount") -> list:
+    if replica := replica_manager.serving():
+        return replica.top_ai_systems(limit, rank_by)
+    if rank_by in RANK_SCORES:
+        query = f"""
+            MATCH (s:AISystem) WHERE s.{rank_by} IS NOT NULL
+            WITH s ORDER BY s.{rank_by} DESC LIMIT $limit
+            RETURN s.name AS name, s.category AS category,
+                   COUNT {{ (s)<-[:INVOLVES_SYSTEM]-(:Case) }} AS caseCount, s.{rank_by} AS score
+        """
+    else:
+        query = """
             MATCH (s:AISystem)<-[:INVOLVES_SYSTEM]-(c:Case)
             WITH s, count(c) AS caseCount
             ORDER BY caseCount DESC LIMIT $limit
             RETURN s.name AS name, s.category AS category, caseCount
-        """, limit=limit)
+        """
+    async with driver.session() as session:
+        result = await session.run(query, limit=limit)
         return [dict(r) async for r in result]
 
 
 async def get_cases_by_theory(driver: AsyncDriver, theory_name: str) -> list:
+    if replica := replica_manager.serving():
+        return replica.cases_by_theory(theory_name)
     async with driver.session() as session:
         result = await session.run("""
             MATCH (t:LegalTheory {name: $name})<-[:ASSERTS_CLAIM]-(c:Case)
@@ -149,6 +380,7 @@ async def get_cases_by_theory(driver: AsyncDriver, theory_name: str) -> list:
         return [dict(r) async for r in result]
 
 
+@sqlite_fallback
 async def get_case_by_id(driver: AsyncDriver, case_id: str) -> Optional[dict]:
     async with driver.session() as session:
         result = await session.run("MATCH (c:Case {id: $id}) RETURN c", id=case_id)
@@ -156,20 +388,27 @@ async def get_case_by_id(driver: AsyncDriver, case_id: str) -> Optional[dict]:
         return dict(record["c"]) if record else None
 
 
+# Each relationship type is expanded in its own subquery: chained OPTIONAL MATCHes
+# would build the orgs x systems x theories x courts product before collect(DISTINCT)
+CASE_NEIGHBORS_QUERY = """
+    MATCH (c:Case {id: $id})
+    RETURN c,
+           COLLECT {
+               MATCH (c)-[r:NAMED_DEFENDANT]->(o:Organization)
+               RETURN DISTINCT {name: o.canonicalName, confidence: r.confidence, roles: r.roles}
+           } AS orgs,
+           COLLECT {
+               MATCH (c)-[r:INVOLVES_SYSTEM]->(s:AISystem)
+               RETURN DISTINCT {name: s.name, category: s.category, confidence: r.confidence}
+           } AS systems,
+           COLLECT { MATCH (c)-[:ASSERTS_CLAIM]->(t:LegalTheory) RETURN DISTINCT t.name } AS theories,
+           COLLECT { MATCH (c)-[:FILED_IN]->(ct:Court) RETURN DISTINCT ct.name } AS courts
+"""
+
+
 async def get_case_neighbors(driver: AsyncDriver, case_id: str) -> dict:
     async with driver.session() as session:
-        result = await session.run("""
-            MATCH (c:Case {id: $id})
-            OPTIONAL MATCH (c)-[r1:NAMED_DEFENDANT]->(o:Organization)
-            OPTIONAL MATCH (c)-[r2:INVOLVES_SYSTEM]->(s:AISystem)
-            OPTIONAL MATCH (c)-[:ASSERTS_CLAIM]->(t:LegalTheory)
-            OPTIONAL MATCH (c)-[:FILED_IN]->(ct:Court)
-            RETURN c,
-                   collect(DISTINCT {name: o.canonicalName, confidence: r1.confidence, roles: r1.roles}) AS orgs,
-                   collect(DISTINCT {name: s.name, category: s.category, confidence: r2.confidence}) AS systems,
-                   collect(DISTINCT t.name) AS theories,
-                   collect(DISTINCT ct.name) AS courts
-        """, id=case_id)
+        result = await session.run(CASE_NEIGHBORS_QUERY, id=case_id)
         record = await result.single()
         if not record:
             return {}
@@ -182,7 +421,193 @@ async def get_case_neighbors(driver: AsyncDriver, case_id: str) -> dict:
         }
 
 
+# Node key property per label, and the Graph Explorer's node id prefix for it
+NODE_KEYS = {
+    "Case": "id",
+    "Organization": "canonicalName",
+    "AISystem": "name",
+    "LegalTheory": "name",
+    "Court": "name",
+}
+EXPLORER_NODE_PREFIX = {"Case": "", "Organization": "org-", "AISystem": "sys-", "LegalTheory": "theory-", "Court": "court-"}
+
+
+def explorer_node_id(label: str, key: str) -> str:
+    """Node id as the Graph Explorer builds it: the case id, or org-/sys-/theory-/court- plus the name."""
+    return f"{EXPLORER_NODE_PREFIX[label]}{key}"
+
+
+# Seed cases (requested ids, plus each requested organization's most recent cases)
+# are gathered in one UNION subquery, then every neighborhood is collected per case
+NEIGHBORHOODS_QUERY = """
+    CALL {
+        UNWIND $caseIds AS caseId
+        MATCH (c:Case {id: caseId})
+        RETURN c
+        UNION
+        UNWIND $orgNames AS orgName
+        MATCH (:Organization {canonicalName: orgName})<-[:NAMED_DEFENDANT]-(c:Case)
+        WITH orgName, c ORDER BY c.dateFiled DESC
+        WITH orgName, collect(c)[..$perOrg] AS cases
+        UNWIND cases AS c
+        RETURN c
+    }
+    WITH DISTINCT c
+    RETURN c {.id, .caption, .status, .dateFiled, .jurisdictionType} AS case,
+           COLLECT {
+               MATCH (c)-[r:NAMED_DEFENDANT]->(o:Organization)
+               RETURN {name: o.canonicalName, confidence: r.confidence, roles: r.roles}
+           } AS orgs,
+           COLLECT {
+               MATCH (c)-[r:INVOLVES_SYSTEM]->(s:AISystem)
+               RETURN {name: s.name, category: s.category, confidence: r.confidence}
+           } AS systems,
+           COLLECT { MATCH (c)-[:ASSERTS_CLAIM]->(t:LegalTheory) RETURN t.name } AS theories,
+           COLLECT { MATCH (c)-[:FILED_IN]->(ct:Court) RETURN ct.name } AS courts
+"""
+
+
+async def get_neighborhoods(
+    driver: AsyncDriver, case_ids: list, org_names: list, per_org: int = 25
+) -> dict:
+    """
+    Neighborhoods of many cases and defendants as one deduplicated node/edge
+    payload, with node ids from explorer_node_id.
+    """
+    async with driver.session() as session:
+        result = await session.run(
+            NEIGHBORHOODS_QUERY, caseIds=case_ids, orgNames=org_names, perOrg=per_org
+        )
+        records = [r async for r in result]
+
+    nodes: dict = {}
+    edges: dict = {}
+
+    def link(case_id: str, label: str, name: str, rel: str, props: dict) -> dict:
+        node_id = explorer_node_id(label, name)
+        node = nodes.setdefault(node_id, {"id": node_id, "type": label, "label": name, "properties": {}})
+        edges[(case_id, node_id, rel)] = {"source": case_id, "target": node_id, "type": rel, **props}
+        return node
+
+    for record in records:
+        case = dict(record["case"])
+        case_id = case["id"]
+        nodes[case_id] = {"id": case_id, "type": "Case", "label": case.get("caption"), "properties": case}
+        for org in record["orgs"]:
+            link(case_id, "Organization", org["name"], "NAMED_DEFENDANT",
+                 {"confidence": org["confidence"], "roles": org["roles"]})
+        for system in record["systems"]:
+            node = link(case_id, "AISystem", system["name"], "INVOLVES_SYSTEM", {"confidence": system["confidence"]})
+            node["properties"]["category"] = system["category"]
+        for theory in record["theories"]:
+            link(case_id, "LegalTheory", theory, "ASSERTS_CLAIM", {})
+        for court in record["courts"]:
+            link(case_id, "Court", court, "FILED_IN", {})
+    return {"nodes": list(nodes.values()), "edges": list(edges.values())}
+
+
+EGO_REL_TYPES = ["NAMED_DEFENDANT", "INVOLVES_SYSTEM", "ASSERTS_CLAIM", "FILED_IN"]
+
+# One hop for the whole frontier. Each node contributes at most $fanout
+# neighbors; past that, hubs are sampled at random so one large defendant
+# cannot flood the result
+EGO_EXPAND_QUERY = """
+    MATCH (n) WHERE elementId(n) IN $frontier
+    CALL {
+        WITH n
+        MATCH (n)-[r]-(m)
+        WHERE type(r) IN $types AND any(l IN labels(m) WHERE l IN $labels)
+        WITH r, m ORDER BY rand() LIMIT $fanout
+        RETURN r, m
+    }
+    RETURN elementId(n) AS from, type(r) AS type, startNode(r) = n AS outgoing,
+           elementId(m) AS eid, [l IN labels(m) WHERE l IN $labels][0] AS label,
+           m {.id, .canonicalName, .name, .caption, .status, .dateFiled, .category} AS props,
+           COUNT { (n)-[r2]-() WHERE type(r2) IN $types } AS degree
+"""
+
+
+def _ego_node(label: str, props: dict, hop: int) -> Optional[dict]:
+    key = props.get(NODE_KEYS[label])
+    if key is None:
+        return None
+    return {
+        "kind": "node", "id": explorer_node_id(label, key), "type": label,
+        "label": props.get("caption") or props.get("name") or key, "hop": hop,
+        "properties": {k: v for k, v in props.items() if v is not None},
+    }
+
+
+async def get_ego_seed(driver: AsyncDriver, label: str, key: str) -> Optional[dict]:
+    async with driver.session() as session:
+        result = await session.run(
+            f"MATCH (n:{label} {{{NODE_KEYS[label]}: $key}}) "
+            "RETURN elementId(n) AS eid, n {.id, .canonicalName, .name, .caption, .status, .dateFiled, .category} AS props",
+            key=key,
+        )
+        record = await result.single()
+    if not record:
+        return None
+    node = _ego_node(label, dict(record["props"]), 0)
+    return {"eid": record["eid"], **node} if node else None
+
+
+async def stream_ego_network(
+    driver: AsyncDriver,
+    seed: dict,
+    hops: int = 2,
+    fanout: int = 50,
+    max_nodes: int = 500,
+    rel_types: Optional[list] = None,
+):
+    """
+    Breadth-first expansion from `seed` (see get_ego_seed), yielding node and
+    edge dicts as each hop's rows arrive so callers can stream them. Stops at
+    `hops`, or when `max_nodes` nodes have been emitted; edges are only
+    emitted between emitted nodes. Ends with a {"kind": "done"} summary.
+    """
+    types = rel_types or EGO_REL_TYPES
+    ids = {seed["eid"]: seed["id"]}
+    edges = set()
+    truncated = False
+    frontier = [seed["eid"]]
+    yield {k: v for k, v in seed.items() if k != "eid"}
+
+    hop = 0
+    async with driver.session() as session:
+        while frontier and hop < hops:
+            hop += 1
+            next_frontier = []
+            result = await session.run(
+                EGO_EXPAND_QUERY, frontier=frontier, types=types,
+                labels=list(NODE_KEYS), fanout=fanout,
+            )
+            async for record in result:
+                truncated = truncated or record["degree"] > fanout
+                eid = record["eid"]
+                if eid not in ids:
+                    if len(ids) >= max_nodes:
+                        truncated = True
+                        continue
+                    node = _ego_node(record["label"], dict(record["props"]), hop)
+                    if node is None:
+                        continue
+                    ids[eid] = node["id"]
+                    next_frontier.append(eid)
+                    yield node
+                source, target = ids[record["from"]], ids[eid]
+                if not record["outgoing"]:
+                    source, target = target, source
+                if (source, target, record["type"]) not in edges:
+                    edges.add((source, target, record["type"]))
+                    yield {"kind": "edge", "source": source, "target": target, "type": record["type"]}
+            frontier = next_frontier
+    yield {"kind": "done", "hops": hop, "nodes": len(ids), "edges": len(edges), "truncated": truncated}
+
+
 async def get_similar_cases(driver: AsyncDriver, case_id: str) -> list:
+    if replica := replica_manager.serving():
+        return replica.similar_cases(case_id)
     async with driver.session() as session:
         result = await session.run("""
             MATCH (target:Case {id: $id})
@@ -200,6 +625,7 @@ async def get_similar_cases(driver: AsyncDriver, case_id: str) -> list:
         return [dict(r) async for r in result]
 
 
+@sqlite_fallback
 async def get_cases_list(
     driver: AsyncDriver,
     status: Optional[str],
@@ -291,7 +717,8 @@ async def approve_review_item(driver: AsyncDriver, item_id: str) -> bool:
             MATCH ()-[rel {reviewItemId: $id}]-()
             SET rel.reviewedByHuman = true
         """, id=item_id)
-        return True
+    await bump_graph_version(driver, case_ids=[])  # review state only; no case data changed
+    return True
 
 
 async def reject_review_item(driver: AsyncDriver, item_id: str, correction: dict) -> bool:
@@ -305,7 +732,8 @@ async def reject_review_item(driver: AsyncDriver, item_id: str, correction: dict
                 loggedAt: datetime()
             })
         """, id=item_id, correction=json.dumps(correction))
-        return True
+    await bump_graph_version(driver, case_ids=[])  # review state only; no case data changed
+    return True
 
 
 async def detect_waves_cypher(
@@ -313,6 +741,8 @@ async def detect_waves_cypher(
     window_days: int = 60,
     threshold: int = 3
 ) -> list:
+    if replica := replica_manager.serving():
+        return replica.waves(window_days, threshold)
     async with driver.session() as session:
         result = await session.run("""
             MATCH (c:Case)-[:NAMED_DEFENDANT]->(org:Organization)
@@ -337,7 +767,8 @@ async def get_ingest_history(driver: AsyncDriver, limit: int = 10) -> list:
         result = await session.run("""
             MATCH (ir:IngestRun)
             RETURN ir.timestamp AS timestamp, ir.casesFound AS casesFound,
-                   ir.casesAdded AS casesAdded, ir.casesQueued AS casesQueued
+                   ir.casesAdded AS casesAdded, ir.casesQueued AS casesQueued,
+                   ir.requestsMade AS requestsMade
             ORDER BY ir.timestamp DESC LIMIT $limit
         """, limit=limit)
         return [dict(r) async for r in result]
@@ -394,6 +825,7 @@ async def get_node_counts(driver: AsyncDriver) -> dict:
         }
 
 
+@sqlite_fallback
 async def get_secondary_sources(driver: AsyncDriver, case_id: str) -> list:
     """Return secondary sources (news, blogs) linked to a case."""
     async with driver.session() as session:
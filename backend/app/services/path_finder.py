@@ -0,0 +1,198 @@
+"""
+Connection finder: "how is Clearview AI connected to Meta?"
+
+Answers over an in-memory copy of the case graph (cases, organizations, AI
+systems, legal theories; the GraphMatrix from app.services.graph_analytics).
+With the graph replica serving (GRAPH_READ_BACKEND=replica) that copy is
+derived from the replica's relationships; otherwise it is loaded from Neo4j
+and reloaded whenever the graph version changes:
+
+    1. bidirectional BFS, always growing the side whose frontier has the
+       smaller total degree, until the two searches meet, the hop limit is
+       reached or the time budget runs out
+    2. every shortest path runs through the meeting layer; each interior node
+       costs hub_weight * log1p(degree), and the cheapest cost-to-target is
+       computed layer by layer over that shortest-path DAG
+    3. A* over the DAG with that exact cost-to-target pops complete paths in
+       cost order, so the first k popped are the k least hub-heavy shortest
+       paths
+
+Courts are left out: nearly every case shares one, which says nothing.
+"""
+import asyncio
+import heapq
+import time
+from typing import Optional
+
+import numpy as np
+
+from app.services.graph_analytics import GraphMatrix, load_graph
+from app.services.graph_replica import replica_manager
+from app.services.neo4j_service import explorer_node_id, get_graph_version
+
+REL_TYPE_BY_LABEL = {"Organization": "NAMED_DEFENDANT", "AISystem": "INVOLVES_SYSTEM", "LegalTheory": "ASSERTS_CLAIM"}
+# Tried in order when the caller names a node without a label
+RESOLVE_ORDER = ["Organization", "AISystem", "LegalTheory", "Case"]
+
+
+def _meet(graph: GraphMatrix, source: int, target: int, max_hops: int, deadline: float) -> tuple:
+    """
+    Bidirectional BFS. Returns (hops, layers, dist, truncated): layers[side][i]
+    are the nodes at distance i from source (side 0) / target (side 1), cut
+    down to the meeting nodes at the two innermost layers. hops is None when
+    no path was found.
+    """
+    n = len(graph)
+    degree = graph.degree()
+    dist = [np.full(n, -1, dtype=np.int64), np.full(n, -1, dtype=np.int64)]
+    dist[0][source], dist[1][target] = 0, 0
+    layers = [[np.array([source])], [np.array([target])]]
+    if source == target:
+        return 0, layers, dist, False
+    for hops in range(1, max_hops + 1):
+        if time.perf_counter() > deadline:
+            return None, layers, dist, True
+        side = 0 if degree[layers[0][-1]].sum() <= degree[layers[1][-1]].sum() else 1
+        _, nbrs = graph.neighbors_of(layers[side][-1])
+        new = np.unique(nbrs)
+        new = new[dist[side][new] < 0]
+        if not len(new):
+            return None, layers, dist, False  # one side's component is exhausted
+        dist[side][new] = len(layers[side])
+        layers[side].append(new)
+        meeting = new[dist[1 - side][new] >= 0]
+        if len(meeting):
+            layers[side][-1] = meeting
+            layers[1 - side][-1] = meeting
+            return hops, layers, dist, False
+    return None, layers, dist, False
+
+
+def _cost_to_go(graph: GraphMatrix, layers: list, cost: np.ndarray, start: np.ndarray) -> np.ndarray:
+    """
+    Cheapest cost from each node of `layers` to the DAG's end, counting the
+    node itself. Layer i steps only into layer i - 1; start holds the costs
+    for layers[0].
+    """
+    best = start.copy()
+    for previous, layer in zip(layers, layers[1:]):
+        in_previous = np.zeros(len(graph), dtype=bool)
+        in_previous[previous] = True
+        sources, nbrs = graph.neighbors_of(layer)
+        step = in_previous[nbrs]
+        reach = np.full(len(graph), np.inf)
+        np.minimum.at(reach, sources[step], best[nbrs[step]])
+        best[layer] = cost[layer] + reach[layer]
+    return best
+
+
+def find_paths(graph: GraphMatrix, source: int, target: int, max_hops: int = 6, k: int = 3,
+               hub_weight: float = 1.0, budget_ms: float = 500) -> dict:
+    """
+    {"hops", "paths": [{"nodes": [index, ...], "hubCost"}], "truncated"}; paths
+    are the k cheapest shortest paths, truncated is set when the time budget
+    cut the search short.
+    """
+    deadline = time.perf_counter() + budget_ms / 1000.0
+    hops, layers, dist, truncated = _meet(graph, source, target, max_hops, deadline)
+    if hops is None:
+        return {"hops": None, "paths": [], "truncated": truncated}
+    cost = hub_weight * np.log1p(graph.degree().astype(float))
+    cost[[source, target]] = 0.0
+    # Cost-to-target: over the target-side layers, then back along the source side from the meeting layer
+    seed = np.full(len(graph), np.inf)
+    seed[target] = 0.0
+    to_target = _cost_to_go(graph, layers[1], cost, seed)
+    meeting = layers[0][-1]
+    seed = np.full(len(graph), np.inf)
+    seed[meeting] = to_target[meeting]
+    from_source = _cost_to_go(graph, layers[0][::-1], cost, seed)
+    meet_at = len(layers[0]) - 1
+
+    def successors(node: int, position: int) -> tuple:
+        nbrs = graph.indices[graph.indptr[node]:graph.indptr[node + 1]]
+        if position < meet_at:
+            nbrs = nbrs[dist[0][nbrs] == position + 1]
+            return nbrs, from_source[nbrs]
+        nbrs = nbrs[dist[1][nbrs] == hops - position - 1]
+        return nbrs, to_target[nbrs]
+
+    paths = []
+    heap = [(float(from_source[source]), 0.0, (source,))]
+    while heap and len(paths) < k:
+        if time.perf_counter() > deadline:
+            truncated = True
+            break
+        f, g, path = heapq.heappop(heap)
+        node = path[-1]
+        if node == target:
+            paths.append({"nodes": list(path), "hubCost": round(float(f), 4)})
+            continue
+        g += cost[node]
+        nbrs, togo = successors(node, len(path) - 1)
+        for nbr, h in zip(nbrs.tolist(), togo.tolist()):
+            if h != np.inf:
+                heapq.heappush(heap, (g + h, g, path + (nbr,)))
+    return {"hops": hops, "paths": paths, "truncated": truncated}
+
+
+class PathGraph:
+    """
+    The GraphMatrix used for path search: the serving replica's, else one
+    loaded from Neo4j and reloaded when the graph version changes.
+    """
+
+    def __init__(self):
+        self.graph: Optional[GraphMatrix] = None
+        self.version: Optional[int] = None
+        self._folded: dict = {}
+        self._lock = asyncio.Lock()
+
+    def _use(self, graph: GraphMatrix, version: int):
+        self._folded = {}
+        for label, key in graph.nodes:
+            self._folded.setdefault((label, str(key).casefold()), graph.index[(label, key)])
+        self.graph, self.version = graph, version
+
+    async def get(self, driver) -> GraphMatrix:
+        replica = replica_manager.serving()
+        if replica is not None:
+            graph = replica.graph_matrix()
+            if graph is not self.graph:
+                self._use(graph, replica.version)
+            return self.graph
+        version = await get_graph_version(driver)
+        if self.graph is None or version != self.version:
+            async with self._lock:
+                if self.graph is None or version != self.version:
+                    self._use(await load_graph(driver), version)
+        return self.graph
+
+    def resolve(self, key: str, label: Optional[str] = None) -> Optional[int]:
+        """Node index for a key (exact first, then case-insensitive), optionally restricted to one label."""
+        for candidate in ([label] if label else RESOLVE_ORDER):
+            index = self.graph.index.get((candidate, key))
+            if index is None:
+                index = self._folded.get((candidate, key.casefold()))
+            if index is not None:
+                return index
+        return None
+
+
+path_graph = PathGraph()
+
+
+def describe(graph: GraphMatrix, found: dict) -> dict:
+    """Turn node indices into Graph Explorer nodes and typed edges."""
+    degree = graph.degree()
+    paths = []
+    for path in found["paths"]:
+        nodes, edges = [], []
+        for i in path["nodes"]:
+            label, key = graph.nodes[i]
+            nodes.append({"id": explorer_node_id(label, key), "type": label, "key": key, "degree": int(degree[i])})
+        for a, b in zip(nodes, nodes[1:]):
+            case, other = (a, b) if a["type"] == "Case" else (b, a)
+            edges.append({"source": case["id"], "target": other["id"], "type": REL_TYPE_BY_LABEL[other["type"]]})
+        paths.append({"nodes": nodes, "edges": edges, "hubCost": path["hubCost"]})
+    return {"hops": found["hops"], "paths": paths, "truncated": found["truncated"]}
@@ -0,0 +1,86 @@
+"""
+Packs AI-litigation keywords into OR-combined CourtListener queries.
+
+One search request covers as many keywords as fit in max_query_length; hits
+are attributed back to the keywords they mention locally. When the observed
+rate-limit headroom is too small for that plan, queries grow past
+max_query_length (up to hard_query_length) so a run never spends more than a
+fixed share of the remaining request window.
+"""
+import math
+import re
+from typing import Iterable, Optional
+
+# CourtListener rejects very long q= strings; stay well under the practical limit,
+# and only go up to HARD_QUERY_LENGTH when rate-limit headroom runs short.
+MAX_QUERY_LENGTH = 400
+HARD_QUERY_LENGTH = 1000
+# Fraction of the remaining rate-limit window one ingest run may consume.
+HEADROOM_SHARE = 0.25
+
+# Docket fields searched locally when attributing a hit to keywords.
+ATTRIBUTION_FIELDS = [
+    "case_name",
+    "case_name_full",
+    "case_name_short",
+    "cause",
+    "nature_of_suit",
+    "snippet",
+]
+
+
+def format_term(keyword: str) -> str:
+    return '"' + keyword.replace('"', "") + '"'
+
+
+def build_query(keywords: Iterable[str]) -> str:
+    return " OR ".join(format_term(k) for k in keywords)
+
+
+def attribute_keywords(docket: dict, keywords: Iterable[str]) -> list:
+    """Return the keywords that appear (whole-word, case-insensitive) in the docket's text fields."""
+    haystack = " ".join(str(docket.get(f) or "") for f in ATTRIBUTION_FIELDS).lower()
+    return [
+        k for k in keywords
+        if re.search(r"\b" + re.escape(k.lower()) + r"\b", haystack)
+    ]
+
+
+class QueryPlanner:
+    def __init__(
+        self,
+        keywords: Iterable[str],
+        max_query_length: int = MAX_QUERY_LENGTH,
+        hard_query_length: int = HARD_QUERY_LENGTH,
+        headroom_share: float = HEADROOM_SHARE,
+    ):
+        self.pending = list(dict.fromkeys(keywords))
+        self.max_query_length = max_query_length
+        self.hard_query_length = max(hard_query_length, max_query_length)
+        self.headroom_share = headroom_share
+
+    def has_pending(self) -> bool:
+        return bool(self.pending)
+
+    def target_terms(self, remaining: Optional[int]) -> int:
+        """Fewest keywords per query that fit the rest of the plan in our share of the remaining requests."""
+        if remaining is None:
+            return 0
+        budget = max(1, int(remaining * self.headroom_share))
+        return math.ceil(len(self.pending) / budget)
+
+    def next_batch(self, remaining: Optional[int] = None) -> list:
+        """
+        Pop the next group of keywords: as many as fit in max_query_length, or
+        up to hard_query_length while the batch is smaller than the headroom target.
+        """
+        target = self.target_terms(remaining)
+        batch: list = []
+        for keyword in self.pending:
+            length = len(build_query(batch + [keyword]))
+            limit = self.hard_query_length if len(batch) < target else self.max_query_length
+            if batch and length > limit:
+                break
+            batch.append(keyword)
+        self.pending = self.pending[len(batch):]
+        return batch
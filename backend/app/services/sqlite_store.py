@@ -0,0 +1,184 @@
+"""
+Read-only SQLite copy of the graph for the case and defendant read
+endpoints, served from the data/dail_graph.db file app.ingest.export_graph
+keeps in sync with Neo4j (one table per node label and relationship type,
+every property kept as JSON in `properties`).
+
+neo4j_service routes a read here (see its sqlite_fallback decorator):
+  - always, when GRAPH_READ_BACKEND=sqlite (read scaling: no Neo4j round trip)
+  - when Neo4j is unreachable (ServiceUnavailable), so those endpoints keep
+    answering from the last export instead of failing.
+
+Every call opens its own read-only connection; the exporter writes in WAL
+mode, so reads see each committed sync without blocking it. Results have
+the same shape as the Cypher queries they stand in for.
+"""
+import json
+import os
+import sqlite3
+from pathlib import Path
+from typing import Optional
+
+# services/ -> up 3 -> dail-knowledge-graph/data/
+DEFAULT_GRAPH_DB = os.path.normpath(
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "data", "dail_graph.db")
+)
+RANK_SCORES = ["pagerank", "betweenness", "degree"]
+
+# Cypher sorts nulls last ascending and first descending; SQLite the reverse
+CASES_LIST_SQL = """
+    SELECT id, caption, status, date_filed, jurisdiction_type,
+           json_extract(properties, '$.areaOfApplication') AS areas
+    FROM cases {where}
+    ORDER BY date_filed IS NOT NULL, date_filed DESC LIMIT ? OFFSET ?
+"""
+# Like the Cypher: take the top organizations by score first (export_graph indexes
+# each score column with canonical_name as the tie-breaker), then count their cases
+RANKED_DEFENDANTS_SQL = """
+    WITH ranked AS (
+        SELECT canonical_name, {score} AS score
+        FROM organizations WHERE {score} IS NOT NULL
+        ORDER BY {score} DESC, canonical_name LIMIT ?
+    )
+    SELECT r.canonical_name, count(*), sum(c.status = 'Active'), sum(c.status = 'Inactive'), r.score
+    FROM ranked r
+    JOIN named_defendant nd ON nd.organization = r.canonical_name
+    JOIN cases c ON c.id = nd.case_id
+    GROUP BY r.canonical_name ORDER BY r.score DESC, r.canonical_name
+"""
+TOP_DEFENDANTS_SQL = """
+    SELECT nd.organization, count(*) AS total, sum(c.status = 'Active'), sum(c.status = 'Inactive')
+    FROM named_defendant nd JOIN cases c ON c.id = nd.case_id
+    GROUP BY nd.organization ORDER BY total DESC, nd.organization LIMIT ?
+"""
+DEFENDANT_CASES_SQL = """
+    SELECT c.id, c.caption, c.status, c.date_filed, c.jurisdiction_type,
+           (SELECT json_group_array(legal_theory) FROM asserts_claim a WHERE a.case_id = c.id),
+           (SELECT json_group_array(ai_system) FROM involves_system s WHERE s.case_id = c.id)
+    FROM named_defendant nd JOIN cases c ON c.id = nd.case_id
+    WHERE nd.organization = ?
+"""
+
+
+class SqliteReadStore:
+    def __init__(self):
+        self.path: Optional[str] = None
+        self.primary = False
+
+    def configure(self, path: Optional[str], primary: bool = False):
+        """path None/empty disables the store; primary serves every supported read from it."""
+        self.path = path or None
+        self.primary = primary
+
+    def available(self) -> bool:
+        return bool(self.path) and os.path.exists(self.path)
+
+    def serving(self) -> Optional["SqliteReadStore"]:
+        """The store when it is the configured read backend, else None (use Neo4j)."""
+        return self if self.primary and self.available() else None
+
+    def fallback(self) -> Optional["SqliteReadStore"]:
+        """The store to answer from while Neo4j is unreachable, if there is one."""
+        return self if self.available() else None
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(f"{Path(os.path.abspath(self.path)).as_uri()}?mode=ro", uri=True)
+
+    def _query(self, sql: str, params: tuple = ()) -> list:
+        conn = self._connect()
+        try:
+            return conn.execute(sql, params).fetchall()
+        finally:
+            conn.close()
+
+    def status(self) -> dict:
+        if not self.path:
+            return {"enabled": False}
+        state = {"enabled": True, "mode": "primary" if self.primary else "fallback", "path": self.path}
+        if not self.available():
+            return {**state, "available": False}
+        try:
+            meta = dict(self._query("SELECT key, value FROM export_meta"))
+            (cases,), = self._query("SELECT count(*) FROM cases")
+        except sqlite3.Error as e:
+            return {**state, "available": False, "error": str(e)}
+        return {
+            **state,
+            "available": True,
+            "graphVersion": int(meta.get("graph_version", 0)),
+            "exportedAt": meta.get("exported_at"),
+            "cases": cases,
+        }
+
+    # --- reads (signatures mirror neo4j_service without the driver) ----------
+
+    def get_cases_list(
+        self,
+        status: Optional[str],
+        jurisdiction_type: Optional[str],
+        area: Optional[str],
+        limit: int = 50,
+        skip: int = 0,
+    ) -> list:
+        clauses, params = [], []
+        if status:
+            clauses.append("status = ?")
+            params.append(status)
+        if jurisdiction_type:
+            clauses.append("jurisdiction_type = ?")
+            params.append(jurisdiction_type)
+        if area:
+            clauses.append("EXISTS (SELECT 1 FROM json_each(properties, '$.areaOfApplication') WHERE value = ?)")
+            params.append(area)
+        where = "WHERE " + " AND ".join(clauses) if clauses else ""
+        rows = self._query(CASES_LIST_SQL.format(where=where), (*params, limit, skip))
+        return [
+            {
+                "id": cid, "caption": caption, "status": status_, "dateFiled": filed,
+                "jurisdictionType": jurisdiction, "areaOfApplication": json.loads(areas) if areas else None,
+            }
+            for cid, caption, status_, filed, jurisdiction, areas in rows
+        ]
+
+    def get_case_by_id(self, case_id: str) -> Optional[dict]:
+        rows = self._query("SELECT properties FROM cases WHERE id = ?", (case_id,))
+        return json.loads(rows[0][0]) if rows else None
+
+    def get_secondary_sources(self, case_id: str) -> list:
+        rows = self._query("""
+            SELECT s.title, s.link FROM has_secondary_source h
+            JOIN secondary_sources s ON s.link = h.link
+            WHERE h.case_id = ?
+            ORDER BY s.title IS NULL, s.title
+        """, (case_id,))
+        return [{"title": title, "link": link} for title, link in rows]
+
+    def get_top_defendants(self, limit: int = 20, rank_by: str = "caseCount") -> list:
+        keys = ["canonicalName", "caseCount", "activeCount", "inactiveCount"]
+        if rank_by in RANK_SCORES:
+            rows = self._query(RANKED_DEFENDANTS_SQL.format(score=rank_by), (limit,))
+            keys.append("score")
+        else:
+            rows = self._query(TOP_DEFENDANTS_SQL, (limit,))
+        return [dict(zip(keys, row)) for row in rows]
+
+    def get_cases_by_year(self) -> list:
+        rows = self._query("""
+            SELECT substr(date_filed, 1, 4) AS year, count(*) FROM cases
+            WHERE date_filed IS NOT NULL AND date_filed <> '' AND year >= '2016'
+            GROUP BY year ORDER BY year
+        """)
+        return [{"year": year, "count": count} for year, count in rows]
+
+    def get_defendant_cases(self, org_name: str) -> list:
+        return [
+            {
+                "id": cid, "caption": caption, "status": status, "dateFiled": filed,
+                "jurisdictionType": jurisdiction, "theories": json.loads(theories), "aiSystems": json.loads(systems),
+            }
+            for cid, caption, status, filed, jurisdiction, theories, systems
+            in self._query(DEFENDANT_CASES_SQL, (org_name,))
+        ]
+
+
+read_store = SqliteReadStore()
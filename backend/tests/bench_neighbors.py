@@ -0,0 +1,134 @@
+"""
+PROFILE the Graph Explorer neighborhood queries against a live Neo4j, old
+chained-OPTIONAL-MATCH form vs. the COLLECT-subquery form in neo4j_service.
+
+    python -m tests.bench_neighbors                  (from backend/ directory)
+    python -m tests.bench_neighbors --orgs 50 --theories 40
+
+Builds one synthetic high-degree case (and a defendant shared by many such
+cases) under a "bench::" prefix, prints peak operator rows and total db hits
+for each query, then deletes the fixture.
+"""
+import argparse
+import asyncio
+import os
+import time
+
+from dotenv import load_dotenv
+
+from app.services.neo4j_service import CASE_NEIGHBORS_QUERY, DEFENDANT_CASES_QUERY, get_driver
+
+load_dotenv()
+
+PREFIX = "bench::"
+
+# The queries as they were before the subquery rewrite
+OLD_CASE_NEIGHBORS_QUERY = """
+    MATCH (c:Case {id: $id})
+    OPTIONAL MATCH (c)-[r1:NAMED_DEFENDANT]->(o:Organization)
+    OPTIONAL MATCH (c)-[r2:INVOLVES_SYSTEM]->(s:AISystem)
+    OPTIONAL MATCH (c)-[:ASSERTS_CLAIM]->(t:LegalTheory)
+    OPTIONAL MATCH (c)-[:FILED_IN]->(ct:Court)
+    RETURN c,
+           collect(DISTINCT {name: o.canonicalName, confidence: r1.confidence, roles: r1.roles}) AS orgs,
+           collect(DISTINCT {name: s.name, category: s.category, confidence: r2.confidence}) AS systems,
+           collect(DISTINCT t.name) AS theories,
+           collect(DISTINCT ct.name) AS courts
+"""
+OLD_DEFENDANT_CASES_QUERY = """
+    MATCH (o:Organization {canonicalName: $name})<-[:NAMED_DEFENDANT]-(c:Case)
+    OPTIONAL MATCH (c)-[:ASSERTS_CLAIM]->(t:LegalTheory)
+    OPTIONAL MATCH (c)-[:INVOLVES_SYSTEM]->(s:AISystem)
+    RETURN c.id AS id, c.caption AS caption, c.status AS status,
+           c.dateFiled AS dateFiled, c.jurisdictionType AS jurisdictionType,
+           collect(DISTINCT t.name) AS theories,
+           collect(DISTINCT s.name) AS aiSystems
+"""
+
+
+async def build_fixture(driver, orgs: int, systems: int, theories: int, courts: int, cases: int):
+    async with driver.session() as session:
+        await session.run("""
+            UNWIND range(0, $cases - 1) AS i
+            MERGE (c:Case {id: $prefix + 'case-' + i})
+            SET c.caption = 'Bench case ' + i, c.source = 'bench'
+            WITH c, i
+            MERGE (hub:Organization {canonicalName: $prefix + 'hub'})
+            MERGE (c)-[:NAMED_DEFENDANT {confidence: 0.9, roles: ['developer']}]->(hub)
+            FOREACH (j IN range(0, $orgs - 1) |
+                MERGE (o:Organization {canonicalName: $prefix + 'org-' + j})
+                MERGE (c)-[:NAMED_DEFENDANT {confidence: 0.8, roles: ['deployer']}]->(o))
+            FOREACH (j IN range(0, $systems - 1) |
+                MERGE (s:AISystem {name: $prefix + 'system-' + j})
+                MERGE (c)-[:INVOLVES_SYSTEM {confidence: 0.8}]->(s))
+            FOREACH (j IN range(0, $theories - 1) |
+                MERGE (t:LegalTheory {name: $prefix + 'theory-' + j})
+                MERGE (c)-[:ASSERTS_CLAIM]->(t))
+            FOREACH (j IN range(0, $courts - 1) |
+                MERGE (ct:Court {name: $prefix + 'court-' + j})
+                MERGE (c)-[:FILED_IN]->(ct))
+        """, prefix=PREFIX, cases=cases, orgs=orgs, systems=systems, theories=theories, courts=courts)
+
+
+async def drop_fixture(driver):
+    async with driver.session() as session:
+        await session.run("""
+            MATCH (n) WHERE (n:Case AND n.id STARTS WITH $prefix)
+               OR (n:Organization AND n.canonicalName STARTS WITH $prefix)
+               OR ((n:AISystem OR n:LegalTheory OR n:Court) AND n.name STARTS WITH $prefix)
+            DETACH DELETE n
+        """, prefix=PREFIX)
+
+
+def _plan_totals(plan: dict) -> tuple:
+    """(peak rows out of any operator, total db hits) over a PROFILE plan tree."""
+    rows, hits = plan.get("rows", 0), plan.get("dbHits", 0)
+    for child in plan.get("children", []):
+        child_rows, child_hits = _plan_totals(child)
+        rows, hits = max(rows, child_rows), hits + child_hits
+    return rows, hits
+
+
+async def profile(driver, query: str, **params) -> tuple:
+    async with driver.session() as session:
+        start = time.perf_counter()
+        result = await session.run("PROFILE " + query, **params)
+        records = [r async for r in result]
+        summary = await result.consume()
+        elapsed = (time.perf_counter() - start) * 1000
+    return (len(records), *_plan_totals(summary.profile), elapsed)
+
+
+async def main(orgs: int = 10, systems: int = 5, theories: int = 8, courts: int = 2, cases: int = 50):
+    uri = os.getenv("NEO4J_URI", "bolt://localhost:7687")
+    user = os.getenv("NEO4J_USER", "neo4j")
+    password = os.getenv("NEO4J_PASSWORD", "dail_password")
+    driver = await get_driver(uri, user, password)
+    try:
+        await build_fixture(driver, orgs, systems, theories, courts, cases)
+        print(f"Fixture: {cases} cases x ({orgs + 1} orgs, {systems} systems, {theories} theories, {courts} courts)\n")
+        print(f"  {'query':<28} {'records':>8} {'peak rows':>10} {'db hits':>10} {'ms':>8}")
+        runs = [
+            ("case neighbors (old)", OLD_CASE_NEIGHBORS_QUERY, {"id": PREFIX + "case-0"}),
+            ("case neighbors (new)", CASE_NEIGHBORS_QUERY, {"id": PREFIX + "case-0"}),
+            ("defendant cases (old)", OLD_DEFENDANT_CASES_QUERY, {"name": PREFIX + "hub"}),
+            ("defendant cases (new)", DEFENDANT_CASES_QUERY, {"name": PREFIX + "hub"}),
+        ]
+        for label, query, params in runs:
+            await profile(driver, query, **params)  # warm the plan cache
+            records, rows, hits, ms = await profile(driver, query, **params)
+            print(f"  {label:<28} {records:>8} {rows:>10} {hits:>10} {ms:>8.1f}")
+    finally:
+        await drop_fixture(driver)
+        await driver.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the neighborhood queries with PROFILE.")
+    parser.add_argument("--orgs", type=int, default=10)
+    parser.add_argument("--systems", type=int, default=5)
+    parser.add_argument("--theories", type=int, default=8)
+    parser.add_argument("--courts", type=int, default=2)
+    parser.add_argument("--cases", type=int, default=50, help="cases sharing the hub defendant")
+    args = parser.parse_args()
+    asyncio.run(main(args.orgs, args.systems, args.theories, args.courts, args.cases))
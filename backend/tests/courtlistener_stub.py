@@ -0,0 +1,65 @@
+"""
+Local stand-in for the CourtListener REST API, used by the client tests.
+Responses are scripted per path and served by a real HTTP server on 127.0.0.1
+so retries, keep-alive and conditional headers go through the actual transport.
+"""
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class StubCourtListener:
+    def __init__(self):
+        self.routes: dict = {}
+        self.requests: list = []
+        self._server = None
+        self._thread = None
+
+    def add(self, path: str, status: int = 200, body=None, headers: dict | None = None):
+        """Queue a response for path. The last queued response is repeated once the queue drains."""
+        self.routes.setdefault(path, []).append((status, body, headers or {}))
+        return self
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address
+        return f"http://{host}:{port}"
+
+    def requests_for(self, path: str) -> list:
+        return [r for r in self.requests if r["path"] == path]
+
+    def __enter__(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                path = self.path.split("?", 1)[0]
+                stub.requests.append({"path": path, "headers": dict(self.headers)})
+                queue = stub.routes.get(path)
+                if not queue:
+                    status, body, headers = 404, {"detail": "Not found."}, {}
+                else:
+                    status, body, headers = queue.pop(0) if len(queue) > 1 else queue[0]
+                payload = b"" if body is None or status == 304 else json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                for k, v in headers.items():
+                    self.send_header(k, v)
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
@@ -112,6 +112,166 @@ async def test_courtlistener_search_handles_error():
     await client.aclose()
 
 
+@pytest.mark.asyncio
+async def test_courtlistener_retries_on_429(tmp_path):
+    from app.services.courtlistener import CourtListenerClient
+    from tests.courtlistener_stub import StubCourtListener
+    path = "/api/rest/v4/dockets/"
+    with StubCourtListener() as stub:
+        stub.add(path, 429, {"detail": "Slow down"}, {"Retry-After": "0"})
+        stub.add(path, 200, {"results": [{"id": 1}]}, {"X-RateLimit-Remaining": "41"})
+        client = CourtListenerClient(stub.base_url, cache_dir=str(tmp_path), backoff_base=0.01)
+        results = await client.search("AI", "2024-01-01", limit=5)
+        await client.aclose()
+    assert results == [{"id": 1}]
+    assert len(stub.requests_for(path)) == 2
+    assert client.rate_limit_remaining == 41
+
+
+@pytest.mark.asyncio
+async def test_courtlistener_conditional_request_uses_cache(tmp_path):
+    from app.services.courtlistener import CourtListenerClient
+    from tests.courtlistener_stub import StubCourtListener
+    path = "/api/rest/v4/opinions/7/"
+    with StubCourtListener() as stub:
+        stub.add(path, 200, {"plain_text": "Opinion text"}, {"ETag": '"v1"'})
+        stub.add(path, 304)
+        client = CourtListenerClient(stub.base_url, cache_dir=str(tmp_path), cache_ttl=0)
+        first = await client.get_opinion(7)
+        second = await client.get_opinion(7)
+        await client.aclose()
+    assert first == second == {"plain_text": "Opinion text"}
+    assert stub.requests_for(path)[1]["headers"].get("If-None-Match") == '"v1"'
+
+
+@pytest.mark.asyncio
+async def test_courtlistener_opinion_text_follows_sub_opinions(tmp_path):
+    from app.services.courtlistener import CourtListenerClient
+    from tests.courtlistener_stub import StubCourtListener
+    with StubCourtListener() as stub:
+        stub.add("/api/rest/v4/clusters/3/", 200,
+                 {"sub_opinions": ["https://www.courtlistener.com/api/rest/v4/opinions/9/"]})
+        stub.add("/api/rest/v4/opinions/9/", 200, {"plain_text": "The court holds..."})
+        client = CourtListenerClient(stub.base_url, cache_dir=str(tmp_path))
+        text = await client.get_opinion_text(3)
+        missing = await client.get_opinion_text(404)
+        await client.aclose()
+    assert text == "The court holds..."
+    assert missing == ""
+
+
+def test_strip_html_drops_markup_and_scripts():
+    from app.services.courtlistener import strip_html
+    html = "<html><style>p {}</style><p>The <b>algorithm</b> &amp; data</p><script>x()</script></html>"
+    assert strip_html(html) == "The algorithm & data"
+
+
+def test_keyword_window_keeps_densest_hits():
+    from app.ingest.enrichment import keyword_window
+    text = "x" * 5000 + " facial recognition biometric " + "y" * 5000
+    window = keyword_window(text, max_chars=200, radius=50)
+    assert len(window) <= 200
+    assert "facial recognition" in window
+    assert keyword_window("short text", max_chars=200) == "short text"
+    # Separators between windows count against max_chars
+    spread = "".join(f"{'z' * 400} chatbot {'z' * 400}" for _ in range(5))
+    for max_chars in (50, 53, 54, 110, 200):
+        window = keyword_window(spread, ["chatbot"], max_chars, radius=20)
+        assert len(window) <= max_chars and "chatbot" in window
+    assert keyword_window(spread, ["chatbot"], 200, radius=20).count(" … ") == 3
+
+
+@pytest.mark.asyncio
+async def test_enrich_candidates_bounds_concurrency():
+    from app.ingest.enrichment import enrich_candidates
+    from app.models.graph_models import StagingCase
+
+    class FakeClient:
+        active = 0
+        peak = 0
+
+        async def get_opinion_text(self, cluster_id):
+            FakeClient.active += 1
+            FakeClient.peak = max(FakeClient.peak, FakeClient.active)
+            await asyncio.sleep(0.01)
+            FakeClient.active -= 1
+            return f"opinion {cluster_id} about machine learning"
+
+    candidates = [StagingCase(clSourceId=str(i), caption="X v. Y", clusterIds=[str(i)]) for i in range(6)]
+    candidates.append(StagingCase(clSourceId="none", caption="No opinion"))
+    out = [s async for s in enrich_candidates(FakeClient(), candidates, concurrency=2)]
+    assert len(out) == 7
+    assert FakeClient.peak <= 2
+    assert sum(1 for s in out if s.opinionText) == 6
+
+
+# ---- Query planner tests ----
+
+def test_query_planner_covers_all_keywords_within_length():
+    from app.services.courtlistener import AI_LITIGATION_KEYWORDS
+    from app.services.query_planner import QueryPlanner, build_query
+    planner = QueryPlanner(AI_LITIGATION_KEYWORDS, max_query_length=60)
+    batches = []
+    while planner.has_pending():
+        batches.append(planner.next_batch())
+    assert [k for b in batches for k in b] == AI_LITIGATION_KEYWORDS
+    assert all(len(build_query(b)) <= 60 for b in batches)
+    assert len(batches) < len(AI_LITIGATION_KEYWORDS)
+
+
+def test_query_planner_widens_batches_when_headroom_is_low():
+    from app.services.query_planner import QueryPlanner
+    keywords = [f"kw{i}" for i in range(12)]
+    # Ample headroom: pack up to the preferred length (3 terms of '"kwN"' fit in 30 chars)
+    assert len(QueryPlanner(keywords, max_query_length=30).next_batch(remaining=1000)) == 3
+    assert len(QueryPlanner(keywords, max_query_length=30).next_batch()) == 3
+    assert len(QueryPlanner(keywords).next_batch(remaining=1000)) == 12
+    # 8 remaining * 0.25 share = 2 requests for 12 keywords: 6 per query, past the preferred length
+    assert len(QueryPlanner(keywords, max_query_length=30, hard_query_length=60).next_batch(remaining=8)) == 6
+    # ...but never past the hard limit
+    assert len(QueryPlanner(keywords, max_query_length=30, hard_query_length=40).next_batch(remaining=8)) == 4
+
+
+def test_attribute_keywords_matches_whole_words():
+    from app.services.query_planner import attribute_keywords, build_query
+    docket = {"case_name": "Doe v. Clearview (facial recognition)", "cause": "Biometric privacy"}
+    assert attribute_keywords(docket, ["facial recognition", "biometric", "LLM"]) == ["facial recognition", "biometric"]
+    assert build_query(["LLM", "generative AI"]) == '"LLM" OR "generative AI"'
+
+
+# ---- Ingest job store tests ----
+
+def test_job_store_checkpoints_docket_states(tmp_path):
+    from app.ingest.job_store import JobStore, FETCHED, CLASSIFIED, WRITTEN
+    store = JobStore(str(tmp_path / "jobs.db"))
+    job = store.start_or_resume("2024-01-01")
+    staging = {"clSourceId": "42", "caption": "Doe v. Acme", "docketNumber": "1:24-cv-1"}
+    store.record_fetched(job["id"], staging)
+    store.record_fetched(job["id"], staging)  # replay is a no-op
+    assert [d["cl_id"] for d in store.dockets(job["id"], FETCHED)] == ["42"]
+    store.set_state(job["id"], "42", CLASSIFIED, classification={"isAiLitigation": True})
+    store.set_state(job["id"], "42", WRITTEN, outcome="added")
+    assert store.dockets(job["id"], WRITTEN)[0]["classification"] == {"isAiLitigation": True}
+    assert store.outcome_counts(job["id"]) == {"added": 1}
+    store.close()
+
+
+def test_job_store_resumes_job_of_dead_owner(tmp_path):
+    from app.ingest.job_store import JobStore
+    path = str(tmp_path / "jobs.db")
+    store = JobStore(path)
+    job = store.start_or_resume("2024-01-01")
+    store.conn.execute("UPDATE ingest_jobs SET owner = 'gone-host:1' WHERE id = ?", (job["id"],))
+    store.close()
+
+    store = JobStore(path)
+    assert store.start_or_resume("2024-02-01")["id"] == job["id"]
+    store.complete(job["id"])
+    assert store.find_resumable() is None
+    assert store.start_or_resume("2024-02-01")["id"] != job["id"]
+    store.close()
+
+
 # ---- Claude service tests (mocked) ----
 
 @pytest.mark.asyncio
@@ -209,3 +369,762 @@ async def test_root_endpoint():
                         assert r.status_code == 200
                         data = r.json()
                         assert data["name"] == "DAIL Living Case Graph API"
+
+
+# ---- Scheduler leader election tests ----
+
+@pytest.mark.asyncio
+async def test_file_leader_lock_is_exclusive(tmp_path):
+    from app.ingest.leader import FileLeaderLock
+    path = str(tmp_path / "scheduler.lock")
+    first, second = FileLeaderLock(path), FileLeaderLock(path)
+    assert await first.acquire() is True
+    assert await first.acquire() is True  # renewing is a no-op
+    assert await second.acquire() is False
+    await first.release()
+    assert await second.acquire() is True
+    await second.release()
+
+
+@pytest.mark.asyncio
+async def test_elect_leader_adds_and_removes_ingest_jobs():
+    from app.ingest import scheduler as sched
+
+    class FakeElector:
+        leader = True
+
+        async def acquire(self):
+            return self.leader
+
+    elector = FakeElector()
+    with patch.object(sched, "_elector", elector), \
+            patch.object(sched, "has_resumable_ingest", return_value=False):
+        await sched._elect_leader()
+        assert sched.scheduler.get_job("weekly_ingest") is not None
+        elector.leader = False
+        await sched._elect_leader()
+        assert sched.scheduler.get_job("weekly_ingest") is None
+
+
+# ---- Seeding tests ----
+
+def test_vectorized_cleaning_matches_cell_helpers():
+    import numpy as np
+    import pandas as pd
+    from app.ingest.dail_tables import clean_list, clean_date, clean_val, list_col, date_col, str_col
+    lists = pd.Series(["Title VII, ADA Violation", np.nan, ",,nan,none,", "'a', 'b'", "Plaintiffs'"], index=[4, 2, 0, 3, 1])
+    dates = pd.Series(["2023-07-11", "07/11/2023", "not-a-date", np.nan])
+    texts = pd.Series([np.nan, "  hi  ", 12.0])
+    assert list_col(lists).tolist() == [clean_list(v) for v in lists]
+    assert date_col(dates).tolist() == [clean_date(v) for v in dates]
+    assert str_col(texts).tolist() == [clean_val(v) for v in texts]
+
+
+def test_dail_tables_resolves_children_once(tmp_path):
+    import pandas as pd
+    from app.ingest.dail_tables import DailTables, pipe_col
+    pd.DataFrame({
+        "id": [1, 2], "Case_snug": ["a-v-b", "c-v-d"], "Caption": ["A v B", "C v D"],
+        "Cause_of_Action_Text": ["Title VII, ADA", None],
+    }).to_csv(tmp_path / "dail_cases.csv", index=False)
+    pd.DataFrame({
+        "id": ["d1", "d2", "d3"], "Case_Number": [1, 9, "n/a"], "court": ["SDNY", "", ""],
+    }).to_csv(tmp_path / "dail_dockets.csv", index=False)
+    tables = DailTables(str(tmp_path))
+    assert tables.documents is None
+    assert tables.dockets[["id", "caseId"]].values.tolist() == [["d1", "a-v-b"]]
+    assert tables.orphaned["dockets"] == 1
+    assert pipe_col(tables.cases["causeOfAction"]).tolist() == ["Title VII|ADA", ""]
+
+
+def test_diff_rows_splits_inserted_changed_deleted():
+    import pandas as pd
+    from app.ingest.dail_tables import content_hash
+    from app.ingest.seed_diff import diff_rows
+    old = pd.DataFrame({"id": ["a", "b", "c"], "court": ["x", "y", "z"]})
+    stored = dict(zip(old["id"], content_hash(old)))
+    new = pd.DataFrame({"id": ["a", "b", "d"], "court": ["x", "y2", "w"]})
+    delta = diff_rows(new.assign(contentHash=content_hash(new)), stored)
+    assert delta.inserted["id"].tolist() == ["d"]
+    assert delta.changed["id"].tolist() == ["b"]
+    assert delta.deleted == ["c"]
+    assert delta.summary() == "+1 ~1 -1"
+    unchanged = diff_rows(old.assign(contentHash=content_hash(old)), stored)
+    assert not unchanged
+
+
+def test_bulk_import_files_dedupe_into_id_spaces(tmp_path):
+    import pandas as pd
+    from app.ingest.bulk_import import ARRAY_DELIMITER, import_command, write_import_files
+    from app.ingest.dail_tables import DailTables
+    pd.DataFrame({
+        "id": [1, 2], "Case_snug": ["a-v-b", "c-v-d"], "Caption": ["A v B", "C v D"],
+        "Cause_of_Action_Text": ["Title VII, ADA, Title VII", "ADA"],
+        "Jurisdiction_Filed": ["S.D.N.Y.", "S.D.N.Y."],
+        "Organizations_involved": ["Clearview AI, Inc.; Acme et al.", "Acme Corp."],
+    }).to_csv(tmp_path / "dail_cases.csv", index=False)
+    pd.DataFrame({
+        "id": [7, 8], "Case_Number": [1, 2], "Secondary_Source_Title": ["T", "T"],
+        "Secondary_Source_Link": ["http://x", "http://x"],
+    }).to_csv(tmp_path / "dail_secondary_sources.csv", index=False)
+    out = tmp_path / "import"
+    files = write_import_files(DailTables(str(tmp_path)), str(out))
+
+    def lines(name):
+        return (out / f"{name}.csv").read_text().splitlines()
+
+    assert (out / "legal_theories_header.csv").read_text() == "name:ID(LegalTheory)\n"
+    assert lines("legal_theories") == ["ADA", "Title VII"]
+    assert lines("asserts_claim") == ["a-v-b,ADA", "a-v-b,Title VII", "c-v-d,ADA"]
+    assert lines("courts") == ["S.D.N.Y.,"]
+    assert len(lines("secondary_sources")) == 1 and len(lines("has_secondary_source")) == 2
+    assert f"Title VII{ARRAY_DELIMITER}ADA{ARRAY_DELIMITER}Title VII" in lines("cases")[0]
+    assert "--relationships=FILED_IN=" in import_command(files)
+    # No extraction CSV: organizations come from Organizations_involved, suffixes folded together
+    assert lines("organizations") == ["Acme,Acme Corp.", 'Clearview AI,"Clearview AI, Inc."']
+    assert lines("named_defendant") == ["a-v-b,Acme,,,dail,false", "a-v-b,Clearview AI,,,dail,false",
+                                        "c-v-d,Acme,,,dail,false"]
+
+
+def test_convert_streams_to_typed_parquet_matching_csv(tmp_path, monkeypatch):
+    pytest.importorskip("pyarrow")
+    import datetime
+    import pandas as pd
+    from openpyxl import Workbook
+    from app.ingest import columnar, convert_xlsx
+    from app.ingest.dail_tables import DailTables
+    wb = Workbook()
+    wb.active.append(["id", "Case_snug", "Caption", "Status_Disposition", "Published_Opinions_binary",
+                      "Cause_of_Action_Text", "Date_Action_Filed"])
+    wb.active.append([1, None, "Doe v. Acme", "active", None, "Title VII, ADA", datetime.datetime(2023, 7, 11)])
+    wb.active.append([2, "roe-v-x", "Roe v X", None, 1, None, "07/12/2023"])
+    wb.active.append([3, "z", "Z", "settled", 0, "'a', 'b'", None])
+    wb.save(tmp_path / convert_xlsx.CASES_XLSX)
+    assert convert_xlsx.convert_cases(str(tmp_path), chunk_rows=2) == 3
+
+    typed = pd.read_parquet(tmp_path / "dail_cases.parquet")
+    assert typed["id"].dtype == "int64"
+    assert list(typed["Cause_of_Action_Text"][0]) == ["Title VII", "ADA"]
+    assert typed["Date_Action_Filed"][1] == datetime.date(2023, 7, 12)
+
+    from_parquet = DailTables(str(tmp_path)).cases
+    monkeypatch.setattr(columnar, "pq", None)
+    from_csv = DailTables(str(tmp_path)).cases
+    assert from_parquet["id"].tolist() == ["doe-v-acme", "roe-v-x", "z"]
+    assert from_parquet.equals(from_csv)
+
+
+def test_pipeline_skips_stages_with_unchanged_inputs(tmp_path):
+    from concurrent.futures import ThreadPoolExecutor
+    from app.ingest.pipeline import Pipeline, Stage
+    calls = []
+
+    def convert():
+        calls.append("convert")
+        text = (tmp_path / "source.txt").read_text()
+        (tmp_path / "clean.txt").write_text(text.strip())
+
+    def stage(name):
+        return lambda: calls.append(name)
+
+    def pipeline():
+        return Pipeline([
+            Stage("convert", convert, inputs=["source.txt"], outputs=["clean.txt"]),
+            Stage("seed", stage("seed"), inputs=["clean.txt"], after=["convert"]),
+            Stage("extract", stage("extract"), after=["seed"]),
+            Stage("export", stage("export"), inputs=["clean.txt"], after=["convert"]),
+        ], data_dir=str(tmp_path))
+
+    (tmp_path / "source.txt").write_text("rows")
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        first = pipeline().run(executor=pool)
+        assert sorted(calls) == ["convert", "export", "extract", "seed"]
+        assert all(r["status"] == "ran" for r in first.values())
+
+        calls.clear()
+        assert all(r["status"] == "skipped" for r in pipeline().run(executor=pool).values())
+        assert calls == []
+
+        # A dry run can't know convert's new output, so reports its dependents as running too
+        (tmp_path / "source.txt").write_text("rows\n")
+        planned = pipeline().run(executor=pool, dry_run=True)
+        assert {r["status"] for r in planned.values()} == {"would run"} and calls == []
+
+        # Source changed but cleans to the same output: only convert re-runs
+        pipeline().run(executor=pool)
+        assert calls == ["convert"]
+
+        calls.clear()
+        pipeline().run(executor=pool, force=["seed"])
+        assert sorted(calls) == ["extract", "seed"]
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_export_data_sql_streams_multirow_inserts(tmp_path, jobs):
+    import gzip
+    import sqlite3
+    from app.ingest.export_sql import SCHEMA_SQL, export_data_sql
+    db = str(tmp_path / "dail.db")
+    conn = sqlite3.connect(db)
+    conn.executescript(SCHEMA_SQL)
+    conn.executemany(
+        "INSERT INTO cases (id, caption, status, date_filed) VALUES (?, ?, ?, ?)",
+        [(f"case-{i}", f"O'Brien v. Acme {i}", "Active", None) for i in range(5)],
+    )
+    conn.execute("INSERT INTO secondary_sources (id, case_id, title, link) VALUES (7, 'case-0', 'a\tb', 'http://x')")
+    conn.commit()
+    conn.close()
+
+    out = export_data_sql(db, compress=True, batch_rows=2, jobs=jobs, out_dir=str(tmp_path))
+    with gzip.open(out, "rt", encoding="utf-8") as f:
+        script = f.read()
+    assert script.count("INSERT OR IGNORE INTO cases") == 3
+    restored = sqlite3.connect(":memory:")
+    restored.executescript(SCHEMA_SQL)
+    restored.executescript(script)
+    assert restored.execute("SELECT COUNT(*) FROM cases WHERE date_filed IS NULL").fetchone()[0] == 5
+    assert restored.execute("SELECT id, title FROM secondary_sources").fetchall() == [(7, "a\tb")]
+
+    from pathlib import Path
+    copy = Path(export_data_sql(db, fmt="copy", out_dir=str(tmp_path))).read_text(encoding="utf-8")
+    assert "COPY secondary_sources (id, case_id, title, link) FROM STDIN;\n7\tcase-0\ta\\tb\thttp://x\n\\.\n" in copy
+    assert "case-0\tNULL" not in copy and "\\N" in copy
+
+
+def test_fts_search_ranks_cases_and_quotes_user_input():
+    import sqlite3
+    from app.ingest.export_sql import SCHEMA_SQL
+    from app.ingest.sql_search import build_fts, fts_query, search_cases, search_secondary_sources
+    conn = sqlite3.connect(":memory:")
+    conn.executescript(SCHEMA_SQL)
+    conn.executemany("INSERT INTO cases (id, caption, brief_description) VALUES (?, ?, ?)", [
+        ("a", "Doe v. Clearview AI", "Facial recognition scraping of photos"),
+        ("b", "Roe v. Acme", "Claims that a hiring tool used facial recognition"),
+        ("c", "Poe v. Initech", "Copyright in training data"),
+    ])
+    conn.execute("INSERT INTO secondary_sources (id, case_id, title, link) VALUES (1, 'a', 'Recognizing faces', 'http://x')")
+    build_fts(conn)
+
+    assert fts_query('clearview" OR (ai') == '"clearview" "OR" "ai"'
+    assert fts_query("algorith*") == '"algorith"*'
+    assert [r["id"] for r in search_cases(conn, "facial recognitions")] in (["a", "b"], ["b", "a"])
+    assert search_cases(conn, "clearview recognition")[0]["id"] == "a"
+    assert search_cases(conn, "copyr*")[0]["id"] == "c"
+    assert search_cases(conn, "scraped")[0]["snippet"].startswith("Facial recognition [scraping]")
+    assert search_cases(conn, "?!") == []
+    assert [r["id"] for r in search_secondary_sources(conn, "recognize")] == [1]
+
+
+@pytest.mark.asyncio
+async def test_export_graph_writes_only_changed_rows(tmp_path, monkeypatch):
+    import sqlite3
+    from app.ingest import export_graph as eg
+    graph = {
+        "Case": [{"key": "a-v-b", "props": {"id": "a-v-b", "caption": "A v. B", "issues": ["bias"]}}],
+        "Organization": [
+            {"key": "acme", "props": {"canonicalName": "acme", "name": "Acme"}},
+            {"key": "initech", "props": {"canonicalName": "initech", "name": "Initech"}},
+        ],
+        "NAMED_DEFENDANT": [
+            {"start": "a-v-b", "end": "acme", "props": {"roles": ["developer"], "reviewedByHuman": True}},
+            {"start": "a-v-b", "end": "initech", "props": {"roles": []}},
+        ],
+    }
+    version = {"n": 1}
+
+    class Result:
+        def __init__(self, records):
+            self.records = records
+
+        async def __aiter__(self):
+            for r in self.records:
+                yield r
+
+    class Session:
+        async def run(self, cypher):
+            kind = next((k for k in graph if f"(n:{k})" in cypher or f"[r:{k}]" in cypher), None)
+            return Result(graph.get(kind, []))
+
+    driver = MagicMock()
+    driver.session.return_value.__aenter__ = AsyncMock(return_value=Session())
+    driver.session.return_value.__aexit__ = AsyncMock(return_value=False)
+    monkeypatch.setattr(eg, "get_graph_version", AsyncMock(side_effect=lambda d: version["n"]))
+    db = str(tmp_path / "graph.db")
+
+    first = await eg.export_graph(driver, db)
+    assert first["tables"]["organizations"]["inserted"] == 2
+    assert (await eg.export_graph(driver, db))["skipped"]
+
+    graph["Organization"][0]["props"]["name"] = "Acme Corp"
+    graph["Organization"].pop()
+    graph["NAMED_DEFENDANT"].pop()
+    version["n"] = 2
+    second = await eg.export_graph(driver, db)
+    assert second["tables"]["organizations"] == {"inserted": 0, "updated": 1, "deleted": 1}
+    assert second["tables"]["cases"] == {"inserted": 0, "updated": 0, "deleted": 0}
+    conn = sqlite3.connect(db)
+    assert conn.execute("SELECT case_id, organization, roles, reviewed_by_human FROM named_defendant").fetchall() == [
+        ("a-v-b", "acme", '["developer"]', 1)
+    ]
+    assert conn.execute("SELECT value FROM export_meta WHERE key = 'graph_version'").fetchone() == ("2",)
+
+    # A file from before the score columns existed is migrated and refilled at the same version
+    graph["Organization"][0]["props"]["pagerank"] = 0.5
+    conn.executescript("""
+        DROP TABLE organizations;
+        CREATE TABLE organizations (canonical_name TEXT PRIMARY KEY, name TEXT,
+                                    properties TEXT NOT NULL, content_hash TEXT NOT NULL);
+        INSERT INTO organizations VALUES ('acme', 'Acme Corp', '{}', 'stale');
+    """)
+    third = await eg.export_graph(driver, db)
+    assert not third["skipped"] and third["tables"]["organizations"]["updated"] == 1
+    assert conn.execute("SELECT canonical_name, pagerank FROM organizations").fetchall() == [("acme", 0.5)]
+    conn.close()
+
+
+@pytest.mark.asyncio
+async def test_get_neighborhoods_dedupes_shared_nodes():
+    from app.services.neo4j_service import get_neighborhoods
+
+    class Result:
+        def __init__(self, records):
+            self.records = records
+
+        async def __aiter__(self):
+            for r in self.records:
+                yield r
+
+    def case(cid, orgs, theories):
+        return {
+            "case": {"id": cid, "caption": cid.upper()},
+            "orgs": [{"name": o, "confidence": 0.9, "roles": ["developer"]} for o in orgs],
+            "systems": [], "theories": theories, "courts": ["N.D. Cal."],
+        }
+
+    session = MagicMock()
+    session.run = AsyncMock(return_value=Result([
+        case("a", ["OpenAI", "Microsoft"], ["Copyright"]),
+        case("b", ["OpenAI"], ["Copyright", "DMCA"]),
+    ]))
+    driver = MagicMock()
+    driver.session.return_value.__aenter__ = AsyncMock(return_value=session)
+    driver.session.return_value.__aexit__ = AsyncMock(return_value=False)
+
+    graph = await get_neighborhoods(driver, ["a", "b"], ["OpenAI"])
+    assert session.run.await_count == 1
+    assert session.run.call_args.kwargs == {"caseIds": ["a", "b"], "orgNames": ["OpenAI"], "perOrg": 25}
+    ids = [n["id"] for n in graph["nodes"]]
+    assert sorted(ids) == sorted(set(ids))
+    assert {"org-OpenAI", "theory-Copyright", "court-N.D. Cal."} <= set(ids)
+    assert len(graph["edges"]) == 8
+    assert {"source": "b", "target": "org-OpenAI", "type": "NAMED_DEFENDANT",
+            "confidence": 0.9, "roles": ["developer"]} in graph["edges"]
+
+
+@pytest.mark.asyncio
+async def test_ego_network_streams_bfs_within_node_budget():
+    from app.services.neo4j_service import stream_ego_network
+
+    def row(src, eid, label, key, degree=1, rel="NAMED_DEFENDANT", outgoing=False):
+        prop = {"Case": "id", "Organization": "canonicalName"}[label]
+        return {"from": src, "eid": eid, "label": label, "props": {prop: key}, "type": rel,
+                "outgoing": outgoing, "degree": degree}
+
+    hops = [
+        [row("o1", "c1", "Case", "a-v-openai", degree=3), row("o1", "c2", "Case", "b-v-openai", degree=3)],
+        [row("c1", "o2", "Organization", "Microsoft", outgoing=True),
+         row("c2", "o2", "Organization", "Microsoft", outgoing=True),
+         row("c2", "o3", "Organization", "Nvidia", outgoing=True)],
+    ]
+
+    class Result:
+        def __init__(self, records):
+            self.records = records
+
+        async def __aiter__(self):
+            for r in self.records:
+                yield r
+
+    session = MagicMock()
+    session.run = AsyncMock(side_effect=[Result(h) for h in hops])
+    driver = MagicMock()
+    driver.session.return_value.__aenter__ = AsyncMock(return_value=session)
+    driver.session.return_value.__aexit__ = AsyncMock(return_value=False)
+
+    seed = {"eid": "o1", "kind": "node", "id": "org-OpenAI", "type": "Organization", "label": "OpenAI", "hop": 0}
+    items = [i async for i in stream_ego_network(driver, seed, hops=2, fanout=2, max_nodes=4)]
+    nodes = [i["id"] for i in items if i["kind"] == "node"]
+    assert nodes == ["org-OpenAI", "a-v-openai", "b-v-openai", "org-Microsoft"]
+    edges = [(i["source"], i["target"]) for i in items if i["kind"] == "edge"]
+    assert edges == [("a-v-openai", "org-OpenAI"), ("b-v-openai", "org-OpenAI"),
+                     ("a-v-openai", "org-Microsoft"), ("b-v-openai", "org-Microsoft")]
+    assert items[-1] == {"kind": "done", "hops": 2, "nodes": 4, "edges": 4, "truncated": True}
+    assert session.run.call_args_list[1].kwargs["frontier"] == ["c1", "c2"]
+
+
+@pytest.mark.asyncio
+async def test_refresh_co_defendants_stamps_then_prunes_one_build():
+    from app.services.neo4j_service import CO_DEFENDANT_PRUNE, CO_DEFENDANT_UPSERT, refresh_co_defendants
+    result = MagicMock()
+    result.consume = AsyncMock(return_value=MagicMock(
+        counters=MagicMock(relationships_created=3, relationships_deleted=1)
+    ))
+    session = MagicMock()
+    session.run = AsyncMock(return_value=result)
+    driver = MagicMock()
+    driver.session.return_value.__aenter__ = AsyncMock(return_value=session)
+    driver.session.return_value.__aexit__ = AsyncMock(return_value=False)
+
+    assert await refresh_co_defendants(driver, case_ids=[]) == {"created": 0, "deleted": 0}
+    assert session.run.await_count == 0
+
+    assert await refresh_co_defendants(driver, case_ids=["a-v-b"]) == {"created": 3, "deleted": 1}
+    (upsert, upsert_kw), (prune, prune_kw) = [(c.args[0], c.kwargs) for c in session.run.call_args_list]
+    assert (upsert, prune) == (CO_DEFENDANT_UPSERT, CO_DEFENDANT_PRUNE)
+    assert upsert_kw == prune_kw and upsert_kw["caseIds"] == ["a-v-b"]
+
+
+def test_graph_analytics_centrality_on_small_graphs():
+    import numpy as np
+    from app.services.graph_analytics import GraphMatrix, betweenness, centrality, pagerank
+    # Path a-b-c-d, given twice to check duplicate edges collapse
+    path = GraphMatrix.from_edges([("a", "b"), ("b", "c"), ("c", "d"), ("b", "a")])
+    assert path.degree().tolist() == [1, 2, 2, 1]
+    assert betweenness(path, samples=None).tolist() == [0.0, 2.0, 2.0, 0.0]
+    # Two cases sharing a defendant: the org sits on every case-to-case path
+    star = GraphMatrix.from_edges([
+        (("Case", f"c{i}"), ("Organization", "Acme")) for i in range(4)
+    ] + [(("Case", "c0"), ("AISystem", "Face"))])
+    scores = centrality(star, samples=None)
+    acme = star.index[("Organization", "Acme")]
+    assert int(np.argmax(scores["pagerank"])) == acme
+    assert abs(scores["pagerank"].sum() - 1.0) < 1e-9
+    assert scores["betweenness"][acme] == 6.0 + 3.0  # 4 choose 2 case pairs + c1..c3 to Face
+    assert np.allclose(betweenness(star, samples=len(star)), scores["betweenness"])
+    assert np.allclose(pagerank(GraphMatrix.from_edges([("x", "y")])), [0.5, 0.5])
+
+
+def test_community_detection_splits_bridged_cliques():
+    import itertools
+    import numpy as np
+    from app.ingest.communities import summarize
+    from app.services.graph_analytics import label_propagation, louvain
+    # Two 5-cliques (0-4 heavier) joined by a single light edge, plus an isolated node
+    pairs = list(itertools.combinations(range(5), 2)) + list(itertools.combinations(range(5, 10), 2)) + [(4, 5)]
+    src = np.array([a for a, _ in pairs])
+    dst = np.array([b for _, b in pairs])
+    weight = np.array([2.0 if b < 5 else 1.0 for _, b in pairs])
+    weight[-1] = 0.5
+    for detect in (louvain, label_propagation):
+        labels = detect(11, src, dst, weight)
+        assert labels[:10].tolist() == [0] * 5 + [1] * 5, detect.__name__
+        assert labels[10] == 2
+    nodes = [("Organization", f"org{i}") for i in range(8)] + [("LegalTheory", f"t{i}") for i in range(3)]
+    strength = np.arange(11, dtype=float)
+    top = summarize(nodes, louvain(11, src, dst, weight), strength)
+    assert [s["size"] for s in top] == [5, 5, 1]
+    assert top[1]["topOrganizations"] == ["org7", "org6", "org5"]
+    assert top[1]["topTheories"] == ["t1", "t0"]
+    assert top[2] == {"id": 2, "size": 1, "organizationCount": 0, "theoryCount": 1,
+                      "topOrganizations": [], "topTheories": ["t2"]}
+
+
+@pytest.mark.asyncio
+async def test_find_paths_prefers_low_degree_connections():
+    from app.services import path_finder
+    from app.services.graph_analytics import GraphMatrix
+    from app.services.graph_replica import REL_TARGETS, GraphReplica, ReplicaManager
+    from app.services.path_finder import PathGraph, describe, find_paths
+    acme, beta = ("Organization", "Acme"), ("Organization", "Beta")
+    hub, rare = ("LegalTheory", "Negligence"), ("LegalTheory", "BIPA")
+    edges = [
+        (("Case", "c1"), acme), (("Case", "c1"), hub), (("Case", "c2"), hub), (("Case", "c2"), beta),
+        (("Case", "c3"), acme), (("Case", "c3"), rare), (("Case", "c4"), rare), (("Case", "c4"), beta),
+        (("Case", "c9"), ("Organization", "Loner")),
+    ] + [(("Case", f"x{i}"), hub) for i in range(10)]
+    graph = GraphMatrix.from_edges(edges)
+    found = find_paths(graph, graph.index[acme], graph.index[beta], k=5)
+    assert found["hops"] == 4 and not found["truncated"]
+    assert [[graph.nodes[i][1] for i in p["nodes"]] for p in found["paths"]] == [
+        ["Acme", "c3", "BIPA", "c4", "Beta"], ["Acme", "c1", "Negligence", "c2", "Beta"],
+    ]
+    assert describe(graph, found)["paths"][0]["edges"][1] == {"source": "c3", "target": "theory-BIPA", "type": "ASSERTS_CLAIM"}
+    assert find_paths(graph, graph.index[acme], graph.index[beta], max_hops=3)["hops"] is None
+    assert find_paths(graph, graph.index[acme], graph.index[("Organization", "Loner")])["paths"] == []
+    cache = PathGraph()
+    cache.graph = graph
+    assert cache.resolve("Acme") == graph.index[acme]
+    assert cache.resolve("c3") == graph.index[("Case", "c3")]
+    assert cache.resolve("Acme", "LegalTheory") is None
+
+    # With the replica serving, its relationships are the path graph; Neo4j is not asked
+    rels = {label: rel for rel, label in REL_TARGETS.items()}
+    edge_rows = {rel: [] for rel in REL_TARGETS}
+    for (_, case), (label, key) in edges:
+        edge_rows[rels[label]].append({"case": case, "key": key})
+    manager = ReplicaManager()
+    manager.enabled = True
+    manager.current = GraphReplica.build(9, [], {label: [] for label in rels}, edge_rows)
+    driver = MagicMock()
+    with patch.object(path_finder, "replica_manager", manager):
+        cache = PathGraph()
+        shared = await cache.get(driver)
+        assert await cache.get(driver) is shared and cache.version == 9
+    assert not driver.session.called
+    found = find_paths(shared, cache.resolve("acme"), cache.resolve("Beta"), k=5)
+    assert [[shared.nodes[i][1] for i in p["nodes"]] for p in found["paths"]] == [
+        ["Acme", "c3", "BIPA", "c4", "Beta"], ["Acme", "c1", "Negligence", "c2", "Beta"],
+    ]
+
+
+@pytest.mark.asyncio
+async def test_graph_replica_answers_reads_and_refreshes_changed_cases():
+    from app.services.graph_replica import CASES_QUERY, VERSION_QUERY, ReplicaManager
+    graph = {
+        "cases": [
+            {"key": "a", "caption": "A v. Acme", "status": "Active", "dateFiled": "2020-01-02", "jurisdictionType": "Federal"},
+            {"key": "b", "caption": "B v. Acme", "status": "Inactive", "dateFiled": "2021-05-01", "jurisdictionType": "State"},
+            {"key": "c", "caption": "C v. Acme", "status": "Active", "dateFiled": "", "jurisdictionType": None},
+        ],
+        "NAMED_DEFENDANT": [("a", "Acme"), ("b", "Acme"), ("c", "Acme"), ("c", "Beta")],
+        "INVOLVES_SYSTEM": [("a", "Face")],
+        "ASSERTS_CLAIM": [("a", "BIPA"), ("c", "BIPA")],
+    }
+    meta = {"version": 3, "changes": []}
+    case_queries = []
+
+    class Result:
+        def __init__(self, rows):
+            self.rows = rows
+
+        async def single(self):
+            return self.rows[0]
+
+        async def __aiter__(self):
+            for row in self.rows:
+                yield row
+
+    async def run(query, **params):
+        ids = params.get("ids")
+        if query == VERSION_QUERY:
+            return Result([meta])
+        if query == CASES_QUERY:
+            case_queries.append(ids)
+            return Result([c for c in graph["cases"] if ids is None or c["key"] in ids])
+        if "MATCH (c:Case)-[" in query:
+            rel = query.split("[:")[1].split("]")[0]
+            return Result([{"case": c, "key": k} for c, k in graph[rel] if ids is None or c in ids])
+        label = query.split("(n:")[1].split(")")[0]
+        keys = {"Organization": ["Acme", "Beta"], "AISystem": ["Face"], "LegalTheory": ["BIPA"]}[label]
+        scores = {"Acme": 0.2, "Beta": 0.7}
+        return Result([{"key": k, "category": "vision", "pagerank": scores.get(k), "betweenness": None, "degree": 1}
+                       for k in keys])
+
+    session = MagicMock()
+    session.run = run
+    driver = MagicMock()
+    driver.session.return_value.__aenter__ = AsyncMock(return_value=session)
+    driver.session.return_value.__aexit__ = AsyncMock(return_value=False)
+
+    manager = ReplicaManager()
+    assert manager.serving() is None
+    assert await manager.refresh(driver)
+    manager.enabled = True
+    replica = manager.serving()
+    assert replica.top_defendants(5) == [
+        {"canonicalName": "Acme", "caseCount": 3, "activeCount": 2, "inactiveCount": 1},
+        {"canonicalName": "Beta", "caseCount": 1, "activeCount": 1, "inactiveCount": 0},
+    ]
+    assert [r["canonicalName"] for r in replica.top_defendants(5, "pagerank")] == ["Beta", "Acme"]
+    assert replica.cases_by_year() == [{"year": "2020", "count": 1}, {"year": "2021", "count": 1}]
+    assert replica.defendant_cases("Beta") == [{
+        "id": "c", "caption": "C v. Acme", "status": "Active", "dateFiled": "", "jurisdictionType": None,
+        "theories": ["BIPA"], "aiSystems": [],
+    }]
+    assert replica.similar_cases("a") == [{"id": "c", "caption": "C v. Acme", "status": "Active", "totalOverlap": 2}]
+    assert replica.top_ai_systems() == [{"name": "Face", "category": "vision", "caseCount": 1}]
+    assert not await manager.refresh(driver)  # same version: nothing re-read
+
+    # Version 4 logged case b as changed (now dropped Acme for Beta): only b is re-read
+    graph["cases"][1]["status"] = "Active"
+    graph["NAMED_DEFENDANT"][1] = ("b", "Beta")
+    meta.update(version=4, changes=[{"version": 4, "caseIds": ["b"]}])
+    assert await manager.refresh(driver)
+    assert case_queries == [None, ["b"]]
+    assert manager.serving().version == 4
+    assert [(r["canonicalName"], r["caseCount"]) for r in manager.serving().top_defendants(5)] == [("Acme", 2), ("Beta", 2)]
+    assert replica.top_defendants(1)[0]["caseCount"] == 3  # earlier snapshot untouched
+
+    # An unlogged version (bump without case ids) forces a full reload
+    meta.update(version=6, changes=[{"version": 6, "caseIds": []}])
+    assert await manager.refresh(driver)
+    assert case_queries[-1] is None
+
+
+def test_graph_snapshot_round_trips_and_rejects_corruption(tmp_path):
+    import json
+    import shutil
+    from app.services.graph_replica import GraphReplica, replica_from_arrays, replica_to_arrays
+    from app.services.graph_snapshot import load_snapshot, save_snapshot
+    cases = [
+        {"key": "a", "caption": "A v. Ácme", "status": "Active", "dateFiled": "2020-01-02", "jurisdictionType": "Federal"},
+        {"key": "b", "caption": "B v. Acme", "status": "Inactive", "dateFiled": None, "jurisdictionType": None},
+    ]
+    nodes = {
+        "Organization": [{"key": "Acme", "pagerank": 0.5, "betweenness": None, "degree": 2}],
+        "AISystem": [{"key": "Face", "category": None, "pagerank": None, "betweenness": None, "degree": 1}],
+        "LegalTheory": [{"key": "BIPA"}],
+    }
+    edges = {
+        "NAMED_DEFENDANT": [{"case": "a", "key": "Acme"}, {"case": "b", "key": "Acme"}],
+        "INVOLVES_SYSTEM": [{"case": "a", "key": "Face"}],
+        "ASSERTS_CLAIM": [{"case": "a", "key": "BIPA"}, {"case": "b", "key": "BIPA"}],
+    }
+    original = GraphReplica.build(7, cases, nodes, edges)
+    save_snapshot(replica_to_arrays(original), 7, str(tmp_path))
+    save_snapshot(replica_to_arrays(original), 7, str(tmp_path))  # replaces the first, old dir removed
+    assert len([d for d in os.listdir(tmp_path) if d.startswith("v7-")]) == 1
+
+    # Cleanup keeps the directory the manifest points to after the swap, even if another writer made it
+    from app.services import graph_snapshot
+    real_read = graph_snapshot.read_manifest
+    swapped = {}
+
+    def read_after_other_writer(snapshot_dir):
+        manifest = real_read(snapshot_dir)
+        if not swapped:
+            other = tmp_path / "v7-other"
+            shutil.copytree(tmp_path / manifest["dir"], other)
+            swapped.update(manifest, dir="v7-other")
+            (tmp_path / "manifest.json").write_text(json.dumps(swapped))
+        return swapped
+
+    with patch.object(graph_snapshot, "read_manifest", read_after_other_writer):
+        ours = save_snapshot(replica_to_arrays(original), 7, str(tmp_path))
+    assert sorted(d for d in os.listdir(tmp_path) if d.startswith("v7-")) == ["v7-other"]
+    assert ours["dir"] != "v7-other"
+
+    manifest, arrays = load_snapshot(str(tmp_path))
+    loaded = replica_from_arrays(manifest["graphVersion"], arrays)
+    assert loaded.version == 7 and loaded.stats()["source"] == "snapshot"
+    for read in ("top_defendants", "top_ai_systems", "cases_by_year"):
+        assert getattr(loaded, read)() == getattr(original, read)()
+    assert loaded.defendant_cases("Acme") == original.defendant_cases("Acme")
+    assert loaded.similar_cases("a") == original.similar_cases("a")
+
+    # Incremental builds can start from a memory-mapped snapshot
+    changed = GraphReplica.build(8, [dict(cases[1], status="Active")], nodes,
+                                 {rel: [r for r in rows if r["case"] == "b"] for rel, rows in edges.items()},
+                                 base=loaded, case_ids=["b"])
+    assert changed.top_defendants()[0]["activeCount"] == 2
+
+    # Startup checks sizes only; flipped bytes need the opt-in checksum pass
+    path = tmp_path / manifest["dir"] / manifest["arrays"]["cases.alive"]["file"]
+    path.write_bytes(path.read_bytes()[:-1] + b"\x07")
+    assert load_snapshot(str(tmp_path)) is not None
+    assert load_snapshot(str(tmp_path), verify=True) is None
+    path.write_bytes(path.read_bytes()[:-1])
+    assert load_snapshot(str(tmp_path)) is None
+    assert load_snapshot(str(tmp_path / "missing")) is None
+
+
+@pytest.mark.asyncio
+async def test_sqlite_read_store_serves_reads_when_neo4j_is_down(tmp_path, monkeypatch):
+    import sqlite3
+    from neo4j.exceptions import ServiceUnavailable
+    from app.ingest import export_graph as eg
+    from app.services import neo4j_service
+    from app.services.sqlite_store import RANKED_DEFENDANTS_SQL, read_store
+    case = lambda cid, status, filed, areas: {"key": cid, "props": {
+        "id": cid, "caption": f"{cid} v. Acme", "status": status, "dateFiled": filed,
+        "jurisdictionType": "Federal", "areaOfApplication": areas,
+    }}
+    graph = {
+        "Case": [case("a", "Active", "2020-01-02", ["Facial Recognition"]), case("b", "Inactive", "2015-03-01", []),
+                 case("c", "Active", None, ["Chatbots"])],
+        "Organization": [{"key": "Acme", "props": {"canonicalName": "Acme", "pagerank": 0.1}},
+                         {"key": "Beta", "props": {"canonicalName": "Beta", "pagerank": 0.9}},
+                         {"key": "Aardvark", "props": {"canonicalName": "Aardvark", "pagerank": 0.9}}],
+        "LegalTheory": [{"key": "BIPA", "props": {"name": "BIPA"}}],
+        "SecondarySource": [{"key": "https://x/2", "props": {"link": "https://x/2", "title": "Zeta"}},
+                            {"key": "https://x/1", "props": {"link": "https://x/1", "title": "Alpha"}}],
+        "NAMED_DEFENDANT": [{"start": c, "end": "Acme", "props": {}} for c in "abc"]
+                           + [{"start": "c", "end": org, "props": {}} for org in ("Beta", "Aardvark")],
+        "ASSERTS_CLAIM": [{"start": "a", "end": "BIPA", "props": {}}],
+        "HAS_SECONDARY_SOURCE": [{"start": "a", "end": link, "props": {}} for link in ("https://x/2", "https://x/1")],
+    }
+
+    class Result:
+        def __init__(self, records):
+            self.records = records
+
+        async def __aiter__(self):
+            for r in self.records:
+                yield r
+
+    class Session:
+        async def run(self, cypher):
+            kind = next((k for k in graph if f"(n:{k})" in cypher or f"[r:{k}]" in cypher), None)
+            return Result(graph.get(kind, []))
+
+    driver = MagicMock()
+    driver.session.return_value.__aenter__ = AsyncMock(return_value=Session())
+    driver.session.return_value.__aexit__ = AsyncMock(return_value=False)
+    monkeypatch.setattr(eg, "get_graph_version", AsyncMock(return_value=5))
+    db = str(tmp_path / "graph.db")
+    await eg.export_graph(driver, db)
+
+    down = MagicMock()
+    down.session.return_value.__aenter__ = AsyncMock(side_effect=ServiceUnavailable("connection refused"))
+    down.session.return_value.__aexit__ = AsyncMock(return_value=False)
+    read_store.configure(None)
+    with pytest.raises(ServiceUnavailable):
+        await neo4j_service.get_cases_by_year(down)
+
+    read_store.configure(db)
+    assert read_store.status()["graphVersion"] == 5 and read_store.serving() is None
+    assert await neo4j_service.get_cases_by_year(down) == [{"year": "2020", "count": 1}]
+    cases = await neo4j_service.get_cases_list(down, None, None, None, 50, 0)
+    assert [c["id"] for c in cases] == ["c", "a", "b"]  # null dateFiled first, as in Cypher DESC
+    assert cases[1]["areaOfApplication"] == ["Facial Recognition"]
+    assert [c["id"] for c in await neo4j_service.get_cases_list(down, "Active", None, "Chatbots")] == ["c"]
+    assert (await neo4j_service.get_case_by_id(down, "a"))["jurisdictionType"] == "Federal"
+    assert await neo4j_service.get_case_by_id(down, "zzz") is None
+    assert [s["title"] for s in await neo4j_service.get_secondary_sources(down, "a")] == ["Alpha", "Zeta"]
+    assert await neo4j_service.get_top_defendants(down, limit=5) == [
+        {"canonicalName": "Acme", "caseCount": 3, "activeCount": 2, "inactiveCount": 1},
+        {"canonicalName": "Aardvark", "caseCount": 1, "activeCount": 1, "inactiveCount": 0},
+        {"canonicalName": "Beta", "caseCount": 1, "activeCount": 1, "inactiveCount": 0},
+    ]
+    ranked = await neo4j_service.get_top_defendants(down, 5, "pagerank")
+    assert [r["canonicalName"] for r in ranked] == ["Aardvark", "Beta", "Acme"]  # ties by name
+    plan = " ".join(row[-1] for row in sqlite3.connect(db).execute(
+        "EXPLAIN QUERY PLAN " + RANKED_DEFENDANTS_SQL.format(score="pagerank"), (5,)))
+    assert "idx_g_organizations_pagerank" in plan
+    assert [(c["id"], c["theories"], c["aiSystems"]) for c in await neo4j_service.get_defendant_cases(down, "Beta")] \
+        == [("c", [], [])]
+
+    # As the primary read backend Neo4j is never asked
+    read_store.configure(db, primary=True)
+    calls = down.session.call_count
+    try:
+        assert (await neo4j_service.get_case_by_id(down, "b"))["status"] == "Inactive"
+        assert down.session.call_count == calls
+    finally:
+        read_store.configure(None)
+
+
+@pytest.mark.asyncio
+async def test_write_batches_uses_one_transaction_per_batch():
+    from app.ingest.batch_writer import write_batches
+    session = MagicMock()
+    session.execute_write = AsyncMock()
+    driver = MagicMock()
+    driver.session.return_value.__aenter__ = AsyncMock(return_value=session)
+    driver.session.return_value.__aexit__ = AsyncMock(return_value=False)
+    written = await write_batches(driver, "Rows", "UNWIND $rows AS r RETURN r", [{"i": i} for i in range(7)], batch_size=3)
+    assert written == 7
+    assert [len(c.args[2]) for c in session.execute_write.call_args_list] == [3, 3, 1]
+    session.execute_write.reset_mock()
+    await write_batches(driver, "Rows", "UNWIND $rows AS r SET r.at = $runAt", [{"i": 0}], params={"runAt": "t"})
+    assert session.execute_write.call_args.args[3] == {"runAt": "t"}
@@ -2,5 +2,8 @@
 # Substitute the PORT env var into nginx config (Render sets $PORT)
 sed -i "s/LISTEN_PORT/${PORT:-10000}/g" /etc/nginx/conf.d/default.conf
 
+# One uvicorn worker per core; only the elected leader runs the ingest scheduler
+export UVICORN_WORKERS="${UVICORN_WORKERS:-$(nproc)}"
+
 # Start supervisord (manages both nginx + uvicorn)
 exec /usr/bin/supervisord -c /etc/supervisor/conf.d/supervisord.conf
@@ -17,6 +17,35 @@ export const fetchTopAISystems = (limit = 15) =>
   api.get("/graph/ai-systems", { params: { limit } }).then((r) => r.data);
 export const fetchCasesByTheory = (theory) =>
   api.get(`/graph/theories/${encodeURIComponent(theory)}/cases`).then((r) => r.data);
+export const fetchNeighborhoods = ({ caseIds = [], organizations = [], limitPerOrganization = 25 } = {}) =>
+  api
+    .post("/graph/neighborhoods", { caseIds, organizations, limitPerOrganization })
+    .then((r) => r.data);
+export const fetchConnectionPaths = (from, to, params = {}) =>
+  api.get("/graph/path", { params: { from, to, ...params } }).then((r) => r.data);
+
+// k-hop ego network, streamed as NDJSON: onItem receives each node/edge as it arrives
+export async function streamEgoNetwork(label, key, { hops = 2, fanout, maxNodes, relTypes = [] } = {}, onItem) {
+  const params = new URLSearchParams({ hops });
+  if (fanout) params.set("fanout", fanout);
+  if (maxNodes) params.set("maxNodes", maxNodes);
+  relTypes.forEach((t) => params.append("relType", t));
+  const url = `${BASE}/api/v1/graph/ego/${label}/${encodeURIComponent(key)}?${params}`;
+  const res = await fetch(url);
+  if (!res.ok) throw new Error(`ego network request failed: ${res.status}`);
+  const reader = res.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = "";
+  for (;;) {
+    const { value, done } = await reader.read();
+    buffer += decoder.decode(value || new Uint8Array(), { stream: !done });
+    const lines = buffer.split("\n");
+    buffer = lines.pop();
+    for (const line of lines) if (line.trim()) onItem(JSON.parse(line));
+    if (done) break;
+  }
+  if (buffer.trim()) onItem(JSON.parse(buffer));
+}
 
 // Cases
 export const fetchCases = (params = {}) =>
@@ -5,9 +5,17 @@ import {
   fetchTopDefendants,
   fetchDefendantCases,
   fetchCaseNeighbors,
+  fetchNeighborhoods,
   fetchCases,
 } from "../api.js";
 
+const EDGE_LABELS = {
+  NAMED_DEFENDANT: "DEFENDANT",
+  INVOLVES_SYSTEM: "SYSTEM",
+  ASSERTS_CLAIM: "CLAIMS",
+  FILED_IN: "FILED_IN",
+};
+
 const NODE_COLORS = {
   Case: "#6366f1",
   Organization: "#10b981",
@@ -221,6 +229,26 @@ export default function GraphExplorer() {
     }
   }, []);
 
+  // Expand every case on screen in one request instead of one call per case
+  const expandCluster = useCallback(async () => {
+    const caseIds = graphData.nodes.filter((n) => n.type === "Case").map((n) => n.id);
+    if (!caseIds.length) return;
+    setLoading(true);
+    try {
+      const data = await fetchNeighborhoods({ caseIds });
+      setGraphData({
+        nodes: data.nodes.map((n) => ({ id: n.id, type: n.type, label: n.label, data: n.properties })),
+        links: data.edges.map((e) => ({
+          source: e.source,
+          target: e.target,
+          label: EDGE_LABELS[e.type] || e.type,
+        })),
+      });
+    } finally {
+      setLoading(false);
+    }
+  }, [graphData]);
+
   useEffect(() => {
     if (selectedDefendant) {
       loadDefendantGraph(selectedDefendant);
@@ -320,11 +348,21 @@ export default function GraphExplorer() {
               Select a defendant or click a case to explore the graph.
             </div>
           ) : (
-            <ForceGraph
-              nodes={graphData.nodes}
-              links={graphData.links}
-              onNodeClick={handleNodeClick}
-            />
+            <>
+              <ForceGraph
+                nodes={graphData.nodes}
+                links={graphData.links}
+                onNodeClick={handleNodeClick}
+              />
+              {graphData.nodes.some((n) => n.type === "Case") && (
+                <button
+                  onClick={expandCluster}
+                  className="mt-2 text-xs text-indigo-400 hover:text-indigo-300"
+                >
+                  Expand all cases →
+                </button>
+              )}
+            </>
           )}
 
           {/* Selected node detail */}